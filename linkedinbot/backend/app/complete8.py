@@ -14,8 +14,8 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementNotInteractableException
-from webdriver_manager.chrome import ChromeDriverManager
-from langchain_google_genai import GoogleGenerativeAI
+from services.driver_resolver import ChromeDriverResolver
+from services.llm_backends import create_llm
 from langchain.prompts import PromptTemplate
 
 # Load environment variables
@@ -25,12 +25,17 @@ load_dotenv()
 LINKEDIN_EMAIL = os.getenv('LINKEDIN_EMAIL')
 LINKEDIN_PASSWORD = os.getenv('LINKEDIN_PASSWORD')
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+LLM_BACKEND = os.getenv('LLM_BACKEND', 'gemini')  # gemini, stub (local stub server) or fake (in-process)
+LLM_STUB_URL = os.getenv('LLM_STUB_URL', 'http://127.0.0.1:8765')
+LLM_STUB_LATENCY = os.getenv('LLM_STUB_LATENCY', 'lognormal:0.8,0.5')
 JOB_TITLE = os.getenv('JOB_TITLE')
 JOB_LOCATION = os.getenv('JOB_LOCATION')
 RESUME_PATH = os.getenv('RESUME_PATH', '')  # Path to your resume file
 PHONE_NUMBER = os.getenv('PHONE_NUMBER', '')  # Your phone number
 USER_WEBSITE = os.getenv('USER_WEBSITE', '')  # Your personal website
 MAX_APPLICATIONS = int(os.getenv('MAX_APPLICATIONS', '10'))  # Maximum number of applications to submit
+DRIVER_CACHE_DIR = os.getenv('DRIVER_CACHE_DIR')  # Where resolved chromedriver binaries are recorded
+DRIVER_OFFLINE = os.getenv('DRIVER_OFFLINE', 'false').lower() == 'true'  # Never download chromedriver
 
 # Path for storing cookies
 COOKIES_FILE = 'linkedin_cookies.pkl'
@@ -48,8 +53,11 @@ def setup_driver():
     chrome_options.add_argument("--start-maximized")
     chrome_options.add_argument("--disable-gpu")
     
-    service = Service(ChromeDriverManager().install())
+    started = time.perf_counter()
+    resolver = ChromeDriverResolver(cache_dir=DRIVER_CACHE_DIR, offline=DRIVER_OFFLINE)
+    service = Service(resolver.resolve())
     driver = webdriver.Chrome(service=service, options=chrome_options)
+    print(f"Driver started in {time.perf_counter() - started:.2f}s")
     return driver
 
 def save_cookies(driver):
@@ -116,11 +124,14 @@ def login_with_cookies(driver):
         return False
 
 def setup_llm():
-    """Set up Google Gemini via LangChain"""
-    llm = GoogleGenerativeAI(
+    """Set up Google Gemini via LangChain, or the stub/fake backend chosen by LLM_BACKEND"""
+    llm = create_llm(
+        LLM_BACKEND,
         model="gemini-1.5-flash",
-        google_api_key=GEMINI_API_KEY,
-        temperature=0.7
+        api_key=GEMINI_API_KEY,
+        temperature=0.7,
+        stub_url=LLM_STUB_URL,
+        latency=LLM_STUB_LATENCY,
     )
     return llm
 
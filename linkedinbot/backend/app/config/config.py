@@ -6,6 +6,71 @@ load_dotenv()
 class Config:
     def __init__(self):
             self.GEMINI_API_KEY=os.getenv("GEMINI_API_KEY")
+
+            # Chrome driver pool
+            self.DRIVER_POOL_SIZE=int(os.getenv("DRIVER_POOL_SIZE", "2"))
+            self.DRIVER_MAX_AGE=float(os.getenv("DRIVER_MAX_AGE", "1800"))  # seconds before a browser is recycled
+            self.DRIVER_MAX_USES=int(os.getenv("DRIVER_MAX_USES", "20"))  # checkouts before a browser is recycled
+            self.DRIVER_CHECKOUT_TIMEOUT=float(os.getenv("DRIVER_CHECKOUT_TIMEOUT", "60"))
+            self.DRIVER_POOL_PREWARM=os.getenv("DRIVER_POOL_PREWARM", "true").lower() == "true"
+
+            # Blocking browser work from API requests (logins): worker threads and waiting room
+            self.BROWSER_WORKERS=int(os.getenv("BROWSER_WORKERS", str(self.DRIVER_POOL_SIZE)))
+            self.BROWSER_QUEUE_LIMIT=int(os.getenv("BROWSER_QUEUE_LIMIT", "8"))
+
+            # Background apply runs (POST /api/runs): worker processes and how many runs may wait
+            self.RUN_WORKERS=int(os.getenv("RUN_WORKERS", "2"))
+            self.RUN_QUEUE_LIMIT=int(os.getenv("RUN_QUEUE_LIMIT", "20"))
+            self.SESSION_TTL=float(os.getenv("SESSION_TTL", str(8 * 3600)))  # seconds a login token stays usable
+            self.RUN_RESULTS_DIR=os.getenv("RUN_RESULTS_DIR", "runs")  # one applied-jobs file per run
+            self.RESUME_DATA_FILE=os.getenv("RESUME_DATA_FILE", "resume_data.json")  # used when a run brings no resume
+
+            # Browser profile used by DriverSetup: "interactive" or "headless-lean"
+            self.BROWSER_PROFILE=os.getenv("BROWSER_PROFILE", "interactive")
+
+            # Pacing: "human" rate-limits applications and typing, "zero" never waits
+            self.PACING_MODE=os.getenv("PACING_MODE", "human")
+            self.PACING_APPLICATIONS_PER_HOUR=float(os.getenv("PACING_APPLICATIONS_PER_HOUR", "240"))
+            self.PACING_KEYSTROKES_PER_SECOND=float(os.getenv("PACING_KEYSTROKES_PER_SECOND", "40"))
+            self.PACING_JITTER=float(os.getenv("PACING_JITTER", "0.5"))  # extra random share added to each wait
+            self.PACING_STATE_PATH=os.getenv("PACING_STATE_PATH", "pacing_state.sqlite3")  # application budget shared by every process; empty keeps it in memory
+
+            # chromedriver resolution
+            self.DRIVER_CACHE_DIR=os.getenv("DRIVER_CACHE_DIR")  # defaults to ~/.cache/linkedinbot/chromedriver
+            self.DRIVER_OFFLINE=os.getenv("DRIVER_OFFLINE", "false").lower() == "true"  # never download drivers
+
+            # Generated answer cache
+            self.ANSWER_CACHE_PATH=os.getenv("ANSWER_CACHE_PATH", "answer_cache.sqlite3")
+            self.ANSWER_CACHE_TTL=float(os.getenv("ANSWER_CACHE_TTL", str(30 * 24 * 3600)))  # seconds, 0 keeps answers forever
+            self.ANSWER_CACHE_MAX_ENTRIES=int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "5000"))
+            self.SIMILAR_QUESTION_THRESHOLD=float(os.getenv("SIMILAR_QUESTION_THRESHOLD", "0.7"))  # Jaccard similarity to reuse an answer
+
+            # LLM backend: "gemini", "stub" (local HTTP stub server) or "fake" (in-process)
+            self.LLM_BACKEND=os.getenv("LLM_BACKEND", "gemini")
+            self.LLM_MODEL=os.getenv("LLM_MODEL", "gemini-1.5-flash")
+            self.LLM_STUB_URL=os.getenv("LLM_STUB_URL", "http://127.0.0.1:8765")
+            self.LLM_STUB_LATENCY=os.getenv("LLM_STUB_LATENCY", "lognormal:0.8,0.5")  # see llm_backends.LatencyModel
+            self.LLM_STUB_ERROR_RATE=float(os.getenv("LLM_STUB_ERROR_RATE", "0"))
+            self.LLM_STUB_TOKENS_PER_SECOND=float(os.getenv("LLM_STUB_TOKENS_PER_SECOND", "50"))
+            self.LLM_STUB_ANSWERS=os.getenv("LLM_STUB_ANSWERS")  # path to a JSON file holding a list of {"match", "answer"}
+            self.LLM_STUB_SEED=int(os.getenv("LLM_STUB_SEED")) if os.getenv("LLM_STUB_SEED") else None
+
+            # LLM client
+            self.LLM_MAX_INFLIGHT=int(os.getenv("LLM_MAX_INFLIGHT", "4"))
+            self.LLM_REQUESTS_PER_MINUTE=float(os.getenv("LLM_REQUESTS_PER_MINUTE", "15"))  # match the Gemini quota
+            self.LLM_TIMEOUT=float(os.getenv("LLM_TIMEOUT", "30"))  # seconds per call, retries included
+            self.LLM_HEDGE_AFTER=float(os.getenv("LLM_HEDGE_AFTER", "0"))  # seconds; 0 hedges past the recent p95
+            self.LLM_RETRIES=int(os.getenv("LLM_RETRIES", "2"))
+            self.LLM_RESUME_TOKEN_BUDGET=int(os.getenv("LLM_RESUME_TOKEN_BUDGET", "600"))  # 0 never trims the resume context
+            self.LLM_STREAM_ANSWERS=os.getenv("LLM_STREAM_ANSWERS", "false").lower() == "true"  # type long answers as they stream in
+
+            # Answer prefetch while job pages load
+            self.PREFETCH_QUESTIONS=int(os.getenv("PREFETCH_QUESTIONS", "5"))  # 0 disables prefetching
+            self.PREFETCH_WORKERS=int(os.getenv("PREFETCH_WORKERS", "2"))
+            self.PREFETCH_WAIT=float(os.getenv("PREFETCH_WAIT", "10"))  # seconds a form waits on an in-flight prefetch
+
+            # Answers taken from resume data without the LLM
+            self.LOCAL_ANSWER_CONFIDENCE=float(os.getenv("LOCAL_ANSWER_CONFIDENCE", "0.75"))
     
     RESUME_DATA_FILE = 'resume_data.json'
 
@@ -4,6 +4,10 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 from .routers.apply import router as apply_router
+from .services.driver_pool import get_driver_pool
+from .services.browser_executor import get_browser_executor
+from .services.apply_runs import get_run_manager
+from .config.config import config
 
 app = FastAPI()
 
@@ -16,6 +20,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def warm_driver_pool():
+    # Launch browsers in the background so the first login doesn't pay the cold start
+    if config.DRIVER_POOL_PREWARM:
+        get_driver_pool().warm()
+
+@app.on_event("shutdown")
+async def close_driver_pool():
+    get_browser_executor().shutdown()
+    get_run_manager().shutdown()
+    get_driver_pool().close()
+
 # Include the router BEFORE mounting static files
 app.include_router(apply_router)
 
@@ -1,7 +1,13 @@
 # routers/apply.py
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException
 from pydantic import BaseModel
-from ..services.login import LinkedInLogin
+from ..services.login import get_sessions, login_with_pooled_driver
+from ..services.apply_runs import RunAlreadyActive, RunQueueFull, get_run_manager
+from ..services.driver_pool import get_driver_pool
+from ..services.browser_executor import AlreadyInFlight, ExecutorSaturated, get_browser_executor
+from ..services.llm_client import get_llm_client
+from ..services.llm_metrics import get_llm_metrics
 
 router = APIRouter(prefix="/api", tags=["authentication"])
 
@@ -12,32 +18,118 @@ class LoginRequest(BaseModel):
 
 @router.post("/login")  # This creates the endpoint /api/login
 async def login(request: LoginRequest):
+    # Chrome runs on the browser executor so the event loop keeps serving other requests
     try:
-        linkedin = LinkedInLogin()
-        
-        result = linkedin.login_with_credentials(
-            linkedin_email=request.username,
-            linkedin_password=request.password
-        )
-        
-        # Check if login was successful
-        if result == True:
-            return {
-                "success": True,
-                "message": "Login successful",
-                "token": "your_jwt_token_here",  # Replace with actual JWT generation
-                "action": request.action
-            }
-        else:
-            raise HTTPException(
-                status_code=401,
-                detail="Invalid username or password"
-            )
-            
+        result = await get_browser_executor().run(
+            request.username.strip().lower(),
+            login_with_pooled_driver,
+            request.username,
+            request.password
+        )
+    except AlreadyInFlight:
+        raise HTTPException(
+            status_code=429,
+            detail="A login for this user is already in progress"
+        )
+    except (ExecutorSaturated, TimeoutError):
+        # Every browser worker is busy and the queue is full, or no pooled browser freed up
+        raise HTTPException(
+            status_code=503,
+            detail="Too many logins in progress, please retry shortly",
+            headers={"Retry-After": "10"}
+        )
     except Exception as e:
         # Log the error for debugging
         print(f"Login error: {e}")
         raise HTTPException(
             status_code=500,
             detail="Internal server error during login"
-        )
\ No newline at end of file
+        )
+    
+    # Check if login was successful; result holds the session cookies
+    if result:
+        return {
+            "success": True,
+            "message": "Login successful",
+            "token": get_sessions().create(request.username, result),
+            "action": request.action
+        }
+    raise HTTPException(
+        status_code=401,
+        detail="Invalid username or password"
+    )
+
+class RunRequest(BaseModel):
+    job_title: str
+    location: str
+    max_applications: int = 10
+    resume_data: dict
+    gemini_api_key: Optional[str] = None
+
+@router.post("/runs", status_code=202)  # Queue a search -> filter -> apply run on the worker processes
+async def create_run(request: RunRequest, authorization: Optional[str] = Header(None)):
+    token = (authorization or "").removeprefix("Bearer ").strip()
+    session = get_sessions().get(token) if token else None
+    if session is None:
+        raise HTTPException(
+            status_code=401,
+            detail="Log in before starting a run"
+        )
+    if request.max_applications < 1:
+        raise HTTPException(
+            status_code=422,
+            detail="max_applications must be at least 1"
+        )
+    username, cookies = session
+    try:
+        return get_run_manager().submit({
+            # One active run per LinkedIn account, paced as that account
+            "account": username.strip().lower(),
+            "job_title": request.job_title,
+            "location": request.location,
+            "max_applications": request.max_applications,
+            "resume_data": request.resume_data,
+            "gemini_api_key": request.gemini_api_key,
+            "cookies": cookies,
+        })
+    except RunAlreadyActive as e:
+        raise HTTPException(
+            status_code=409,
+            detail=f"A run is already active for this account: {e.run_id}"
+        )
+    except RunQueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many runs waiting, please retry later",
+            headers={"Retry-After": "60"}
+        )
+
+@router.get("/runs")  # Worker count, queue limit and runs per status
+async def run_stats():
+    return get_run_manager().stats()
+
+@router.get("/runs/{run_id}")  # Status and counters of one run
+async def get_run(run_id: str):
+    run = get_run_manager().get(run_id)
+    if run is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Unknown run"
+        )
+    return run
+
+@router.get("/driver-pool")  # Checkout wait times and utilization of the browser pool
+async def driver_pool_stats():
+    return get_driver_pool().stats()
+
+@router.get("/browser-executor")  # Queue depth, rejections and wait times of blocking browser work
+async def browser_executor_stats():
+    return get_browser_executor().stats()
+
+@router.get("/llm-stats")  # LLM client latency histograms plus token usage per application and run
+async def llm_stats():
+    client = get_llm_client()
+    return {
+        "client": client.stats() if client else {"calls": 0},
+        "usage": get_llm_metrics().report(),
+    }
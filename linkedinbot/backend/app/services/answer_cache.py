@@ -0,0 +1,167 @@
+# on-disk cache of generated answers, keyed by question, resume version and job context
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from ..config.config import config
+
+
+NON_WORD_PATTERN = re.compile(r"[^a-z0-9+#%$]+")
+
+# Questions mentioning any of these get their answer cached per company and title,
+# everything else is answered once per resume
+JOB_SPECIFIC_WORDS = {"why", "this", "our", "here", "company", "team", "role", "position", "interest", "interested", "excites"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    question TEXT NOT NULL,
+    resume_hash TEXT NOT NULL,
+    context TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    latency REAL NOT NULL,
+    PRIMARY KEY (question, resume_hash, context)
+)
+"""
+
+
+def normalize_question(question):
+    """Lowercase, drop punctuation and "required" markers, collapse whitespace"""
+    text = question.lower().replace("required", " ")
+    return " ".join(NON_WORD_PATTERN.sub(" ", text).split())
+
+
+def resume_hash(resume_data):
+    """Stable hash of the resume contents, so an edited resume never reuses old answers"""
+    payload = json.dumps(resume_data, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def job_context(question, job_title, company):
+    """Context class for a question: "" for facts about the applicant, company|title otherwise"""
+    if JOB_SPECIFIC_WORDS.isdisjoint(normalize_question(question).split()):
+        return ""
+    return f"{normalize_question(company or '')}|{normalize_question(job_title or '')}"
+
+
+class AnswerCache:
+    """SQLite answer store with a TTL, LRU eviction past max_entries and hit/miss counters
+
+    The file is shared by every resume and every worker process; rows are keyed by
+    resume_hash, and answers for resumes no longer in use age out through the TTL and LRU.
+
+    latency is the seconds the LLM took to produce an answer; each hit adds it to
+    seconds_saved.
+    """
+    def __init__(self, path=None, ttl=None, max_entries=None):
+        self.path = path or config.ANSWER_CACHE_PATH
+        self.ttl = ttl if ttl is not None else config.ANSWER_CACHE_TTL
+        self.max_entries = max_entries if max_entries is not None else config.ANSWER_CACHE_MAX_ENTRIES
+        if self.path != ":memory:" and os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(SCHEMA)
+        self._db.commit()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+        self.lookup_seconds = 0.0
+
+    def get(self, question, current_hash, context="", count=True):
+        """Return the cached answer or None, refreshing its LRU position on a hit;
+        count=False leaves the hit/miss counters alone"""
+        started = time.perf_counter()
+        key = (normalize_question(question), current_hash, context)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT answer, created_at, latency FROM answers WHERE question = ? AND resume_hash = ? AND context = ?",
+                key,
+            ).fetchone()
+            if row and self.ttl and now - row[1] > self.ttl:
+                self._db.execute("DELETE FROM answers WHERE question = ? AND resume_hash = ? AND context = ?", key)
+                self._db.commit()
+                row = None
+            if row:
+                self._db.execute(
+                    "UPDATE answers SET last_used = ? WHERE question = ? AND resume_hash = ? AND context = ?",
+                    (now,) + key,
+                )
+                self._db.commit()
+                if count:
+                    self.hits += 1
+                    self.seconds_saved += row[2]
+            elif count:
+                self.misses += 1
+            self.lookup_seconds += time.perf_counter() - started
+        return row[0] if row else None
+
+    def contains(self, question, current_hash, context=""):
+        """Whether a live answer is cached, without touching counters or LRU order"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT created_at FROM answers WHERE question = ? AND resume_hash = ? AND context = ?",
+                (normalize_question(question), current_hash, context),
+            ).fetchone()
+        return bool(row) and not (self.ttl and time.time() - row[0] > self.ttl)
+
+    def put(self, question, current_hash, answer, latency, context=""):
+        """Store an answer, drop expired ones and evict the least recently used past max_entries"""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (normalize_question(question), current_hash, context, answer, now, now, latency),
+            )
+            if self.ttl:
+                self._db.execute("DELETE FROM answers WHERE created_at < ?", (now - self.ttl,))
+            if self.max_entries:
+                self._db.execute(
+                    "DELETE FROM answers WHERE rowid IN "
+                    "(SELECT rowid FROM answers ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+            self._db.commit()
+
+    def entries(self):
+        """Every live (question, resume_hash, context, answer) row"""
+        with self._lock:
+            return self._db.execute("SELECT question, resume_hash, context, answer FROM answers").fetchall()
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM answers")
+            self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "seconds_saved": self.seconds_saved,
+                "mean_lookup_ms": self.lookup_seconds / lookups * 1000 if lookups else 0.0,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_answer_cache():
+    """Return the answer cache shared by the whole process"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = AnswerCache()
+        return _cache
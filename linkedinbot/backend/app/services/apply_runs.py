@@ -0,0 +1,256 @@
+# background apply runs: a queue of search -> filter -> apply pipelines executed by worker processes
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from ..config.config import config
+
+
+class RunQueueFull(Exception):
+    """RUN_QUEUE_LIMIT runs are already waiting for a worker"""
+
+
+class RunAlreadyActive(Exception):
+    """The account already has a run queued or running"""
+    def __init__(self, run_id):
+        super().__init__(f"Run {run_id} is already active for this account")
+        self.run_id = run_id
+
+
+# -- worker process side ------------------------------------------------------------------
+
+_events = None
+
+
+def init_worker(events):
+    global _events
+    _events = events
+
+
+def report(run_id, **fields):
+    """Send a status or counter update for run_id to the API process"""
+    _events.put((run_id, fields))
+
+
+def results_path(run_id):
+    """File receiving the jobs a run applied to"""
+    return os.path.join(config.RUN_RESULTS_DIR, f"{run_id}.json")
+
+
+def execute_run(run_id, request):
+    """Run one search -> Easy Apply filter -> apply pipeline in this worker process
+
+    Selenium, the bot and the LLM stack are imported here, so only workers pay for them.
+    Each run gets a fresh process (max_tasks_per_child=1): its own browser, LLM client
+    and API key, and nothing left over from another user's run. Pacing is keyed by the
+    account and kept in PACING_STATE_PATH, so it holds across processes.
+    """
+    if request.get("gemini_api_key"):
+        os.environ["GEMINI_API_KEY"] = request["gemini_api_key"]
+
+    from .driver import DriverSetup
+    from .linkedin_bot import LinkedInBot
+    from .llm import LLMController
+    from .login import restore_session
+    from .pacing import get_pacing_policy
+
+    report(run_id, status="running")
+    driver = DriverSetup.setup_driver()
+    try:
+        if not restore_session(driver, request["cookies"]):
+            raise RuntimeError("LinkedIn session expired, log in again")
+        if not LinkedInBot.navigate_to_jobs_and_search(driver, request["job_title"], request["location"]):
+            raise RuntimeError("Job search failed")
+        if not LinkedInBot.click_easy_apply_filter(driver):
+            print("Warning: Could not apply Easy Apply filter. Continuing anyway.")
+        llm = LLMController().setup_client()
+        completed = LinkedInBot.process_job_listings(
+            driver, llm, request["max_applications"],
+            pacing=get_pacing_policy(request["account"]),
+            resume_data=request["resume_data"],
+            progress=lambda **counters: report(run_id, counters=counters),
+            results_path=results_path(run_id),
+        )
+        if not completed:
+            raise RuntimeError("Processing job listings failed")
+    finally:
+        driver.quit()
+
+
+# -- API process side ---------------------------------------------------------------------
+
+class ApplyRunManager:
+    """Queues apply runs onto a pool of worker processes and tracks their status
+
+    Runs move queued -> running -> succeeded or failed, and an account has at most one
+    run queued or running at a time. Workers stream counters back over a multiprocessing
+    queue, read by a listener thread in the API process.
+    """
+    def __init__(self, workers=None, queue_limit=None, keep=500):
+        self.workers = workers or config.RUN_WORKERS
+        self.queue_limit = config.RUN_QUEUE_LIMIT if queue_limit is None else queue_limit
+        self.keep = keep
+        self._runs = {}
+        self._active = {}  # account -> run id
+        self._lock = threading.Lock()
+        self._pool = None
+        self._events = None
+        self._closed = False
+
+    def _ensure_pool(self):
+        # spawn: forking a process that runs uvicorn's event loop and threads is unsafe
+        context = multiprocessing.get_context("spawn")
+        if self._events is None:
+            # One queue and listener for the manager's lifetime; a rebuilt pool reuses them
+            self._events = context.Queue()
+            threading.Thread(target=self._listen, name="apply-run-events", daemon=True).start()
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=context, max_tasks_per_child=1,
+                initializer=init_worker, initargs=(self._events,),
+            )
+        return self._pool
+
+    def _listen(self):
+        while not self._closed:
+            try:
+                run_id, fields = self._events.get(timeout=1)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                return
+            with self._lock:
+                run = self._runs.get(run_id)
+                if run is None:
+                    continue
+                # Events can arrive after the done callback marked the run finished; they
+                # still carry its last counters, but must not move it back to running
+                if fields.get("status") == "running" and run["started_at"] is None:
+                    run["started_at"] = time.time()
+                    if run["status"] == "queued":
+                        run["status"] = "running"
+                if "counters" in fields:
+                    run["counters"].update(fields["counters"])
+
+    def submit(self, request):
+        """Queue a run; request carries the account, job_title, location, max_applications,
+        resume_data, the session cookies and optionally a gemini_api_key
+
+        Raises:
+            RunAlreadyActive: the account has a run queued or running
+            RunQueueFull: RUN_QUEUE_LIMIT runs are waiting
+
+        Returns:
+            The run's public status dictionary
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Apply runs are shut down")
+            if request["account"] in self._active:
+                raise RunAlreadyActive(self._active[request["account"]])
+            queued = sum(1 for run in self._runs.values() if run["status"] == "queued")
+            if queued >= self.queue_limit:
+                raise RunQueueFull(f"{queued} runs already waiting")
+            run_id = uuid.uuid4().hex
+            run = {
+                "id": run_id,
+                "status": "queued",
+                "job_title": request["job_title"],
+                "location": request["location"],
+                "max_applications": request["max_applications"],
+                "created_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+                "counters": {"jobs_viewed": 0, "applied": 0, "failed": 0},
+                "error": None,
+                "results_file": results_path(run_id),
+            }
+            self._runs[run_id] = run
+            self._active[request["account"]] = run_id
+            self._forget_old()
+            try:
+                pool = self._ensure_pool()
+                try:
+                    future = pool.submit(execute_run, run_id, request)
+                except BrokenProcessPool:
+                    # A worker died and its run's done callback hasn't replaced the pool yet
+                    self._pool = None
+                    pool = self._ensure_pool()
+                    future = pool.submit(execute_run, run_id, request)
+            except Exception:
+                del self._runs[run_id]
+                del self._active[request["account"]]
+                raise
+
+        future.add_done_callback(lambda done: self._finish(run_id, request["account"], pool, done))
+        return self.get(run_id)
+
+    def _finish(self, run_id, account, pool, future):
+        try:
+            error = future.exception()
+        except Exception as e:
+            # Cancelled at shutdown
+            error = e
+        with self._lock:
+            if isinstance(error, BrokenProcessPool) and self._pool is pool and not self._closed:
+                # A worker died (Chrome crash, OOM); the next submit starts a fresh pool
+                pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+            if self._active.get(account) == run_id:
+                del self._active[account]
+            run = self._runs.get(run_id)
+            if run is None:
+                return
+            run["status"] = "failed" if error else "succeeded"
+            run["error"] = str(error) if error else None
+            run["finished_at"] = time.time()
+
+    def _forget_old(self):
+        finished = [run for run in self._runs.values() if run["status"] in ("succeeded", "failed")]
+        for run in sorted(finished, key=lambda run: run["finished_at"])[:max(len(self._runs) - self.keep, 0)]:
+            del self._runs[run["id"]]
+
+    def get(self, run_id):
+        with self._lock:
+            run = self._runs.get(run_id)
+            return dict(run, counters=dict(run["counters"])) if run else None
+
+    def stats(self):
+        with self._lock:
+            statuses = [run["status"] for run in self._runs.values()]
+        return {
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            **{status: statuses.count(status) for status in ("queued", "running", "succeeded", "failed")},
+        }
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            pool = self._pool
+        if pool is not None:
+            # shutdown(wait=False) races the pool's manager thread while it replaces a worker
+            # that just exited (max_tasks_per_child); wait on a side thread instead, so the
+            # API's shutdown hook doesn't block on running runs
+            threading.Thread(
+                target=pool.shutdown, kwargs={"wait": True, "cancel_futures": True},
+                name="apply-run-shutdown", daemon=True,
+            ).start()
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_run_manager():
+    """Return the process-wide apply-run manager"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ApplyRunManager()
+        return _manager
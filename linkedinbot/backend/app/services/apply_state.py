@@ -0,0 +1,99 @@
+# one-roundtrip classification of the Easy Apply modal and the flow budget per state
+
+
+# Classifies the modal as form, review, submit, submitted, error or closed and returns the
+# button that moves it forward. Buttons are matched by aria-label first, then by their text.
+APPLY_STATE_SCRIPT = """
+function text(el) {
+    return el ? (el.innerText || el.textContent || '').replace(/\\s+/g, ' ').trim() : '';
+}
+
+function usable(el) {
+    if (!el || el.disabled) return false;
+    var rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0 && window.getComputedStyle(el).visibility !== 'hidden';
+}
+
+function findButton(root, labels, pattern) {
+    for (var i = 0; i < labels.length; i++) {
+        var el = root.querySelector('button[aria-label="' + labels[i] + '"]');
+        if (usable(el)) return el;
+    }
+    if (!pattern) return null;
+    return Array.prototype.find.call(root.querySelectorAll('button'), function (el) {
+        return usable(el) && pattern.test(text(el));
+    }) || null;
+}
+
+function result(state, button, errors, heading) {
+    return {state: state, button: button || null, errors: errors || [], heading: heading || ''};
+}
+
+var dialogs = Array.prototype.filter.call(
+    document.querySelectorAll('.jobs-easy-apply-modal, .artdeco-modal'), usable
+);
+if (!dialogs.length) return result('closed');
+
+for (var i = 0; i < dialogs.length; i++) {
+    if (/application (was )?(submitted|sent)/i.test(text(dialogs[i]))) {
+        return result('submitted', findButton(dialogs[i], ['Done', 'Dismiss'], /^done$/i));
+    }
+}
+
+var modal = document.querySelector('.jobs-easy-apply-modal') || dialogs[0];
+var heading = text(modal.querySelector('h3, h2'));
+var errors = Array.prototype.filter.call(
+    modal.querySelectorAll('.artdeco-inline-feedback--error'), usable
+).map(text);
+
+var submit = findButton(modal, ['Submit application'], /^submit application$/i);
+var review = findButton(modal, ['Review your application'], /^review$/i);
+var next = findButton(modal, ['Continue to next step', 'Next'], /^(next|continue)$/i)
+    || (usable(modal.querySelector('button.artdeco-button--primary')) ? modal.querySelector('button.artdeco-button--primary') : null);
+
+if (errors.length) return result('error', submit || review || next, errors, heading);
+if (submit) return result('submit', submit, [], heading);
+if (review) return result('review', review, [], heading);
+if (next) return result('form', next, [], heading);
+return result('error', null, ['no actionable button in the modal'], heading);
+"""
+
+# How many times the flow may pass through each state before giving up
+STATE_BUDGETS = {"form": 10, "review": 2, "submit": 2, "error": 3, "submitted": 2}
+
+
+def probe_apply_state(driver):
+    """Classify the Easy Apply modal in one roundtrip
+
+    Returns:
+        Dictionary with "state" (one of "form", "review", "submit", "submitted", "error",
+        "closed"), the WebElement that advances it under "button" (None if there is none),
+        the visible validation "errors" and the step "heading"
+    """
+    return driver.execute_script(APPLY_STATE_SCRIPT)
+
+
+class ApplyFlow:
+    """Counts the visits to each state against STATE_BUDGETS
+
+    The flow ends in exactly one outcome: "submitted", "closed", "stuck" or
+    "budget_exhausted:<state>".
+    """
+    def __init__(self, budgets=None):
+        self.budgets = budgets or STATE_BUDGETS
+        self.visits = {}
+        self.history = []
+        self.outcome = None
+
+    def enter(self, state):
+        """Record a visit to state; False once its budget is spent"""
+        self.visits[state] = self.visits.get(state, 0) + 1
+        self.history.append(state)
+        if self.visits[state] > self.budgets.get(state, 1):
+            self.finish(f"budget_exhausted:{state}")
+            return False
+        return True
+
+    def finish(self, outcome):
+        self.outcome = outcome
+        return outcome
@@ -0,0 +1,125 @@
+# bounded thread pool for blocking browser work called from async endpoints, with backpressure
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ..config.config import config
+from .llm_client import LatencyHistogram
+
+
+class ExecutorSaturated(Exception):
+    """Every worker is busy and the queue is full"""
+
+
+class AlreadyInFlight(Exception):
+    """A job with the same key is already queued or running"""
+
+
+class BrowserExecutor:
+    """Runs blocking Selenium calls off the event loop
+
+    At most workers jobs run at once and at most max_queue more wait for a worker; past
+    that, run() refuses immediately instead of letting requests pile up. Jobs carry a key
+    (the LinkedIn username for logins) and only one job per key is in flight.
+    """
+    def __init__(self, workers=None, max_queue=None):
+        self.workers = workers or config.BROWSER_WORKERS
+        self.max_queue = config.BROWSER_QUEUE_LIMIT if max_queue is None else max_queue
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="browser")
+        self._lock = threading.Lock()
+        self._keys = set()
+        self.queued = 0
+        self.running = 0
+        self.max_queued = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected_saturated = 0
+        self.rejected_duplicate = 0
+        self.queue_wait = LatencyHistogram()
+        self.run_time = LatencyHistogram()
+
+    async def run(self, key, function, *args):
+        """Await function(*args) on a browser worker
+
+        Raises:
+            AlreadyInFlight: a job with this key is queued or running
+            ExecutorSaturated: the queue limit is reached
+        """
+        with self._lock:
+            if key in self._keys:
+                self.rejected_duplicate += 1
+                raise AlreadyInFlight(f"A job for {key} is already in progress")
+            if self.queued + self.running >= self.workers + self.max_queue:
+                self.rejected_saturated += 1
+                raise ExecutorSaturated(f"{self.running} jobs running and {self.queued} queued")
+            self._keys.add(key)
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+            self.submitted += 1
+
+        submitted = time.monotonic()
+
+        def job():
+            started = time.monotonic()
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+            self.queue_wait.record(started - submitted)
+            try:
+                return function(*args)
+            finally:
+                self.run_time.record(time.monotonic() - started)
+                with self._lock:
+                    self.running -= 1
+
+        def release(future):
+            # Runs when the job finishes, or when a still-queued job is cancelled because
+            # its request went away; a job that already started keeps its key until done
+            with self._lock:
+                self._keys.discard(key)
+                if future.cancelled():
+                    self.queued -= 1
+                elif future.exception() is not None:
+                    self.failed += 1
+                else:
+                    self.completed += 1
+
+        future = self._pool.submit(job)
+        future.add_done_callback(release)
+        return await asyncio.wrap_future(future)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "running": self.running,
+                "queued": self.queued,
+                "max_queued": self.max_queued,
+                "in_flight_keys": len(self._keys),
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected_saturated": self.rejected_saturated,
+                "rejected_duplicate": self.rejected_duplicate,
+                "queue_wait": self.queue_wait.report(),
+                "run_time": self.run_time.report(),
+            }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_browser_executor():
+    """Return the process-wide browser executor"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = BrowserExecutor()
+        return _executor
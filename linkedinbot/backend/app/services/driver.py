@@ -1,19 +1,120 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+import time
+from collections import deque
+
+from .driver_resolver import ChromeDriverResolver
+from ..config.config import config
+
+
+resolver = ChromeDriverResolver(cache_dir=config.DRIVER_CACHE_DIR, offline=config.DRIVER_OFFLINE)
+
+# Named browser profiles. "interactive" is the classic visible browser, "headless-lean"
+# trims everything the bot never looks at so more browsers fit on one host.
+#
+# blocked_urls goes through CDP Network.setBlockedURLs, which only covers the tab that is
+# active when it is sent. Tabs or windows opened later load everything unless they are
+# entered through DriverSetup.switch_to_window, which re-applies the block list.
+BROWSER_PROFILES = {
+    "interactive": {
+        "arguments": [
+            "--no-sandbox",
+            "--disable-dev-shm-usage",
+            "--start-maximized",
+            "--disable-gpu",
+        ],
+        "prefs": {},
+        "blocked_urls": [],
+    },
+    "headless-lean": {
+        "arguments": [
+            "--headless=new",
+            "--no-sandbox",
+            "--disable-dev-shm-usage",
+            "--disable-gpu",
+            "--window-size=1920,1080",
+            "--disable-extensions",
+            "--disable-background-networking",
+            "--disable-component-update",
+            "--disable-default-apps",
+            "--disable-sync",
+            "--mute-audio",
+            "--blink-settings=imagesEnabled=false",
+        ],
+        "prefs": {
+            "profile.managed_default_content_settings.images": 2,
+        },
+        "blocked_urls": [
+            # images
+            "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+            # media
+            "*.mp4", "*.webm", "*.m3u8", "*.mp3",
+            # fonts
+            "*.woff", "*.woff2", "*.ttf", "*.otf",
+        ],
+    },
+}
 
 
 class DriverSetup:
-    def setup_driver():
-        """Set up and return a configured Chrome WebDriver"""
+    # Most recent launches: (resolve seconds, launch seconds)
+    startup_times = deque(maxlen=100)
+
+    def setup_driver(profile=None):
+        """Set up and return a Chrome WebDriver configured from a named browser profile"""
+        profile_name = profile or config.BROWSER_PROFILE
+        if profile_name not in BROWSER_PROFILES:
+            raise ValueError(f"Unknown browser profile '{profile_name}', expected one of {list(BROWSER_PROFILES)}")
+        settings = BROWSER_PROFILES[profile_name]
+
+        # Selenium is imported by the first launch, so importing this module (and the API
+        # that depends on it) stays cheap
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+
         chrome_options = Options()
-        # chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--start-maximized")
-        chrome_options.add_argument("--disable-gpu")
-        
-        service = Service(ChromeDriverManager().install())
+        for argument in settings["arguments"]:
+            chrome_options.add_argument(argument)
+        if settings["prefs"]:
+            chrome_options.add_experimental_option("prefs", settings["prefs"])
+        # CDP network events feed the network-idle wait in waits.py
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+        started = time.perf_counter()
+        service = Service(resolver.resolve())
+        resolved = time.perf_counter()
         driver = webdriver.Chrome(service=service, options=chrome_options)
-        return driver
\ No newline at end of file
+        launched = time.perf_counter()
+
+        driver.browser_profile = profile_name
+        DriverSetup.block_urls(driver)
+
+        DriverSetup.startup_times.append((resolved - started, launched - resolved))
+        print(f"Driver ({profile_name}) started in {launched - started:.2f}s (resolve {resolved - started:.2f}s)")
+        return driver
+
+    def block_urls(driver):
+        """Fail requests matching the profile's blocked_urls in the current tab"""
+        blocked_urls = BROWSER_PROFILES[getattr(driver, "browser_profile", config.BROWSER_PROFILE)]["blocked_urls"]
+        if blocked_urls:
+            # Requests matching these patterns are failed before they leave the browser
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_urls})
+
+    def switch_to_window(driver, handle):
+        """Switch to another tab or window, blocking the same URLs there as in the first one"""
+        driver.switch_to.window(handle)
+        DriverSetup.block_urls(driver)
+
+    def startup_stats():
+        """Summary of recent driver startup times"""
+        times = list(DriverSetup.startup_times)
+        if not times:
+            return {"launches": 0}
+        totals = [resolve + launch for resolve, launch in times]
+        return {
+            "launches": len(times),
+            "avg_resolve_seconds": sum(resolve for resolve, _ in times) / len(times),
+            "avg_startup_seconds": sum(totals) / len(totals),
+            "max_startup_seconds": max(totals),
+            "last_startup_seconds": totals[-1],
+        }
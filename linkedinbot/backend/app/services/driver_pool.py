@@ -0,0 +1,235 @@
+# pool of pre-launched chrome drivers so logins and apply runs start on a warm browser
+import threading
+import time
+from collections import deque
+
+from .driver import DriverSetup
+from ..config.config import config
+
+
+class PooledDriver:
+    """A driver owned by the pool together with its recycling bookkeeping"""
+    def __init__(self, driver):
+        self.driver = driver
+        self.created_at = time.monotonic()
+        self.uses = 0
+
+
+class DriverPool:
+    def __init__(self, size=None, max_age=None, max_uses=None, checkout_timeout=None, factory=None):
+        self.size = size if size is not None else config.DRIVER_POOL_SIZE
+        self.max_age = max_age if max_age is not None else config.DRIVER_MAX_AGE
+        self.max_uses = max_uses if max_uses is not None else config.DRIVER_MAX_USES
+        self.checkout_timeout = checkout_timeout if checkout_timeout is not None else config.DRIVER_CHECKOUT_TIMEOUT
+        self.factory = factory or DriverSetup.setup_driver
+
+        self._cond = threading.Condition()
+        self._idle = deque()
+        self._busy = {}
+        self._pending = 0  # drivers being launched or health-checked outside the lock
+        self._closed = False
+
+        self._checkouts = 0
+        self._launched = 0
+        self._retired = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._last_wait = 0.0
+
+    def _total(self):
+        return len(self._idle) + len(self._busy) + self._pending
+
+    def _expired(self, entry):
+        if self.max_uses and entry.uses >= self.max_uses:
+            return True
+        if self.max_age and time.monotonic() - entry.created_at >= self.max_age:
+            return True
+        return False
+
+    def _launch(self):
+        driver = self.factory()
+        with self._cond:
+            self._launched += 1
+        return PooledDriver(driver)
+
+    def _retire(self, entry):
+        """Quit a driver that is no longer fit for reuse and free its slot"""
+        try:
+            entry.driver.quit()
+        except Exception as e:
+            print(f"Error quitting pooled driver: {e}")
+        with self._cond:
+            self._retired += 1
+            self._cond.notify_all()
+
+    def is_healthy(self, driver):
+        """Probe the browser with a cheap script call"""
+        try:
+            return driver.execute_script("return 1;") == 1 and len(driver.window_handles) > 0
+        except Exception:
+            return False
+
+    def reset(self, driver):
+        """Wipe cookies, storage and extra tabs so the next user starts clean"""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        try:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                "origin": "https://www.linkedin.com",
+                "storageTypes": "all"
+            })
+        except Exception:
+            driver.delete_all_cookies()
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except Exception:
+            # Pages like about:blank have no storage
+            pass
+
+        driver.get("about:blank")
+
+    def warm(self, block=False):
+        """Launch browsers until the pool is full"""
+        def fill():
+            while True:
+                with self._cond:
+                    if self._closed or self._total() >= self.size:
+                        return
+                    self._pending += 1
+                try:
+                    entry = self._launch()
+                except Exception as e:
+                    print(f"Error warming driver pool: {e}")
+                    with self._cond:
+                        self._pending -= 1
+                        self._cond.notify_all()
+                    return
+                with self._cond:
+                    self._pending -= 1
+                    self._idle.append(entry)
+                    self._cond.notify_all()
+
+        if block:
+            fill()
+        else:
+            threading.Thread(target=fill, name="driver-pool-warm", daemon=True).start()
+
+    def checkout(self, timeout=None):
+        """Hand out a warm driver, launching a new one if the pool has room"""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        while True:
+            entry = None
+            with self._cond:
+                while not self._closed and not self._idle and self._total() >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No browser available after waiting {timeout:.1f} seconds")
+                    self._cond.wait(remaining)
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed")
+                if self._idle:
+                    entry = self._idle.popleft()
+                self._pending += 1
+
+            if entry is None:
+                try:
+                    entry = self._launch()
+                except Exception:
+                    with self._cond:
+                        self._pending -= 1
+                        self._cond.notify_all()
+                    raise
+            elif self._expired(entry) or not self.is_healthy(entry.driver):
+                with self._cond:
+                    self._pending -= 1
+                self._retire(entry)
+                continue
+
+            waited = time.monotonic() - started
+            with self._cond:
+                self._pending -= 1
+                entry.uses += 1
+                self._busy[id(entry.driver)] = entry
+                self._checkouts += 1
+                self._total_wait += waited
+                self._last_wait = waited
+                self._max_wait = max(self._max_wait, waited)
+            return entry.driver
+
+    def checkin(self, driver):
+        """Return a driver to the pool, resetting or recycling it"""
+        with self._cond:
+            entry = self._busy.pop(id(driver), None)
+            if entry is not None:
+                self._pending += 1
+
+        if entry is None:
+            # Not one of ours, just shut it down
+            self._retire(PooledDriver(driver))
+            return
+
+        keep = not self._closed and not self._expired(entry)
+        if keep:
+            try:
+                self.reset(driver)
+            except Exception as e:
+                print(f"Error resetting pooled driver: {e}")
+                keep = False
+
+        with self._cond:
+            self._pending -= 1
+            if keep:
+                self._idle.append(entry)
+                self._cond.notify_all()
+        if not keep:
+            self._retire(entry)
+
+    def stats(self):
+        """Checkout wait times and how busy the pool is"""
+        with self._cond:
+            busy = len(self._busy)
+            return {
+                "size": self.size,
+                "idle": len(self._idle),
+                "busy": busy,
+                "pending": self._pending,
+                "utilization": busy / self.size if self.size else 0.0,
+                "checkouts": self._checkouts,
+                "launched": self._launched,
+                "retired": self._retired,
+                "avg_wait_seconds": self._total_wait / self._checkouts if self._checkouts else 0.0,
+                "max_wait_seconds": self._max_wait,
+                "last_wait_seconds": self._last_wait,
+                "driver_startup": DriverSetup.startup_stats(),
+            }
+
+    def close(self):
+        """Quit every idle browser; busy ones are quit when checked back in"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for entry in idle:
+            self._retire(entry)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    """Return the process-wide driver pool, creating it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+        return _pool
@@ -0,0 +1,112 @@
+# resolve a chromedriver binary for the installed chrome without touching the network when cached
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "linkedinbot", "chromedriver")
+
+VERSION_PATTERN = re.compile(r"(\d+)\.\d+\.\d+(?:\.\d+)?")
+
+CHROME_BINARIES = [
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "chrome",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+
+
+class ChromeDriverResolver:
+    def __init__(self, cache_dir=None, offline=False, chrome_binary=None):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.manifest_path = os.path.join(self.cache_dir, "manifest.json")
+        self.offline = offline
+        self.chrome_binary = chrome_binary
+        self._chrome_major = None
+        self._lock = threading.Lock()
+
+    def _read_version(self, command):
+        """Run `<binary> --version` and return the major version, or None"""
+        try:
+            output = subprocess.run(
+                command, capture_output=True, text=True, timeout=10
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            return None
+        match = VERSION_PATTERN.search(output or "")
+        return int(match.group(1)) if match else None
+
+    def detect_chrome_major(self):
+        """Detect the major version of the locally installed Chrome"""
+        if self._chrome_major is not None:
+            return self._chrome_major
+
+        if sys.platform.startswith("win"):
+            # chrome.exe --version prints nothing on Windows, the registry has it
+            major = self._read_version([
+                "reg", "query", r"HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon", "/v", "version"
+            ])
+        else:
+            major = None
+            candidates = [self.chrome_binary] if self.chrome_binary else CHROME_BINARIES
+            for binary in candidates:
+                path = binary if os.path.isabs(binary) else shutil.which(binary)
+                if path and os.path.exists(path):
+                    major = self._read_version([path, "--version"])
+                    if major:
+                        break
+
+        self._chrome_major = major
+        return major
+
+    def load_manifest(self):
+        """Return the cached {chrome major: chromedriver path} mapping"""
+        try:
+            with open(self.manifest_path, "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _record(self, major, path):
+        manifest = self.load_manifest()
+        manifest[str(major)] = path
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(manifest, file, indent=4)
+        os.replace(tmp_path, self.manifest_path)
+
+    def resolve(self):
+        """Return a chromedriver path matching the installed Chrome"""
+        with self._lock:
+            major = self.detect_chrome_major()
+            key = str(major) if major else "unknown"
+
+            # 1. Local manifest - the hot path, no network and no version check
+            cached = self.load_manifest().get(key)
+            if cached and os.path.exists(cached):
+                return cached
+
+            # 2. A chromedriver already on PATH with the same major version
+            on_path = shutil.which("chromedriver")
+            if on_path and major and self._read_version([on_path, "--version"]) == major:
+                self._record(key, on_path)
+                return on_path
+
+            if self.offline:
+                raise RuntimeError(
+                    f"No cached chromedriver for Chrome {key} in {self.manifest_path} and offline mode is enabled"
+                )
+
+            # 3. Download once, then serve from the manifest on every later launch
+            from webdriver_manager.chrome import ChromeDriverManager
+
+            path = ChromeDriverManager().install()
+            self._record(key, path)
+            print(f"Cached chromedriver for Chrome {key} at {path}")
+            return path
@@ -0,0 +1,147 @@
+# apply every decision for a form step in a single execute_script call
+import time
+
+
+# Sets values through the native prototype setters so React-controlled inputs see the
+# change, dispatches input/change events, and reports success per plan entry
+APPLY_PLAN_SCRIPT = """
+var plan = arguments[0];
+
+function fire(el, type) {
+    el.dispatchEvent(new Event(type, {bubbles: true, cancelable: true}));
+}
+
+function setValue(el, value) {
+    var proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+        : el instanceof HTMLSelectElement ? HTMLSelectElement.prototype
+        : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+    fire(el, 'input');
+    fire(el, 'change');
+}
+
+return plan.map(function (entry) {
+    var el = entry.element;
+    try {
+        if (!el || !el.isConnected) throw new Error('element is no longer attached');
+        switch (entry.action) {
+            case 'text':
+                el.focus();
+                setValue(el, entry.value);
+                el.blur();
+                return {ok: el.value === entry.value, error: null};
+            case 'select':
+                var match = Array.prototype.find.call(el.options, function (option) {
+                    return option.text.trim() === entry.value || option.value === entry.value;
+                });
+                if (!match) throw new Error('no option matching ' + entry.value);
+                setValue(el, match.value);
+                return {ok: el.value === match.value, error: null};
+            case 'check':
+                if (el.checked !== Boolean(entry.value)) el.click();
+                return {ok: el.checked === Boolean(entry.value), error: null};
+            case 'radio':
+                if (!el.checked) el.click();
+                return {ok: el.checked, error: null};
+            case 'click':
+                el.click();
+                return {ok: true, error: null};
+            default:
+                throw new Error('unknown action ' + entry.action);
+        }
+    } catch (e) {
+        return {ok: false, error: String(e && e.message || e)};
+    }
+});
+"""
+
+# Appends (or with replace, sets) text through the native setter and fires input, so
+# React sees every streamed chunk; change fires only once the final value is written
+STREAM_TEXT_SCRIPT = """
+var el = arguments[0], text = arguments[1], replace = arguments[2], last = arguments[3];
+if (!el || !el.isConnected) return null;
+var proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+if (document.activeElement !== el) el.focus();
+Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, replace ? text : el.value + text);
+el.dispatchEvent(new Event('input', {bubbles: true, cancelable: true}));
+if (last) {
+    el.dispatchEvent(new Event('change', {bubbles: true, cancelable: true}));
+    el.blur();
+}
+return el.value;
+"""
+
+# Fixed pauses the old per-field code slept after each action, for the wait report
+LEGACY_PAUSES = {"text": 0.5, "select": 1, "check": 0.5, "radio": 0.5, "click": 0.5}
+
+
+def plan_entry(field, action, value=None):
+    """Build one apply-plan entry from a form snapshot field"""
+    return {
+        "element": field["element"],
+        "action": action,
+        "value": value,
+        "identifier": field.get("identifier", ""),
+    }
+
+
+def apply_plan(driver, plan):
+    """Apply a list of plan entries in one roundtrip
+
+    Args:
+        driver: Selenium WebDriver instance
+        plan: List of entries from plan_entry(); action is one of "text", "select",
+              "check", "radio" or "click"
+
+    Returns:
+        List of {"ok": bool, "error": str or None}, one per plan entry
+    """
+    if not plan:
+        return []
+    payload = [
+        {"element": entry["element"], "action": entry["action"], "value": entry["value"]}
+        for entry in plan
+    ]
+    return driver.execute_script(APPLY_PLAN_SCRIPT, payload)
+
+
+def legacy_pause(plan):
+    """Seconds the old code would have slept applying this plan"""
+    return sum(LEGACY_PAUSES.get(entry["action"], 0) for entry in plan)
+
+
+def stream_into_field(driver, element, stream):
+    """Type an answer into a text field chunk by chunk while it is still being generated
+
+    Args:
+        driver: Selenium WebDriver instance
+        element: Textarea or text input WebElement
+        stream: Iterable of text chunks with an "answer" attribute holding the final
+                text once exhausted, such as llm.AnswerStream
+
+    Returns:
+        Dictionary with "ok" (the field holds the final answer), "answer",
+        "first_chunk_seconds", "chunks" and "seconds"
+    """
+    started = time.monotonic()
+    first_chunk = None
+    chunks = 0
+    value = driver.execute_script(STREAM_TEXT_SCRIPT, element, "", True, False)
+    for chunk in stream:
+        if first_chunk is None:
+            first_chunk = time.monotonic() - started
+        value = driver.execute_script(STREAM_TEXT_SCRIPT, element, chunk, False, False)
+        chunks += 1
+        if value is None:
+            break
+    # Reconcile: the cleaned final answer replaces whatever the chunks added up to
+    answer = getattr(stream, "answer", None) or ""
+    if value is not None:
+        value = driver.execute_script(STREAM_TEXT_SCRIPT, element, answer, True, True)
+    return {
+        "ok": bool(answer) and value == answer,
+        "answer": answer,
+        "first_chunk_seconds": first_chunk,
+        "chunks": chunks,
+        "seconds": time.monotonic() - started,
+    }
@@ -0,0 +1,255 @@
+# declarative field-to-answer rules, compiled once into a keyword automaton
+import re
+
+
+# Each rule maps keywords found in a field identifier to a resume_data path and an
+# answer policy. Rules are tried in order, first match wins.
+#
+#   keywords  - any of these must appear in the identifier
+#   requires  - all of these must appear as well
+#   kind      - "choice" for selects/radios, "text" for free-text inputs
+#   source    - dotted path into resume_data
+#   policy    - how the resume value turns into an answer:
+#               "yes_no", "always_yes", "work_setting", "degree" for choices,
+#               "value", "first_word", "last_word" for text
+FIELD_RULES = [
+    # Choice questions (selects and radio groups)
+    {"name": "visa", "kind": "choice", "keywords": ["visa", "sponsor"],
+     "source": "questions.visa_sponsorship_required", "policy": "yes_no"},
+    {"name": "relocate", "kind": "choice", "keywords": ["relocate"],
+     "source": "questions.willing_to_relocate", "policy": "yes_no"},
+    {"name": "travel", "kind": "choice", "keywords": ["travel"],
+     "source": "questions.willing_to_travel", "policy": "yes_no"},
+    {"name": "authorization", "kind": "choice", "keywords": ["citizenship", "authorized"],
+     "source": None, "policy": "always_yes"},
+    {"name": "degree", "kind": "choice", "keywords": ["education", "degree"],
+     "source": "education", "policy": "degree"},
+    {"name": "work_setting", "kind": "choice", "keywords": ["work remotely", "remote"],
+     "source": "questions.preferred_work_setting", "policy": "work_setting"},
+
+    # Free-text inputs
+    {"name": "phone", "kind": "text", "keywords": ["phone"],
+     "source": "personal_info.phone", "policy": "value"},
+    {"name": "email", "kind": "text", "keywords": ["email"],
+     "source": "personal_info.email", "policy": "value"},
+    {"name": "first_name", "kind": "text", "keywords": ["first"], "requires": ["name"],
+     "source": "personal_info.name", "policy": "first_word"},
+    {"name": "last_name", "kind": "text", "keywords": ["last"], "requires": ["name"],
+     "source": "personal_info.name", "policy": "last_word"},
+    {"name": "website", "kind": "text", "keywords": ["website", "portfolio"],
+     "source": "personal_info.website", "policy": "value"},
+    {"name": "salary", "kind": "text", "keywords": ["salary"],
+     "source": "questions.salary_expectation", "policy": "value"},
+    {"name": "address", "kind": "text", "keywords": ["address"],
+     "source": "personal_info.address", "policy": "value"},
+    {"name": "linkedin", "kind": "text", "keywords": ["linkedin"],
+     "source": "personal_info.linkedin", "policy": "value"},
+]
+
+DEGREE_PRIORITY = [
+    ("doctor", 5), ("phd", 5), ("master", 4), ("bachelor", 3), ("associate", 2),
+    ("high school", 1), ("high-school", 1),
+]
+
+# Option tokens to look for, in order, for each preferred work setting
+WORK_SETTING_TOKENS = {
+    "remote": ["remote", "yes"],
+    "on-site": ["on-site", "onsite", "no"],
+    "hybrid": ["hybrid", "flexible"],
+}
+
+PLACEHOLDERS = ["select", "choose", "please"]
+
+WORD_PATTERN = re.compile(r"[a-z]+")
+
+
+class KeywordAutomaton:
+    """Aho-Corasick matcher finding every keyword in a string in one pass"""
+    def __init__(self, keywords):
+        goto = [{}]
+        output = [set()]
+        for keyword in keywords:
+            state = 0
+            for char in keyword:
+                if char not in goto[state]:
+                    goto.append({})
+                    output.append(set())
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            output[state].add(keyword)
+
+        # Breadth-first failure links, folded into a full transition table so a
+        # scan is a single dict lookup per character
+        fail = [0] * len(goto)
+        delta = [dict() for _ in goto]
+        delta[0] = dict(goto[0])
+        queue = list(goto[0].values())
+        while queue:
+            state = queue.pop(0)
+            delta[state] = dict(delta[fail[state]])
+            for char, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(char, 0)
+                output[child] |= output[fail[child]]
+                delta[state][char] = child
+                queue.append(child)
+
+        self._delta = delta
+        self._output = [frozenset(keywords) for keywords in output]
+
+    def scan(self, text):
+        """Return the set of keywords occurring anywhere in text"""
+        found = set()
+        state = 0
+        delta = self._delta
+        output = self._output
+        for char in text:
+            state = delta[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+        return found
+
+
+class RuleSet:
+    """A compiled FIELD_RULES table"""
+    def __init__(self, rules):
+        self.rules = rules
+        keywords = set()
+        for rule in rules:
+            keywords.update(rule["keywords"])
+            keywords.update(rule.get("requires", []))
+        self.automaton = KeywordAutomaton(sorted(keywords))
+
+    def match(self, identifier, kind="choice"):
+        """Return the first rule of this kind matching the field identifier, or None"""
+        found = self.automaton.scan(identifier.lower())
+        if not found:
+            return None
+        for rule in self.rules:
+            if rule["kind"] != kind:
+                continue
+            if found.intersection(rule["keywords"]) and found.issuperset(rule.get("requires", [])):
+                return rule
+        return None
+
+
+def lookup(resume_data, path):
+    """Follow a dotted path into resume_data, returning "" when anything is missing"""
+    value = resume_data
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return ""
+        value = value[key]
+    return value
+
+
+def degree_priority(text):
+    text = str(text).lower()
+    return max([priority for degree, priority in DEGREE_PRIORITY if degree in text] or [0])
+
+
+def text_answer(rule, resume_data):
+    """Resolve a "text" rule to the string to type"""
+    value = str(lookup(resume_data, rule["source"]) or "")
+    words = value.split()
+    if rule["policy"] == "first_word":
+        return words[0] if words else ""
+    if rule["policy"] == "last_word":
+        return words[-1] if words else ""
+    return value
+
+
+def choose_option(rule, resume_data, options):
+    """Pick the option answering a "choice" rule
+
+    Args:
+        rule: Matched rule, or None for questions no rule recognises
+        resume_data: Dictionary containing resume information
+        options: List of (text, value) pairs in display order
+
+    Returns:
+        Index into options, or None when the rule has no opinion
+    """
+    if rule is None:
+        return None
+    lowered = [(text.lower(), (value or "").lower()) for text, value in options]
+
+    policy = rule["policy"]
+    if policy in ("yes_no", "always_yes"):
+        want = "yes" if policy == "always_yes" else str(lookup(resume_data, rule["source"])).lower().strip()
+        for index, (text, value) in enumerate(lowered):
+            if want in WORD_PATTERN.findall(text) or value == want:
+                return index
+
+    elif policy == "work_setting":
+        preferred = str(lookup(resume_data, rule["source"])).lower()
+        for setting, tokens in WORK_SETTING_TOKENS.items():
+            if setting not in preferred:
+                continue
+            for token in tokens:
+                for index, (text, value) in enumerate(lowered):
+                    if token in ("yes", "no"):
+                        found = token in WORD_PATTERN.findall(text)
+                    else:
+                        found = token in text
+                    if found or value == token:
+                        return index
+
+    elif policy == "degree":
+        education = lookup(resume_data, rule["source"]) or []
+        if isinstance(education, dict):
+            education = [education]
+        highest = max([degree_priority(entry.get("degree", "")) for entry in education if isinstance(entry, dict)] or [0])
+        best, best_priority = None, 0
+        for index, (text, _) in enumerate(lowered):
+            priority = degree_priority(text)
+            if best_priority < priority <= highest:
+                best, best_priority = index, priority
+        return best
+
+    return None
+
+
+def default_option(options, start=0):
+    """Fallback choice: an exact "Yes", else the first non-placeholder option from start on"""
+    for index, (text, _) in enumerate(options):
+        if text.lower() == "yes":
+            return index
+    for index, (text, _) in enumerate(options[start:], start):
+        if not any(placeholder in text.lower() for placeholder in PLACEHOLDERS):
+            return index
+    return None
+
+
+def radio_group_identifier(radios):
+    """Identifier for a radio group: its question text plus the group's name and id"""
+    first = radios[0]
+    return " ".join([first.get("group_label", ""), first["name"], first["id"], first["aria_label"]]).lower()
+
+
+def resolve_radio_group(radios, resume_data):
+    """Pick the radio to select for one group of snapshot fields
+
+    Returns:
+        The chosen field, or None when the group is already answered or disabled
+    """
+    if any(radio["checked"] for radio in radios):
+        return None
+    enabled = [radio for radio in radios if radio["enabled"]]
+    if not enabled:
+        return None
+
+    options = [(radio["label"], radio["value"]) for radio in enabled]
+    rule = FIELD_RULESET.match(radio_group_identifier(enabled), kind="choice")
+    index = choose_option(rule, resume_data, options)
+
+    if index is None:
+        # Unknown question: prefer a "Yes"/"true" option, otherwise the first one
+        index = 0
+        for position, (text, value) in enumerate(options):
+            if "yes" in WORD_PATTERN.findall(text.lower()) or value.lower() in ("yes", "true"):
+                index = position
+                break
+    return enabled[index]
+
+
+FIELD_RULESET = RuleSet(FIELD_RULES)
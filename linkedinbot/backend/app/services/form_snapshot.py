@@ -0,0 +1,116 @@
+# single-roundtrip snapshot of every field on the current Easy Apply step
+from collections import OrderedDict
+
+
+# Collects each field's attributes, resolved label, state and options in one pass.
+# Elements come back as WebElements inside the returned JSON document.
+FORM_SNAPSHOT_SCRIPT = """
+var root = arguments[0] || document.querySelector('.jobs-easy-apply-modal') || document;
+
+function text(el) {
+    return el ? (el.innerText || el.textContent || '').replace(/\\s+/g, ' ').trim() : '';
+}
+
+function isVisible(el) {
+    var rect = el.getBoundingClientRect();
+    var style = window.getComputedStyle(el);
+    return rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden' && style.display !== 'none';
+}
+
+function labelFor(el, checkable) {
+    if (el.id) {
+        var direct = document.querySelector('label[for="' + CSS.escape(el.id) + '"]');
+        if (direct) return text(direct);
+    }
+    if (el.labels && el.labels.length) return text(el.labels[0]);
+    var parent = el.parentElement;
+    if (parent) {
+        var nearby = parent.querySelector(checkable ? 'label, span' : 'label');
+        if (nearby) return text(nearby);
+    }
+    return '';
+}
+
+function groupLabel(el) {
+    var fieldset = el.closest('fieldset');
+    if (fieldset) {
+        var legend = fieldset.querySelector('legend');
+        if (legend) return text(legend);
+    }
+    var labelledBy = el.closest('[aria-labelledby]');
+    if (labelledBy) {
+        var heading = document.getElementById(labelledBy.getAttribute('aria-labelledby').split(' ')[0]);
+        if (heading) return text(heading);
+    }
+    return '';
+}
+
+var fields = [];
+root.querySelectorAll('input:not([type="hidden"]), textarea, select').forEach(function (el) {
+    var type = (el.type || '').toLowerCase();
+    var checkable = type === 'radio' || type === 'checkbox';
+    var field = {
+        element: el,
+        index: fields.length,
+        tag: el.tagName.toLowerCase(),
+        type: type,
+        id: el.id || '',
+        name: el.getAttribute('name') || '',
+        aria_label: el.getAttribute('aria-label') || '',
+        placeholder: el.getAttribute('placeholder') || '',
+        label: labelFor(el, checkable),
+        group_label: checkable ? groupLabel(el) : '',
+        value: el.value || '',
+        checked: checkable ? el.checked : false,
+        visible: isVisible(el),
+        enabled: !el.disabled && !el.readOnly,
+        required: el.required || el.getAttribute('aria-required') === 'true',
+        options: []
+    };
+    if (field.tag === 'select') {
+        field.options = Array.prototype.map.call(el.options, function (option) {
+            return {text: option.text.trim(), value: option.value, selected: option.selected};
+        });
+    }
+    fields.push(field);
+});
+return {fields: fields};
+"""
+
+
+def take_form_snapshot(driver, root=None):
+    """Return every field on the current step from a single execute_script call
+
+    Args:
+        driver: Selenium WebDriver instance
+        root: Optional element to scope the snapshot to (defaults to the Easy Apply modal)
+
+    Returns:
+        Dictionary with a "fields" list; each field carries its WebElement under "element"
+        and a lowercase "identifier" built from id, name, aria-label and label text
+    """
+    snapshot = driver.execute_script(FORM_SNAPSHOT_SCRIPT, root)
+    for field in snapshot["fields"]:
+        field["identifier"] = " ".join(
+            [field["id"], field["name"], field["aria_label"], field["label"]]
+        ).lower()
+    return snapshot
+
+
+def is_filled(field):
+    """Checkable inputs count as filled when checked, everything else when it has a value"""
+    if field["type"] in ("radio", "checkbox"):
+        return field["checked"]
+    if field["tag"] == "select":
+        # The first option is usually a "Select an option" placeholder
+        return bool(field["options"]) and not field["options"][0]["selected"]
+    return bool(field["value"])
+
+
+def radio_groups(snapshot):
+    """Group radio fields by name, keeping document order"""
+    groups = OrderedDict()
+    for field in snapshot["fields"]:
+        if field["type"] == "radio":
+            groups.setdefault(field["name"] or field["id"], []).append(field)
+    return groups
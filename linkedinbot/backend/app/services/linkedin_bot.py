@@ -1,7 +1,6 @@
 # selenium , automation logic 
-import time
-import random 
 import json 
+import os
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
@@ -9,6 +8,17 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 from .app_process import load_resume_data, handle_application_process
+from .pacing import get_pacing_policy
+from .answer_cache import get_answer_cache
+from .question_similarity import get_similarity_index
+from .llm_client import get_llm_client
+from .llm_metrics import get_llm_metrics
+from .prefetch import get_prefetcher
+from .local_answerer import get_local_answer_stats
+from .waits import (
+    get_wait_stats, settle, scroll_into_view, wait_for_dom_settled,
+    wait_for_element, wait_for_network_idle, wait_for_page_ready
+)
 
 class LinkedInBot:
     def __init__(self, job_title, location ):
@@ -23,7 +33,7 @@ class LinkedInBot:
             # Navigate to Jobs page
             print("Navigating to LinkedIn Jobs page...")
             driver.get("https://www.linkedin.com/jobs/")
-            time.sleep(3)  # Give page time to fully load
+            wait_for_page_ready(driver, timeout=10, legacy=3)
             
             # Try to find the job title input field using multiple selectors
             print("Looking for job title input field...")
@@ -55,9 +65,8 @@ class LinkedInBot:
             # Clear and fill the job title field
             print(f"Entering job title: {job_title}")
             job_title_input.clear()
-            time.sleep(1)
             job_title_input.send_keys(job_title)
-            time.sleep(1)
+            settle(driver, legacy=2)  # Let the typeahead render
             
             # Find location input field
             print("Looking for location input field...")
@@ -84,9 +93,8 @@ class LinkedInBot:
             # Clear and fill the location field
             print(f"Entering location: {location}")
             location_input.clear()
-            time.sleep(1)
             location_input.send_keys(location)
-            time.sleep(1)
+            settle(driver, legacy=2)
             
             # Press Enter to submit the search
             print("Submitting search...")
@@ -94,16 +102,14 @@ class LinkedInBot:
             
             # Wait for search results to load
             print("Waiting for search results...")
-            time.sleep(5)  # Initial wait for page load
-            
-            try:
-                # Try to detect if search results have loaded by looking for common elements
-                WebDriverWait(driver, 15).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, ".jobs-search-results-list, .jobs-search__job-details"))
-                )
+            results = wait_for_element(
+                driver, (By.CSS_SELECTOR, ".jobs-search-results-list, .jobs-search__job-details"),
+                timeout=20, legacy=5
+            )
+            if results:
                 print("Job search completed successfully")
                 return True
-            except:
+            else:
                 # If specific elements aren't found, check if URL contains job search parameters
                 current_url = driver.current_url
                 if "keywords=" in current_url and ("location=" in current_url or "geoId=" in current_url):
@@ -163,7 +169,7 @@ class LinkedInBot:
             # Click the Easy Apply button
             print("Clicking Easy Apply filter button...")
             driver.execute_script("arguments[0].click();", easy_apply_button)
-            time.sleep(3)  # Wait for filter to apply
+            wait_for_network_idle(driver, timeout=5, max_inflight=2, legacy=3)  # Wait for filter to apply
             
             # Check if filter is applied
             try:
@@ -188,15 +194,27 @@ class LinkedInBot:
             return False
         
 
-    def process_job_listings(driver, llm, max_applications=10):
-        """Process through the list of jobs and apply to them"""
+    def process_job_listings(driver, llm, max_applications=10, pacing=None, resume_data=None, progress=None,
+                             results_path="applied_jobs.json"):
+        """Process through the list of jobs and apply to them
+
+        resume_data defaults to the RESUME_DATA_FILE contents. progress, when given, is
+        called with jobs_viewed, applied and failed counts after every application. The
+        jobs applied to are written to results_path.
+        """
         print("Processing job listings...")
+        pacing = pacing or get_pacing_policy()
+        pacing.start_run()
+        get_local_answer_stats().start_run()
+        get_llm_metrics().start_run()
+        get_prefetcher().start_run()
         applied_count = 0
+        failed_count = 0
         jobs_viewed = 0
         applied_jobs = []
         
         # Load resume data for application responses
-        resume_data = load_resume_data()
+        resume_data = resume_data or load_resume_data()
         if not resume_data:
             print("Failed to load resume data, cannot proceed with applications")
             return False
@@ -207,7 +225,7 @@ class LinkedInBot:
             WebDriverWait(driver, 15).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".jobs-search-results-list, .scaffold-layout__list"))
             )
-            time.sleep(3)  # Additional wait to ensure full loading
+            wait_for_dom_settled(driver, quiet_ms=300, timeout=5, legacy=3)
             
             print("Identifying job cards...")
             # Try multiple selectors for job cards
@@ -245,7 +263,7 @@ class LinkedInBot:
                         for button in close_buttons:
                             if button.is_displayed():
                                 driver.execute_script("arguments[0].click();", button)
-                                time.sleep(1)
+                                settle(driver, legacy=1)
                     except:
                         pass
                     
@@ -254,10 +272,10 @@ class LinkedInBot:
                     jobs_viewed += 1
                     
                     print(f"Processing job {jobs_viewed}/{len(job_cards)}...")
+                    get_wait_stats(driver).start_application()
                     
                     # Scroll the job card into view
-                    driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", current_job)
-                    time.sleep(1)
+                    scroll_into_view(driver, current_job, legacy=1)
                     
                     # Click on the job card with retry mechanism
                     job_clicked = False
@@ -274,14 +292,14 @@ class LinkedInBot:
                                 job_clicked = True
                             except:
                                 attempts += 1
-                                time.sleep(1)
+                                settle(driver, legacy=1)
                     
                     if not job_clicked:
                         print("Failed to click job card, skipping to next job")
                         continue
                     
                     # Wait for job details to load
-                    time.sleep(2)
+                    wait_for_dom_settled(driver, quiet_ms=250, timeout=4, legacy=2)
                     
                     # Get job details
                     try:
@@ -299,6 +317,13 @@ class LinkedInBot:
                         job_title = "Unknown Position"
                         company = "Unknown Company"
                     
+                    # LLM calls from here on, prefetches included, are accounted to this job
+                    get_llm_metrics().start_application(job_title, company)
+                    
+                    # Start answering this job's likely questions while the page keeps loading
+                    if company != "Unknown Company":
+                        get_prefetcher().prefetch(llm, resume_data, job_title, company)
+                    
                     # Check for Easy Apply button with comprehensive selectors
                     easy_apply_found = False
                     for selector in [
@@ -325,25 +350,37 @@ class LinkedInBot:
                     # Click Easy Apply button
                     try:
                         # Scroll to ensure button is in view
-                        driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", easy_apply_button)
-                        time.sleep(1)
+                        scroll_into_view(driver, easy_apply_button, legacy=1)
+                        
+                        # Respect the account's application rate before starting another one
+                        delay = pacing.pace("application")
+                        if delay:
+                            print(f"Paced {delay:.1f} seconds before next application")
                         
                         # Try clicking
                         driver.execute_script("arguments[0].click();", easy_apply_button)
-                        time.sleep(2)
+                        wait_for_element(
+                            driver, (By.CSS_SELECTOR, ".jobs-easy-apply-modal, .artdeco-modal"),
+                            state="visible", timeout=5, legacy=2
+                        )
                         
                         # Handle the application process
-                        if handle_application_process(driver, llm, resume_data, job_title, company):
+                        applied = handle_application_process(driver, llm, resume_data, job_title, company, pacing=pacing)
+                        usage = get_llm_metrics().finish_application("applied" if applied else "failed")
+                        print(f"LLM this application: {usage['llm_calls']} calls, "
+                              f"~{usage['prompt_tokens']} prompt / ~{usage['completion_tokens']} completion tokens, "
+                              f"{usage['llm_seconds']:.1f}s, {usage['answers']} answers {usage['by_cache']}")
+                        waits = get_wait_stats(driver).report()
+                        print(f"Waits this application: {waits['waits']}, "
+                              f"{waits['waited_seconds']:.1f}s waited vs {waits['legacy_seconds']:.1f}s of fixed sleeps "
+                              f"({waits['seconds_saved']:.1f}s saved)")
+                        if applied:
                             applied_count += 1
                             applied_jobs.append({"company": company, "title": job_title})
                             print(f"Successfully applied to: {job_title} at {company}")
                             print(f"Application {applied_count}/{max_applications} completed")
-                            
-                            # Add random delay between applications
-                            delay = random.uniform(5, 10)
-                            print(f"Waiting {delay:.1f} seconds before next application...")
-                            time.sleep(delay)
                         else:
+                            failed_count += 1
                             print(f"Failed to complete application for: {job_title} at {company}")
                             
                             # Try to close any open dialogs
@@ -352,12 +389,15 @@ class LinkedInBot:
                                 for button in close_buttons:
                                     if button.is_displayed():
                                         driver.execute_script("arguments[0].click();", button)
-                                        time.sleep(1)
+                                        settle(driver, legacy=1)
                             except:
                                 pass
                     except Exception as e:
                         print(f"Error clicking Easy Apply button: {e}")
                         continue
+                    finally:
+                        if progress:
+                            progress(jobs_viewed=jobs_viewed, applied=applied_count, failed=failed_count)
                     
                     # Check if we've reached our application limit
                     if applied_count >= max_applications:
@@ -375,7 +415,7 @@ class LinkedInBot:
                     # Scroll down to load more jobs
                     job_list_container = driver.find_element(By.CSS_SELECTOR, ".jobs-search-results-list, .scaffold-layout__list")
                     driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", job_list_container)
-                    time.sleep(3)
+                    wait_for_network_idle(driver, timeout=5, max_inflight=2, legacy=3)
                     
                     # Get updated job cards
                     old_count = len(job_cards)
@@ -395,9 +435,39 @@ class LinkedInBot:
                         break
             
             print(f"Application process completed. Applied to {applied_count} jobs.")
+            waits = get_wait_stats(driver).report("run")
+            print(f"Seconds saved by event-driven waits this run: {waits['seconds_saved']:.1f} "
+                  f"({waits['seconds_saved'] / max(applied_count, 1):.1f}s per application)")
+            paced = pacing.report()
+            print(f"Pacing ({paced['mode']}): {paced['paced_seconds']:.1f}s paced vs "
+                  f"{paced['working_seconds']:.1f}s working ({paced['paced_share']:.0%} of the run)")
+            answers = get_answer_cache().stats()
+            print(f"Answer cache: {answers['hits']} hits, {answers['misses']} misses "
+                  f"({answers['hit_rate']:.0%}), {answers['seconds_saved']:.1f}s of LLM calls saved")
+            similar = get_similarity_index().stats()
+            print(f"Similar-question reuse: {similar['hits']} of {similar['hits'] + similar['misses']} cache misses")
+            local = get_local_answer_stats().report()
+            print(f"Questions answered from resume data: {local['local']}, sent on to cache/LLM: {local['remote']} "
+                  f"({local['local_share']:.0%} local)")
+            prefetched = get_prefetcher().report()
+            print(f"Answer prefetch: {prefetched['hits']} of {prefetched['asked']} questions answered ahead "
+                  f"({prefetched['hit_rate']:.0%}), {prefetched['wasted']} prefetched answers unused")
+            client = get_llm_client()
+            if client:
+                calls = client.stats()
+                latency = calls["latency"]
+                print(f"LLM calls: {calls['calls']} ({calls['failures']} failed, {calls['hedges']} hedged), "
+                      f"p50 {latency['p50'] or 0:.2f}s p95 {latency['p95'] or 0:.2f}s p99 {latency['p99'] or 0:.2f}s")
+            usage = get_llm_metrics().report()
+            print(f"LLM tokens this run: ~{usage['run']['prompt_tokens']} prompt, "
+                  f"~{usage['run']['completion_tokens']} completion over {usage['run']['llm_calls']} calls")
+            for bucket, sizes in usage["by_prompt_size"].items():
+                print(f"  prompts {bucket} tokens: {sizes['calls']} calls, {sizes['mean_seconds']:.2f}s mean latency")
             
             # Save the list of jobs we applied to
-            with open("applied_jobs.json", "w") as file:
+            if os.path.dirname(results_path):
+                os.makedirs(os.path.dirname(results_path), exist_ok=True)
+            with open(results_path, "w") as file:
                 json.dump(applied_jobs, file, indent=4)
                 
             return True
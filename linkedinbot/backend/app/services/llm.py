@@ -1,146 +1,489 @@
 # llm and gemini logic here 
-from langchain_google_genai import GoogleGenerativeAI
+import json
 import os
+import re
+import textwrap
+import time
 from dotenv import load_dotenv
 
-from app_process import question, resume_data, job_title, company, question_lower, llm, PromptTemplate
 # Import the Config class from  config.py file
-from app.config.config import Config
+from app.config.config import Config, config
+from app.services.answer_cache import get_answer_cache, job_context, resume_hash
+from app.services.question_similarity import get_similarity_index, similar_answer, similarity_scope
+from app.services.llm_backends import create_llm
+from app.services.llm_client import get_llm_client
+from app.services.llm_metrics import estimate_tokens, fit_to_budget, get_llm_metrics
+from app.services.prefetch import get_prefetcher
+from app.services.local_answerer import answer_locally
 
 class LLMController:
     def __init__(self):
         self.config = Config()
-        os.environ["GOOGLE_API_KEY"] = self.config.GEMINI_API_KEY
+        # Only the Gemini backend needs a key; the stub and the fake run without one
+        if self.config.GEMINI_API_KEY:
+            os.environ["GOOGLE_API_KEY"] = self.config.GEMINI_API_KEY
 
 
     def setup_llm(self):
-        llm = GoogleGenerativeAI(
-            model="gemini-1.5-flash",
-            google_api_key=os.environ["GOOGLE_API_KEY"], 
-            temperature=0.7
+        """The configured LLM backend: Gemini, the local stub server or the in-process fake"""
+        llm = create_llm(
+            self.config.LLM_BACKEND,
+            model=self.config.LLM_MODEL,
+            api_key=os.environ.get("GOOGLE_API_KEY"),
+            temperature=0.7,
+            stub_url=self.config.LLM_STUB_URL,
+            timeout=self.config.LLM_TIMEOUT,
+            latency=self.config.LLM_STUB_LATENCY,
+            error_rate=self.config.LLM_STUB_ERROR_RATE,
+            answers_path=self.config.LLM_STUB_ANSWERS,
+            tokens_per_second=self.config.LLM_STUB_TOKENS_PER_SECOND,
+            seed=self.config.LLM_STUB_SEED,
         )
         return llm
+
+    def setup_client(self):
+        """The configured LLM behind the shared client: rate-limited, bounded and with deadlines"""
+        return get_llm_client() or get_llm_client(self.setup_llm())
+
+
+# Prompt templates, parsed once at import. The applicant part is rendered once per resume
+# version by ResumeContext; only the job and the questions are filled in per call.
+PROMPT_PREFIX = textwrap.dedent("""
+    You are helping a job applicant answer questions on a LinkedIn job application form.
     
-    def generate_answer_with_llm(llm, question, resume_data, job_title, company):
-        """Generate an appropriate answer to a custom question using the LLM with improved error handling"""
-        try:
-            print(f"Generating answer for question: {question}")
-            
-            # Check if question is empty or too short
-            if not question or len(question) < 5:
-                print("Question text too short, skipping LLM generation")
-                return ""
-                
-            # Extract skills and experience from resume data for use in the prompt
-            skills = ", ".join(resume_data["skills"][:5]) if "skills" in resume_data else ""
-            experience_summary = ""
-            if "work_experience" in resume_data and resume_data["work_experience"]:
-                latest_job = resume_data["work_experience"][0]
-                experience_summary = f"{latest_job.get('title', '')} at {latest_job.get('company', '')} - {latest_job.get('description', '')}"
-            
-            # Build a more focused prompt template
-            prompt_template = PromptTemplate(
-                input_variables=["question", "job_title", "company", "skills", "experience", "profile"],
-                template="""
-                You are helping a job applicant answer a question on a LinkedIn job application form.
-                
-                JOB: {job_title} at {company}
-                
-                QUESTION: {question}
-                
-                APPLICANT INFO:
-                - Skills: {skills}
-                - Recent Experience: {experience}
-                - Additional Profile Info: {profile}
-                
-                Write a concise, professional response that directly answers the question. 
-                Make it specific to the job position and highlight relevant skills or experience.
-                Keep it under 100 words, using first-person perspective.Just write the very short answer directly, and if the answer is numbers then answer in digits.
-                Don't start with phrases like "As a [job title]" or "Based on my experience" - just answer directly.
-                Only output the answer text with no quotation marks or additional commentary.
-                """
-            )
-            
-            # Extract a compact profile summary for the prompt
-            profile_summary = f"Education: {resume_data['education'][0]['degree'] if 'education' in resume_data and resume_data['education'] else 'Not specified'}, "
-            profile_summary += f"Years of experience: {resume_data['questions'].get('years_of_experience', 'Not specified')}, "
-            profile_summary += f"Willing to relocate: {resume_data['questions'].get('willing_to_relocate', 'Not specified')}"
-            
-            # Format the prompt with our data
-            formatted_prompt = prompt_template.format(
-                question=question,
-                job_title=job_title,
-                company=company,
-                skills=skills,
-                experience=experience_summary,
-                profile=profile_summary
-            )
-            print(formatted_prompt)
-            
-            # Generate the answer with timeout handling
-            try:
-                response = llm.invoke(formatted_prompt)
-                answer = response.strip()
-                
-                # Handle common edge cases
-                if "As an AI assistant" in answer or "As an AI language model" in answer:
-                    answer = answer.split("\n", 1)[1] if "\n" in answer else ""
-                
-                # Remove any quotation marks around the answer
-                answer = answer.strip('"\'')
-                
-                print(f"Generated answer: {answer[:100]}...")
-                return answer
-            except Exception as e:
-                print(f"LLM timeout or error: {e}")
-                # Fall through to backup answers
-            
-        except Exception as e:
-            print(f"Error generating answer with LLM: {e}")
-        
-        # Enhanced fallback answers for common questions - more tailored to the job
-        # These will be used if the LLM fails
-        
-        # Extract key resume info for fallbacks
-        skills_list = resume_data.get('skills', ['problem-solving', 'communication', 'teamwork'])
-        top_skills = ', '.join(skills_list[:3])
-        experience_years = resume_data.get('questions', {}).get('years_of_experience', '3+')
-        
-        # Pattern match the question for better fallbacks
-        question_lower = question.lower()
-        
-        if any(phrase in question_lower for phrase in ["tell us about yourself", "introduce yourself", "background"]):
-            return f"I'm a dedicated professional with {experience_years} years of experience and expertise in {top_skills}. Throughout my career, I've focused on delivering excellent results while continuously expanding my skill set. I'm particularly interested in this {job_title} role at {company} as it aligns with my professional goals and strengths."
-        
-        elif any(phrase in question_lower for phrase in ["why do you want to work", "why are you interested", "why join"]):
-            return f"I'm drawn to {company} because of its reputation for innovation and impact in the industry. The {job_title} position particularly excites me as it leverages my skills in {top_skills}. I believe my background would allow me to contribute effectively while growing professionally in this role."
-        
-        elif any(phrase in question_lower for phrase in ["salary", "compensation", "pay", "expected"]):
-            return resume_data.get('questions', {}).get('salary_expectation', "My salary expectations are flexible and based on the total compensation package, but I'm looking in the range typical for this role considering my experience level.")
-        
-        elif any(phrase in question_lower for phrase in ["start", "when can you start", "availability"]):
-            return resume_data.get('questions', {}).get('preferred_start_date', "I can be available to start within two weeks after receiving an offer, though I'm flexible and can adjust based on your needs.")
-        
-        elif any(phrase in question_lower for phrase in ["strength", "greatest strength"]):
-            return f"My greatest strength is my ability to {skills_list[0] if skills_list else 'quickly adapt to new challenges'}. This has enabled me to consistently deliver results in previous roles, particularly when working on complex projects requiring {skills_list[1] if len(skills_list) > 1 else 'attention to detail'}."
-        
-        elif any(phrase in question_lower for phrase in ["weakness", "area for improvement"]):
-            return "I tend to be very detail-oriented, which sometimes means I spend extra time ensuring everything is perfect. I've learned to balance this by setting clear timelines and checkpoints to ensure I maintain both quality and efficiency."
+    APPLICANT INFO:
+    - Skills: {skills}
+    - Recent Experience: {experience}
+    - Additional Profile Info: {profile}
+    """)
+
+ANSWER_PROMPT = textwrap.dedent("""
+    JOB: {job_title} at {company}
+    
+    QUESTION: {question}
+    
+    Write a concise, professional response that directly answers the question. 
+    Make it specific to the job position and highlight relevant skills or experience.
+    Keep it under 100 words, using first-person perspective.Just write the very short answer directly, and if the answer is numbers then answer in digits.
+    Don't start with phrases like "As a [job title]" or "Based on my experience" - just answer directly.
+    Only output the answer text with no quotation marks or additional commentary.
+    """)
+
+BATCH_PROMPT = textwrap.dedent("""
+    JOB: {job_title} at {company}
+    
+    QUESTIONS (JSON list; "field" is "paragraph" or "single line", "max_characters" is a hard limit when set):
+    {questions}
+    
+    Answer every question concisely and professionally in the first person, specific to the job position.
+    Paragraph answers stay under 100 words; single line answers are a few words, and numbers are written in digits.
+    Don't start with phrases like "As a [job title]" or "Based on my experience" - just answer directly.
+    Return ONLY a JSON object mapping each question id to its answer string, with no other text.
+    """)
+
+
+def applicant_info(resume_data):
+    """Skills, latest experience and a compact profile summary for prompts"""
+    skills = ", ".join(resume_data["skills"][:5]) if "skills" in resume_data else ""
+    experience_summary = ""
+    if "work_experience" in resume_data and resume_data["work_experience"]:
+        latest_job = resume_data["work_experience"][0]
+        experience_summary = f"{latest_job.get('title', '')} at {latest_job.get('company', '')} - {latest_job.get('description', '')}"
+    
+    questions = resume_data.get("questions", {})
+    profile_summary = f"Education: {resume_data['education'][0]['degree'] if 'education' in resume_data and resume_data['education'] else 'Not specified'}, "
+    profile_summary += f"Years of experience: {questions.get('years_of_experience', 'Not specified')}, "
+    profile_summary += f"Willing to relocate: {questions.get('willing_to_relocate', 'Not specified')}"
+    return skills, experience_summary, profile_summary
+
+
+class ResumeContext:
+    """Prompt context compiled once per resume version: its hash, summaries and the
+    rendered applicant part of every prompt
+
+    The summaries are trimmed to token_budget (LLM_RESUME_TOKEN_BUDGET by default),
+    experience first, then skills, then the profile.
+    """
+    def __init__(self, resume_data, token_budget=None):
+        self.resume_data = resume_data
+        self.hash = resume_hash(resume_data)
+        skills, experience, profile = applicant_info(resume_data)
+        budget = config.LLM_RESUME_TOKEN_BUDGET if token_budget is None else token_budget
+        fitted = fit_to_budget(
+            [("experience", experience), ("skills", skills), ("profile", profile)],
+            budget,
+            fixed=estimate_tokens(PROMPT_PREFIX.format(skills="", experience="", profile="")),
+        )
+        self.skills, self.experience, self.profile = fitted["skills"], fitted["experience"], fitted["profile"]
+        self.trimmed = (self.skills, self.experience, self.profile) != (skills, experience, profile)
+        if self.trimmed:
+            print(f"Resume context trimmed to the {budget}-token budget")
+        self.prompt_prefix = PROMPT_PREFIX.format(skills=self.skills, experience=self.experience, profile=self.profile)
+
+    def answer_prompt(self, question, job_title, company):
+        return self.prompt_prefix + ANSWER_PROMPT.format(question=question, job_title=job_title, company=company)
+
+    def batch_prompt(self, questions, job_title, company):
+        return self.prompt_prefix + BATCH_PROMPT.format(questions=questions, job_title=job_title, company=company)
+
+
+_resume_context = None
+
+
+def get_resume_context(resume_data):
+    """The ResumeContext for this resume_data, rebuilt only when a different resume is passed"""
+    global _resume_context
+    context = _resume_context
+    if context is None or context.resume_data is not resume_data:
+        context = ResumeContext(resume_data)
+        _resume_context = context
+    return context
+
+
+def clean_answer(answer):
+    """Strip assistant boilerplate and surrounding quotes from a generated answer"""
+    answer = str(answer).strip()
+    
+    # Handle common edge cases
+    if "As an AI assistant" in answer or "As an AI language model" in answer:
+        answer = answer.split("\n", 1)[1] if "\n" in answer else ""
+    
+    # Remove any quotation marks around the answer
+    return answer.strip('"\'')
+
+
+def known_answer(question, resume_data, job_title, company):
+    """Answer from the on-disk cache, then from a paraphrase answered before, else None"""
+    cache = get_answer_cache()
+    current_hash = get_resume_context(resume_data).hash
+    context = job_context(question, job_title, company)
+    cached = cache.get(question, current_hash, context)
+    if cached is not None:
+        print(f"Answer cache hit: {cached[:100]}...")
+        return cached
+    
+    similar = similar_answer(question, current_hash, context)
+    if similar:
+        answer, matched, score = similar
+        print(f"Reusing answer to similar question ({score:.2f}): {matched}")
+        return answer
+    return None
+
+
+def remember_answer(question, answer, latency, resume_data, job_title, company):
+    """Store a generated answer in the cache and the similar-question index"""
+    if not answer:
+        return
+    current_hash = get_resume_context(resume_data).hash
+    context = job_context(question, job_title, company)
+    get_answer_cache().put(question, current_hash, answer, latency, context)
+    get_similarity_index().add(question, similarity_scope(current_hash, context))
+
+
+def generate_answer_with_llm(llm, question, resume_data, job_title, company, field="paragraph", local=True,
+                             kind="answer"):
+    """Generate an appropriate answer to a custom question using the LLM with improved error handling
+
+    Questions the resume answers with confidence are answered locally first, unless
+    local is False because the caller already tried. kind labels the call in the LLM
+    metrics.
+    """
+    metrics = get_llm_metrics()
+    try:
+        print(f"Generating answer for question: {question}")
         
-        elif any(phrase in question_lower for phrase in ["challenge", "difficult situation", "overcome"]):
-            return f"In a previous role, I faced a significant challenge when working on a time-sensitive project with changing requirements. By maintaining clear communication with stakeholders and leveraging my skills in {top_skills}, I was able to adapt quickly and deliver successfully despite the obstacles."
+        # Check if question is empty or too short
+        if not question or len(question) < 5:
+            print("Question text too short, skipping LLM generation")
+            return ""
         
-        elif any(phrase in question_lower for phrase in ["remote", "work from home", "hybrid"]):
-            preferred_setting = resume_data.get('questions', {}).get('preferred_work_setting', 'flexible')
-            return f"I'm comfortable working in a {preferred_setting} environment. I have experience collaborating effectively both remotely and on-site, and value maintaining strong communication and productivity regardless of the work setting."
+        # Structured questions are answered straight from the resume
+        if local:
+            answer = answer_locally(question, resume_data, field)
+            if answer is not None:
+                print(f"Answered from resume data: {answer}")
+                metrics.record(kind, cache="local")
+                return answer
         
-        elif any(phrase in question_lower for phrase in ["relocate", "relocation", "move"]):
-            willing = resume_data.get('questions', {}).get('willing_to_relocate', 'Yes')
-            return f"{'I am willing to relocate for the right opportunity.' if willing.lower() == 'yes' else 'I prefer positions in my current location, but am open to discussing options for exceptional opportunities.'}"
+        # Repeat questions and their paraphrases are answered locally
+        known = known_answer(question, resume_data, job_title, company)
+        if known is not None:
+            metrics.record(kind, cache="cached")
+            return known
+            
+        # The applicant part of the prompt is rendered once per resume version
+        formatted_prompt = get_resume_context(resume_data).answer_prompt(question, job_title, company)
+        print(f"Prompt: ~{estimate_tokens(formatted_prompt)} tokens")
         
-        elif any(phrase in question_lower for phrase in ["visa", "sponsorship", "work authorization"]):
-            need_visa = resume_data.get('questions', {}).get('visa_sponsorship_required', 'No')
-            return f"{'I am authorized to work in the United States without sponsorship.' if need_visa.lower() == 'no' else 'I would require visa sponsorship to work in the United States.'}"
+        # Generate the answer with timeout handling
+        started = time.monotonic()
+        try:
+            response = llm.invoke(formatted_prompt)
+            answer = clean_answer(response)
+            
+            print(f"Generated answer: {answer[:100]}...")
+            seconds = time.monotonic() - started
+            metrics.record(kind, formatted_prompt, str(response), seconds)
+            remember_answer(question, answer, seconds, resume_data, job_title, company)
+            return answer
+        except Exception as e:
+            print(f"LLM timeout or error: {e}")
+            metrics.record(kind, formatted_prompt, seconds=time.monotonic() - started, outcome="error")
+            # Fall through to backup answers
         
-        # Generic fallback for other questions
-        return f"Based on my {experience_years} years of experience with {top_skills}, I believe I would be able to make strong contributions to this {job_title} role. I'm excited about the opportunity to bring my skills to {company} and help achieve your team's goals."
\ No newline at end of file
+    except Exception as e:
+        print(f"Error generating answer with LLM: {e}")
+    
+    # Enhanced fallback answers for common questions - more tailored to the job
+    # These will be used if the LLM fails
+    
+    # Extract key resume info for fallbacks
+    skills_list = resume_data.get('skills', ['problem-solving', 'communication', 'teamwork'])
+    top_skills = ', '.join(skills_list[:3])
+    experience_years = resume_data.get('questions', {}).get('years_of_experience', '3+')
+    
+    # Pattern match the question for better fallbacks
+    question_lower = question.lower()
+    
+    if any(phrase in question_lower for phrase in ["tell us about yourself", "introduce yourself", "background"]):
+        return f"I'm a dedicated professional with {experience_years} years of experience and expertise in {top_skills}. Throughout my career, I've focused on delivering excellent results while continuously expanding my skill set. I'm particularly interested in this {job_title} role at {company} as it aligns with my professional goals and strengths."
+    
+    elif any(phrase in question_lower for phrase in ["why do you want to work", "why are you interested", "why join"]):
+        return f"I'm drawn to {company} because of its reputation for innovation and impact in the industry. The {job_title} position particularly excites me as it leverages my skills in {top_skills}. I believe my background would allow me to contribute effectively while growing professionally in this role."
+    
+    elif any(phrase in question_lower for phrase in ["salary", "compensation", "pay", "expected"]):
+        return resume_data.get('questions', {}).get('salary_expectation', "My salary expectations are flexible and based on the total compensation package, but I'm looking in the range typical for this role considering my experience level.")
+    
+    elif any(phrase in question_lower for phrase in ["start", "when can you start", "availability"]):
+        return resume_data.get('questions', {}).get('preferred_start_date', "I can be available to start within two weeks after receiving an offer, though I'm flexible and can adjust based on your needs.")
+    
+    elif any(phrase in question_lower for phrase in ["strength", "greatest strength"]):
+        return f"My greatest strength is my ability to {skills_list[0] if skills_list else 'quickly adapt to new challenges'}. This has enabled me to consistently deliver results in previous roles, particularly when working on complex projects requiring {skills_list[1] if len(skills_list) > 1 else 'attention to detail'}."
+    
+    elif any(phrase in question_lower for phrase in ["weakness", "area for improvement"]):
+        return "I tend to be very detail-oriented, which sometimes means I spend extra time ensuring everything is perfect. I've learned to balance this by setting clear timelines and checkpoints to ensure I maintain both quality and efficiency."
+    
+    elif any(phrase in question_lower for phrase in ["challenge", "difficult situation", "overcome"]):
+        return f"In a previous role, I faced a significant challenge when working on a time-sensitive project with changing requirements. By maintaining clear communication with stakeholders and leveraging my skills in {top_skills}, I was able to adapt quickly and deliver successfully despite the obstacles."
+    
+    elif any(phrase in question_lower for phrase in ["remote", "work from home", "hybrid"]):
+        preferred_setting = resume_data.get('questions', {}).get('preferred_work_setting', 'flexible')
+        return f"I'm comfortable working in a {preferred_setting} environment. I have experience collaborating effectively both remotely and on-site, and value maintaining strong communication and productivity regardless of the work setting."
+    
+    elif any(phrase in question_lower for phrase in ["relocate", "relocation", "move"]):
+        willing = resume_data.get('questions', {}).get('willing_to_relocate', 'Yes')
+        return f"{'I am willing to relocate for the right opportunity.' if willing.lower() == 'yes' else 'I prefer positions in my current location, but am open to discussing options for exceptional opportunities.'}"
+    
+    elif any(phrase in question_lower for phrase in ["visa", "sponsorship", "work authorization"]):
+        need_visa = resume_data.get('questions', {}).get('visa_sponsorship_required', 'No')
+        return f"{'I am authorized to work in the United States without sponsorship.' if need_visa.lower() == 'no' else 'I would require visa sponsorship to work in the United States.'}"
+    
+    # Generic fallback for other questions
+    return f"Based on my {experience_years} years of experience with {top_skills}, I believe I would be able to make strong contributions to this {job_title} role. I'm excited about the opportunity to bring my skills to {company} and help achieve your team's goals."
+
+
+# Where a streamed answer may be cut into a chunk: after a sentence or a line
+SENTENCE_END_PATTERN = re.compile(r"[.!?](?:\s+|$)|\n")
+
+
+def chunk_text(chunk):
+    """Text of one streamed chunk; chat models yield message chunks, completion models strings"""
+    return chunk if isinstance(chunk, str) else str(getattr(chunk, "content", chunk))
+
+
+def sentence_chunks(tokens, max_chars=160):
+    """Regroup streamed tokens into sentence-sized pieces
+
+    A piece is emitted as soon as the buffered text ends a sentence, or reaches max_chars
+    without one; whatever is left is emitted when the stream ends.
+    """
+    buffer = ""
+    for token in tokens:
+        buffer += token
+        while buffer:
+            ends = [match.end() for match in SENTENCE_END_PATTERN.finditer(buffer)]
+            # A sentence end at the very end of the buffer may still grow ("3." -> "3.5")
+            ends = [end for end in ends if end < len(buffer) or buffer[-1].isspace()]
+            if ends:
+                cut = ends[-1]
+            elif len(buffer) >= max_chars:
+                cut = len(buffer)
+            else:
+                break
+            yield buffer[:cut]
+            buffer = buffer[cut:]
+    if buffer:
+        yield buffer
+
+
+class AnswerStream:
+    """Iterate over an answer in sentence-sized chunks as the LLM produces it
+
+    Local and known answers come out as a single chunk. After iteration, answer holds
+    the cleaned final text the field should end up with, which can differ from the
+    concatenated chunks (quotes and boilerplate are stripped only at the end, and a
+    failed stream falls back to generate_answer_with_llm).
+    """
+    def __init__(self, llm, question, resume_data, job_title, company, field="paragraph"):
+        self.llm = llm
+        self.question = question
+        self.resume_data = resume_data
+        self.job_title = job_title
+        self.company = company
+        self.field = field
+        self.answer = None
+        self.streamed = False
+
+    def __iter__(self):
+        question, resume_data = self.question, self.resume_data
+        if not question or len(question) < 5:
+            self.answer = ""
+            return
+        metrics = get_llm_metrics()
+        answer = answer_locally(question, resume_data, self.field)
+        cache = "local"
+        if answer is None:
+            answer = known_answer(question, resume_data, self.job_title, self.company)
+            cache = "cached"
+        if answer is not None:
+            metrics.record("stream", cache=cache)
+            self.answer = answer
+            yield answer
+            return
+
+        formatted_prompt = get_resume_context(resume_data).answer_prompt(question, self.job_title, self.company)
+        print(f"Streaming answer for question: {question}")
+        text = []
+        try:
+            started = time.monotonic()
+            if hasattr(self.llm, "stream"):
+                tokens = (chunk_text(chunk) for chunk in self.llm.stream(formatted_prompt))
+            else:
+                tokens = [str(self.llm.invoke(formatted_prompt))]
+            for chunk in sentence_chunks(tokens):
+                text.append(chunk)
+                self.streamed = True
+                yield chunk
+            self.answer = clean_answer("".join(text))
+            seconds = time.monotonic() - started
+            metrics.record("stream", formatted_prompt, "".join(text), seconds)
+            remember_answer(question, self.answer, seconds, resume_data, self.job_title, self.company)
+        except Exception as e:
+            print(f"LLM stream failed after {len(text)} chunks: {e}")
+            metrics.record("stream", formatted_prompt, "".join(text), time.monotonic() - started, outcome="error")
+            # A partial answer is not worth keeping; the caller rewrites the field with this
+            self.answer = generate_answer_with_llm(
+                self.llm, question, resume_data, self.job_title, self.company, field=self.field, local=False
+            )
+
+
+JSON_OBJECT_PATTERN = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def parse_batch_answers(response, ids):
+    """Pull the {id: answer} object out of a batch response; None when it can't be parsed"""
+    match = JSON_OBJECT_PATTERN.search(str(response))
+    if not match:
+        return None
+    try:
+        parsed = json.loads(match.group(0))
+    except ValueError:
+        return None
+    if not isinstance(parsed, dict):
+        return None
+    return {
+        question_id: clean_answer(parsed[question_id])
+        for question_id in ids
+        if isinstance(parsed.get(question_id), (str, int, float)) and str(parsed[question_id]).strip()
+    }
+
+
+def generate_answers_batch(llm, questions, resume_data, job_title, company, speculative=False):
+    """Answer every question on a form step with at most one LLM request
+
+    Args:
+        llm: LLM instance
+        questions: List of {"id", "question", "field" ("paragraph" or "single line"),
+                   "max_length" (int or None)} dictionaries
+        resume_data: Dictionary containing resume information
+        job_title, company: The job being applied to
+        speculative: True for prefetches; skips the question history and the wait for
+                     in-flight prefetches
+
+    Returns:
+        Dictionary mapping question id to answer. Questions already answered before come
+        from the cache; the rest share one prompt, and only those the batch response
+        leaves out are answered one by one with generate_answer_with_llm.
+    """
+    answers = {}
+    pending = []
+    prefetcher = get_prefetcher()
+    metrics = get_llm_metrics()
+    kind = "prefetch" if speculative else "batch"
+    if not speculative:
+        prefetcher.record_asked(questions, job_title, company)
+    for question in questions:
+        if not question["question"] or len(question["question"]) < 5:
+            continue
+        if speculative:
+            pending.append(question)
+            continue
+        # Structured questions are answered straight from the resume
+        answer = answer_locally(question["question"], resume_data, question.get("field", "paragraph"))
+        if answer is not None:
+            print(f"Answered from resume data: {answer}")
+            metrics.record(kind, cache="local")
+            answers[question["id"]] = answer
+            continue
+        # A prefetch already generating this answer is cheaper to wait for than a new call
+        prefetcher.wait(question["question"], job_title, company)
+        known = known_answer(question["question"], resume_data, job_title, company)
+        if known is not None:
+            metrics.record(kind, cache="cached")
+            answers[question["id"]] = known
+            prefetcher.mark_used(question["question"], job_title, company)
+        else:
+            pending.append(question)
+    
+    if not pending:
+        return answers
+    
+    parsed = None
+    if len(pending) > 1:
+        formatted_prompt = get_resume_context(resume_data).batch_prompt(
+            json.dumps([
+                {"id": question["id"], "question": question["question"],
+                 "field": question.get("field", "paragraph"), "max_characters": question.get("max_length")}
+                for question in pending
+            ], indent=2),
+            job_title,
+            company
+        )
+        print(f"Answering {len(pending)} questions in one LLM request (~{estimate_tokens(formatted_prompt)} prompt tokens)")
+        started = time.monotonic()
+        try:
+            response = llm.invoke(formatted_prompt)
+            seconds = time.monotonic() - started
+            latency = seconds / len(pending)
+            parsed = parse_batch_answers(response, [question["id"] for question in pending])
+            metrics.record(kind, formatted_prompt, str(response), seconds,
+                           outcome="ok" if parsed else "unparsed", questions=len(parsed or {}))
+        except Exception as e:
+            print(f"Batch LLM request failed: {e}")
+            metrics.record(kind, formatted_prompt, seconds=time.monotonic() - started, outcome="error", questions=0)
+        if parsed is None:
+            print("Could not parse the batch response, answering questions one by one")
+            parsed = {}
+        for question in pending:
+            if question["id"] in parsed:
+                remember_answer(question["question"], parsed[question["id"]], latency, resume_data, job_title, company)
+        answers.update(parsed)
+    
+    # A single question, or whatever the batch left out, goes through the per-question path
+    for question in pending:
+        if question["id"] not in answers:
+            answers[question["id"]] = generate_answer_with_llm(
+                llm, question["question"], resume_data, job_title, company,
+                field=question.get("field", "paragraph"), local=False, kind=kind
+            )
+    return answers
@@ -0,0 +1,254 @@
+# interchangeable LLM backends: Gemini, a local HTTP stub server and an in-process fake
+import http.client
+import json
+import math
+import random
+import re
+import threading
+import time
+import urllib.parse
+
+DEFAULT_STUB_URL = "http://127.0.0.1:8765"
+
+# Answer for questions no canned answer matches; {question} is the question text
+DEFAULT_TEMPLATE = (
+    "I have hands-on experience that maps directly to this: {question_short}. "
+    "I would bring the same care and ownership to this role."
+)
+
+# Where the stub finds the questions inside the prompts llm.py builds
+QUESTION_PATTERN = re.compile(r"^QUESTION: (.*)$", re.MULTILINE)
+BATCH_QUESTIONS_PATTERN = re.compile(r"^QUESTIONS \(JSON list.*?\):\n(\[.*?\n\])", re.MULTILINE | re.DOTALL)
+
+
+class StubBackendError(Exception):
+    """A simulated (or stub server reported) backend failure"""
+    def __init__(self, message, status=503):
+        super().__init__(message)
+        self.status = status
+
+
+class LatencyModel:
+    """Samples response latencies from a distribution spec
+
+    Specs:
+        "0.8" or "fixed:0.8"       - always 0.8 seconds
+        "uniform:0.3,1.5"          - uniform between the two bounds
+        "normal:1.0,0.2"           - mean and standard deviation, floored at 0
+        "lognormal:0.8,0.5"        - median and sigma, the usual shape of API latency
+        "replay:latencies.txt"     - draws from recorded latencies, one per line
+    """
+    def __init__(self, spec="fixed:0", rng=None):
+        self.spec = str(spec)
+        self.rng = rng or random.Random()
+        kind, _, arguments = self.spec.partition(":")
+        if not arguments:
+            kind, arguments = "fixed", kind
+        self.kind = kind
+        if kind == "replay":
+            with open(arguments, "r") as handle:
+                self.samples = [float(line) for line in handle if line.strip()]
+            if not self.samples:
+                raise ValueError(f"No latencies recorded in {arguments}")
+            return
+        try:
+            self.parameters = [float(value) for value in arguments.split(",")]
+        except ValueError:
+            raise ValueError(f"Bad latency spec '{self.spec}'")
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+        if kind not in expected or len(self.parameters) != expected[kind]:
+            raise ValueError(f"Bad latency spec '{self.spec}', expected one of {list(expected) + ['replay']}")
+
+    def sample(self):
+        """One latency in seconds"""
+        if self.kind == "replay":
+            return self.rng.choice(self.samples)
+        if self.kind == "fixed":
+            return self.parameters[0]
+        if self.kind == "uniform":
+            return self.rng.uniform(*self.parameters)
+        if self.kind == "normal":
+            return max(0.0, self.rng.gauss(*self.parameters))
+        median, sigma = self.parameters
+        return self.rng.lognormvariate(math.log(median) if median > 0 else -30, sigma)
+
+
+class StubResponder:
+    """Decides what a stub backend answers: canned answers, a template, or an error
+
+    Canned answers are a list of {"match": regex, "answer": text} tried in order against
+    the question; the first match wins. Batch prompts get a JSON object of answers, the
+    shape llm.parse_batch_answers expects.
+    """
+    def __init__(self, answers=None, template=None, error_rate=0.0, rng=None):
+        self.answers = [(re.compile(entry["match"], re.IGNORECASE), entry["answer"]) for entry in answers or []]
+        self.template = template or DEFAULT_TEMPLATE
+        self.error_rate = error_rate
+        self.rng = rng or random.Random()
+
+    def answer(self, question):
+        for pattern, answer in self.answers:
+            if pattern.search(question):
+                return answer
+        short = question.strip().rstrip("?.").lower()
+        return self.template.format(question=question, question_short=short[:80])
+
+    def respond(self, prompt):
+        """The completion text for prompt; raises StubBackendError at the configured rate"""
+        if self.error_rate and self.rng.random() < self.error_rate:
+            raise StubBackendError("Simulated backend error")
+        batch = BATCH_QUESTIONS_PATTERN.search(prompt)
+        if batch:
+            try:
+                questions = json.loads(batch.group(1))
+                return json.dumps({str(entry["id"]): self.answer(entry["question"]) for entry in questions})
+            except (ValueError, KeyError, TypeError):
+                pass
+        question = QUESTION_PATTERN.search(prompt)
+        return self.answer(question.group(1) if question else prompt[-200:])
+
+
+def load_answers(path):
+    """Canned answers from a JSON file holding a list of {"match", "answer"} entries"""
+    if not path:
+        return None
+    with open(path, "r") as handle:
+        return json.load(handle)
+
+
+class FakeLLM:
+    """In-process backend replaying a latency distribution, with invoke and stream
+
+    latency is the time to the first token; the rest of the completion then arrives at
+    tokens_per_second (0 delivers it all at once). A seed makes the sampled latencies,
+    errors and answers reproducible.
+    """
+    def __init__(self, latency="fixed:0", error_rate=0.0, answers=None, template=None,
+                 tokens_per_second=0.0, seed=None, sleep=time.sleep):
+        self.rng = random.Random(seed)
+        self.latency = LatencyModel(latency, self.rng)
+        self.responder = StubResponder(answers, template, error_rate, self.rng)
+        self.tokens_per_second = tokens_per_second
+        self.sleep = sleep
+        self.calls = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def _plan(self, prompt):
+        # One lock around every random draw keeps seeded runs reproducible per call order
+        with self._lock:
+            self.calls += 1
+            delay = self.latency.sample()
+            try:
+                return delay, self.responder.respond(prompt)
+            except StubBackendError:
+                self.errors += 1
+                return delay, None
+
+    def _tokens(self, text):
+        return re.findall(r"\S+\s*", text)
+
+    def invoke(self, prompt):
+        delay, text = self._plan(str(prompt))
+        if self.tokens_per_second and text:
+            delay += len(self._tokens(text)) / self.tokens_per_second
+        self.sleep(delay)
+        if text is None:
+            raise StubBackendError("Simulated backend error")
+        return text
+
+    def stream(self, prompt):
+        delay, text = self._plan(str(prompt))
+        self.sleep(delay)
+        if text is None:
+            raise StubBackendError("Simulated backend error")
+        if not self.tokens_per_second:
+            yield text
+            return
+        for token in self._tokens(text):
+            yield token
+            self.sleep(1 / self.tokens_per_second)
+
+
+class StubLLM:
+    """Client for the local stub server (python -m app.services.llm_stub_server)"""
+    def __init__(self, url=None, timeout=60):
+        parsed = urllib.parse.urlparse(url or DEFAULT_STUB_URL)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 80
+        self.timeout = timeout
+
+    def _post(self, path, prompt):
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        connection.request("POST", path, json.dumps({"prompt": str(prompt)}), {"Content-Type": "application/json"})
+        response = connection.getresponse()
+        if response.status != 200:
+            body = response.read().decode("utf-8", "replace")
+            connection.close()
+            raise StubBackendError(f"Stub server returned {response.status}: {body}", response.status)
+        return connection, response
+
+    def invoke(self, prompt):
+        connection, response = self._post("/v1/complete", prompt)
+        try:
+            return json.loads(response.read())["text"]
+        finally:
+            connection.close()
+
+    def stream(self, prompt):
+        connection, response = self._post("/v1/stream", prompt)
+        try:
+            # Newline-delimited JSON, one {"text"} chunk per line, until the server closes
+            for line in response:
+                if line.strip():
+                    chunk = json.loads(line)
+                    if "error" in chunk:
+                        raise StubBackendError(chunk["error"])
+                    yield chunk["text"]
+        finally:
+            connection.close()
+
+
+def gemini_backend(settings):
+    from langchain_google_genai import GoogleGenerativeAI
+    return GoogleGenerativeAI(
+        model=settings.get("model") or "gemini-1.5-flash",
+        google_api_key=settings.get("api_key"),
+        temperature=settings.get("temperature", 0.7),
+    )
+
+
+def stub_backend(settings):
+    return StubLLM(settings.get("stub_url"), timeout=settings.get("timeout", 60))
+
+
+def fake_backend(settings):
+    return FakeLLM(
+        latency=settings.get("latency") or "fixed:0",
+        error_rate=settings.get("error_rate", 0.0),
+        answers=load_answers(settings.get("answers_path")),
+        tokens_per_second=settings.get("tokens_per_second", 0.0),
+        seed=settings.get("seed"),
+    )
+
+
+# backend name -> factory taking a settings dictionary
+LLM_BACKENDS = {
+    "gemini": gemini_backend,
+    "stub": stub_backend,
+    "fake": fake_backend,
+}
+
+
+def create_llm(backend="gemini", **settings):
+    """Build an LLM exposing invoke(prompt) and stream(prompt)
+
+    Args:
+        backend: "gemini", "stub" (local HTTP stub server) or "fake" (in-process)
+        settings: Backend options - model, api_key, temperature for Gemini; stub_url and
+                  timeout for the stub; latency, error_rate, answers_path,
+                  tokens_per_second and seed for the fake
+    """
+    if backend not in LLM_BACKENDS:
+        raise ValueError(f"Unknown LLM backend '{backend}', expected one of {list(LLM_BACKENDS)}")
+    return LLM_BACKENDS[backend](settings)
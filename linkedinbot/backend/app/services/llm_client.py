@@ -0,0 +1,345 @@
+# asyncio LLM client: bounded concurrency, quota rate limiting, deadlines and hedged retries
+import asyncio
+import bisect
+import queue
+import threading
+import time
+from collections import deque
+
+from ..config.config import config
+from .pacing import TokenBucket
+
+
+# Upper bounds (seconds) of the latency histogram buckets; the last one catches the rest
+LATENCY_BUCKETS = [0.25, 0.5, 1, 2, 4, 8, 16, 32, float("inf")]
+
+
+class LatencyHistogram:
+    """Bucketed call latencies plus a window of recent samples for percentiles"""
+    def __init__(self, window=500):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.recent = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            self.recent.append(seconds)
+
+    def percentile(self, share):
+        with self._lock:
+            if not self.recent:
+                return None
+            ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+    def report(self):
+        with self._lock:
+            buckets = {
+                ("+inf" if bound == float("inf") else f"<={bound}s"): count
+                for bound, count in zip(LATENCY_BUCKETS, self.counts)
+            }
+            samples = len(self.recent)
+        return {
+            "buckets": buckets,
+            "samples": samples,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+        }
+
+
+class LLMDeadlineExceeded(Exception):
+    pass
+
+
+class AsyncLLMClient:
+    """Wraps an LLM (anything with invoke, and ideally ainvoke) for concurrent use
+
+    Every call waits for a rate-limit token and an in-flight slot, then races the
+    request against its deadline. When a request has held its slot for the hedge delay
+    and both a token and a slot are free, a second identical request is sent and
+    whichever answers first wins.
+    Failed attempts are retried with exponential backoff until the deadline.
+    """
+    def __init__(self, llm, max_inflight=None, requests_per_minute=None, timeout=None,
+                 hedge_after=None, retries=None):
+        self.llm = llm
+        self.max_inflight = max_inflight or config.LLM_MAX_INFLIGHT
+        rate = (requests_per_minute or config.LLM_REQUESTS_PER_MINUTE) / 60
+        self.bucket = TokenBucket(rate, max(1, min(self.max_inflight, rate * 60)))
+        self.timeout = timeout or config.LLM_TIMEOUT
+        self.hedge_after = config.LLM_HEDGE_AFTER if hedge_after is None else hedge_after
+        self.retries = config.LLM_RETRIES if retries is None else retries
+
+        self.latency = LatencyHistogram()
+        self.attempt_latency = LatencyHistogram()
+        self.first_chunk_latency = LatencyHistogram()
+        self.streams = 0
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.rate_limited_seconds = 0.0
+
+        self._bucket_lock = threading.Lock()
+        self._loop = None
+        self._loop_lock = threading.Lock()
+        self._semaphore = None
+
+    # -- event loop for the synchronous facade -----------------------------------------
+
+    def _ensure_loop(self):
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="llm-client", daemon=True).start()
+            return self._loop
+
+    def invoke(self, prompt, timeout=None):
+        """Synchronous facade with the same shape as llm.invoke, for existing callers"""
+        future = asyncio.run_coroutine_threadsafe(self._call(prompt, timeout), self._ensure_loop())
+        return future.result()
+
+    async def ainvoke(self, prompt, timeout=None):
+        """Answer prompt within timeout seconds; safe to await from any event loop"""
+        loop = self._ensure_loop()
+        if asyncio.get_running_loop() is loop:
+            return await self._call(prompt, timeout)
+        # The semaphore and in-flight tasks live on the client's own loop
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._call(prompt, timeout), loop))
+
+    def stream(self, prompt, timeout=None):
+        """Synchronous generator over the response chunks, same shape as llm.stream
+
+        Streams share the rate limit, the in-flight slots and the deadline with ordinary
+        calls; they are neither retried nor hedged once text has started flowing.
+        """
+        timeout = timeout or self.timeout
+        chunks = queue.Queue()
+        finished = object()
+        started = time.monotonic()
+        future = asyncio.run_coroutine_threadsafe(
+            asyncio.wait_for(self._pump(prompt, chunks, finished), timeout), self._ensure_loop()
+        )
+        self.calls += 1
+        self.streams += 1
+        first = True
+        try:
+            while True:
+                try:
+                    chunk = chunks.get(timeout=max(started + timeout - time.monotonic(), 0) + 1)
+                except queue.Empty:
+                    raise LLMDeadlineExceeded(f"No LLM response within {timeout:.1f}s")
+                if chunk is finished:
+                    break
+                if first:
+                    self.first_chunk_latency.record(time.monotonic() - started)
+                    first = False
+                yield chunk
+            # Surfaces a deadline or backend error raised after the last chunk
+            future.result()
+        except Exception as e:
+            self.failures += 1
+            if isinstance(e, asyncio.TimeoutError) and time.monotonic() >= started + timeout:
+                self.timeouts += 1
+                raise LLMDeadlineExceeded(f"No LLM response within {timeout:.1f}s")
+            raise
+        finally:
+            future.cancel()
+            self.latency.record(time.monotonic() - started)
+
+    # -- async path ----------------------------------------------------------------------
+
+    async def _pump(self, prompt, chunks, finished):
+        try:
+            await self._acquire()
+            if hasattr(self.llm, "astream"):
+                try:
+                    async for chunk in self.llm.astream(prompt):
+                        chunks.put(chunk)
+                finally:
+                    self._release_after(None)
+            elif hasattr(self.llm, "stream"):
+                def consume():
+                    for chunk in self.llm.stream(prompt):
+                        chunks.put(chunk)
+                thread = asyncio.get_running_loop().run_in_executor(None, consume)
+                try:
+                    await asyncio.shield(thread)
+                finally:
+                    self._release_after(thread)
+            else:
+                chunks.put(await self._invoke(prompt))
+        finally:
+            chunks.put(finished)
+
+    async def _rate_limit(self):
+        with self._bucket_lock:
+            delay = self.bucket.reserve()
+        if delay > 0:
+            self.rate_limited_seconds += delay
+            await asyncio.sleep(delay)
+
+    async def _acquire(self, reserved=False):
+        """Wait for a rate-limit token (unless one is already reserved) and an in-flight slot"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_inflight)
+        try:
+            if not reserved:
+                await self._rate_limit()
+            await self._semaphore.acquire()
+        except asyncio.CancelledError:
+            # Cancelled while still in line: the token was never spent on a request
+            with self._bucket_lock:
+                self.bucket.refund()
+            raise
+
+    def _release_after(self, thread):
+        """Free the in-flight slot, or once the backend thread behind thread returns
+
+        Cancelling the await on a run_in_executor future leaves the thread calling the
+        backend, so the slot stays taken until it really finishes.
+        """
+        if thread is None or thread.done():
+            self._semaphore.release()
+            return
+
+        def release(done):
+            if not done.cancelled():
+                done.exception()
+            self._semaphore.release()
+        thread.add_done_callback(release)
+
+    async def _invoke(self, prompt):
+        """Call the backend with an in-flight slot held, freeing the slot when the call is over"""
+        thread = None
+        try:
+            if hasattr(self.llm, "ainvoke"):
+                return await self.llm.ainvoke(prompt)
+            thread = asyncio.get_running_loop().run_in_executor(None, self.llm.invoke, prompt)
+            return await asyncio.shield(thread)
+        finally:
+            self._release_after(thread)
+
+    async def _attempt(self, prompt, holding=None, reserved=False):
+        await self._acquire(reserved)
+        if holding is not None:
+            holding.set()
+        started = time.monotonic()
+        result = await self._invoke(prompt)
+        self.attempt_latency.record(time.monotonic() - started)
+        return result
+
+    def _hedge_delay(self):
+        if self.hedge_after and self.hedge_after > 0:
+            return self.hedge_after
+        # Adaptive: hedge once a call runs past the recent p95
+        if len(self.attempt_latency.recent) >= 20:
+            return self.attempt_latency.percentile(0.95)
+        return None
+
+    async def _hedged(self, prompt):
+        holding = asyncio.Event()
+        tasks = [asyncio.ensure_future(self._attempt(prompt, holding))]
+        try:
+            delay = self._hedge_delay()
+            if delay is None:
+                return await tasks[0]
+            # The hedge delay runs from when the first attempt holds a slot, not while it
+            # still waits for a token or a slot behind other calls
+            waiter = asyncio.ensure_future(holding.wait())
+            try:
+                await asyncio.wait([tasks[0], waiter], return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                waiter.cancel()
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return tasks[0].result()
+
+            # Only hedge with quota and a slot to spare; otherwise the hedge would take
+            # them from calls that are still waiting
+            with self._bucket_lock:
+                spare = not self._semaphore.locked() and self.bucket.try_take()
+            if not spare:
+                return await tasks[0]
+            self.hedges += 1
+            tasks.append(asyncio.ensure_future(self._attempt(prompt, reserved=True)))
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is tasks[1]:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # The losing attempt, or every attempt when the deadline cancels us; an attempt
+            # on a backend thread keeps its slot until that thread returns
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _call(self, prompt, timeout=None):
+        timeout = timeout or self.timeout
+        self.calls += 1
+        started = time.monotonic()
+        deadline = started + timeout
+        attempt = 0
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise LLMDeadlineExceeded(f"No LLM response within {timeout:.1f}s")
+                try:
+                    return await asyncio.wait_for(self._hedged(prompt), remaining)
+                except Exception as e:
+                    # On 3.11 asyncio.TimeoutError is the builtin TimeoutError, which the
+                    # backend also raises for a socket timeout; only the clock tells
+                    # the call's own deadline apart from a retryable backend timeout
+                    if isinstance(e, asyncio.TimeoutError) and time.monotonic() >= deadline:
+                        self.timeouts += 1
+                        raise LLMDeadlineExceeded(f"No LLM response within {timeout:.1f}s")
+                    attempt += 1
+                    if attempt > self.retries:
+                        raise
+                    backoff = min(2 ** (attempt - 1), max(deadline - time.monotonic(), 0))
+                    print(f"LLM call failed ({e}), retrying in {backoff:.1f}s")
+                    await asyncio.sleep(backoff)
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            self.latency.record(time.monotonic() - started)
+
+    def stats(self):
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "rate_limited_seconds": self.rate_limited_seconds,
+            "max_inflight": self.max_inflight,
+            "latency": self.latency.report(),
+            "attempt_latency": self.attempt_latency.report(),
+            "streams": self.streams,
+            "first_chunk_latency": self.first_chunk_latency.report(),
+        }
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client(llm=None):
+    """Return the process-wide client, creating it around llm on first use"""
+    global _client
+    with _client_lock:
+        if _client is None and llm is not None:
+            _client = AsyncLLMClient(llm)
+        return _client
@@ -0,0 +1,189 @@
+# prompt and completion size, latency, cache status and outcome of every answer, per application and per run
+import bisect
+import math
+import re
+import threading
+import time
+from collections import Counter, deque
+
+# Gemini and most BPE tokenizers average about four characters of English per token;
+# close enough to tune prompt size without shipping a tokenizer
+CHARS_PER_TOKEN = 4
+
+# Upper bounds (tokens) of the prompt-size buckets latency is broken down by
+PROMPT_TOKEN_BUCKETS = [250, 500, 1000, 2000, 4000, float("inf")]
+
+WORD_PATTERN = re.compile(r"\S+\s*")
+
+
+def estimate_tokens(text):
+    """Local estimate of the token count of text"""
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+
+def trim_to_tokens(text, tokens):
+    """Cut text at a word boundary so it fits in about tokens tokens, marking the cut"""
+    if estimate_tokens(text) <= tokens:
+        return text
+    limit = max(tokens * CHARS_PER_TOKEN - 3, 0)
+    trimmed = ""
+    for word in WORD_PATTERN.findall(text):
+        if len(trimmed) + len(word) > limit:
+            break
+        trimmed += word
+    return trimmed.rstrip(" ,;") + "..." if trimmed else ""
+
+
+def fit_to_budget(parts, budget, fixed=0):
+    """Trim the named prompt parts until they fit in budget tokens
+
+    Args:
+        parts: List of (name, text) in trim order - the first is cut first
+        budget: Token ceiling for the parts plus fixed; 0 or less disables trimming
+        fixed: Tokens of template text around the parts that can't be cut
+
+    Returns:
+        Dictionary of name to (possibly trimmed) text
+    """
+    fitted = dict(parts)
+    if budget <= 0:
+        return fitted
+    over = fixed + sum(estimate_tokens(text) for _, text in parts) - budget
+    for name, text in parts:
+        if over <= 0:
+            break
+        size = estimate_tokens(text)
+        fitted[name] = trim_to_tokens(text, max(size - over, 0))
+        over -= size - estimate_tokens(fitted[name])
+    return fitted
+
+
+class Usage:
+    """Running totals for one application or one run"""
+    def __init__(self):
+        self.answers = 0
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.seconds = 0.0
+        self.by_cache = Counter()
+        self.by_outcome = Counter()
+
+    def add(self, record):
+        self.answers += record["questions"]
+        self.by_cache[record["cache"]] += record["questions"]
+        self.by_outcome[record["outcome"]] += 1
+        if record["cache"] == "miss":
+            self.calls += 1
+            self.prompt_tokens += record["prompt_tokens"]
+            self.completion_tokens += record["completion_tokens"]
+            self.seconds += record["seconds"]
+
+    def report(self):
+        return {
+            "answers": self.answers,
+            "llm_calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "llm_seconds": self.seconds,
+            "by_cache": dict(self.by_cache),
+            "by_outcome": dict(self.by_outcome),
+        }
+
+
+class LLMMetrics:
+    """Per-call records rolled up per application and per run
+
+    Each record carries:
+        kind      - "answer", "batch", "stream" or "prefetch"
+        cache     - "local", "cached" or "miss" (only misses reach the LLM)
+        outcome   - "ok", "error" or "unparsed" (a batch response with no usable answers)
+        prompt_tokens, completion_tokens - local estimates
+        seconds   - wall time of the LLM call
+        questions - questions the call answered
+    """
+    def __init__(self, keep=200):
+        self._lock = threading.Lock()
+        self.recent = deque(maxlen=keep)
+        self.applications = deque(maxlen=keep)
+        self.start_run()
+
+    def start_run(self):
+        with self._lock:
+            self.run = Usage()
+            self.by_prompt_size = [[0, 0, 0.0] for _ in PROMPT_TOKEN_BUCKETS]  # calls, tokens, seconds
+            self.current = None
+            self.applications.clear()
+            self.recent.clear()
+
+    def start_application(self, job_title, company):
+        """Attribute the following calls, prefetches included, to this job"""
+        with self._lock:
+            # A job left without finish_application (no Easy Apply button, say) still counts
+            self._close("skipped")
+            self.current = {"job_title": job_title, "company": company, "started": time.monotonic(), "usage": Usage()}
+
+    def finish_application(self, outcome=None):
+        """Close the current application and return its rollup"""
+        with self._lock:
+            return self._close(outcome)
+
+    def _close(self, outcome):
+        current, self.current = self.current, None
+        if current is None:
+            return None
+        rollup = {
+            "job_title": current["job_title"],
+            "company": current["company"],
+            "outcome": outcome,
+            "seconds": time.monotonic() - current["started"],
+            **current["usage"].report(),
+        }
+        self.applications.append(rollup)
+        return rollup
+
+    def record(self, kind, prompt="", completion="", seconds=0.0, cache="miss", outcome="ok", questions=1):
+        record = {
+            "kind": kind,
+            "cache": cache,
+            "outcome": outcome,
+            "prompt_tokens": estimate_tokens(prompt),
+            "completion_tokens": estimate_tokens(completion),
+            "seconds": seconds,
+            "questions": questions,
+        }
+        with self._lock:
+            self.recent.append(record)
+            self.run.add(record)
+            if self.current is not None:
+                self.current["usage"].add(record)
+            if cache == "miss" and outcome != "error":
+                bucket = self.by_prompt_size[bisect.bisect_left(PROMPT_TOKEN_BUCKETS, record["prompt_tokens"])]
+                bucket[0] += 1
+                bucket[1] += record["prompt_tokens"]
+                bucket[2] += seconds
+        return record
+
+    def report(self):
+        with self._lock:
+            by_prompt_size = {
+                ("+inf" if bound == float("inf") else f"<={bound}"): {
+                    "calls": calls,
+                    "mean_prompt_tokens": tokens / calls,
+                    "mean_seconds": seconds / calls,
+                }
+                for bound, (calls, tokens, seconds) in zip(PROMPT_TOKEN_BUCKETS, self.by_prompt_size)
+                if calls
+            }
+            return {
+                "run": self.run.report(),
+                "by_prompt_size": by_prompt_size,
+                "applications": list(self.applications),
+            }
+
+
+_metrics = LLMMetrics()
+
+
+def get_llm_metrics():
+    return _metrics
@@ -0,0 +1,101 @@
+# local HTTP stand-in for the LLM API, replaying configurable latency, errors and answers
+#
+# Usage (from linkedinbot/backend): python -m app.services.llm_stub_server [--port 8765]
+#     [--latency lognormal:0.8,0.5] [--error-rate 0.02] [--tokens-per-second 50]
+#     [--answers answers.json] [--seed 1]
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.config.config import config
+from app.services.llm_backends import FakeLLM, StubBackendError, load_answers
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """POST /v1/complete -> {"text"}; POST /v1/stream -> NDJSON chunks; GET /v1/stats"""
+    llm = None
+
+    def _json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/v1/stats":
+            return self._json(404, {"error": f"Unknown path {self.path}"})
+        self._json(200, {"calls": self.llm.calls, "errors": self.llm.errors})
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            prompt = json.loads(self.rfile.read(length))["prompt"]
+        except (ValueError, KeyError):
+            return self._json(400, {"error": "Expected a JSON body with a prompt"})
+
+        if self.path == "/v1/complete":
+            try:
+                text = self.llm.invoke(prompt)
+            except StubBackendError as e:
+                return self._json(e.status, {"error": str(e)})
+            return self._json(200, {"text": text})
+
+        if self.path == "/v1/stream":
+            chunks = self.llm.stream(prompt)
+            try:
+                # Errors happen before the first token, so they still get a status code
+                first = next(chunks, None)
+            except StubBackendError as e:
+                return self._json(e.status, {"error": str(e)})
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+            if first is not None:
+                self.wfile.write((json.dumps({"text": first}) + "\n").encode("utf-8"))
+                self.wfile.flush()
+            for chunk in chunks:
+                self.wfile.write((json.dumps({"text": chunk}) + "\n").encode("utf-8"))
+                self.wfile.flush()
+            return
+
+        self._json(404, {"error": f"Unknown path {self.path}"})
+
+    def log_message(self, format, *args):
+        # One line per request on stdout would dominate any load test
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local LLM stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default=config.LLM_STUB_LATENCY,
+                        help="latency spec, see llm_backends.LatencyModel")
+    parser.add_argument("--error-rate", type=float, default=config.LLM_STUB_ERROR_RATE)
+    parser.add_argument("--tokens-per-second", type=float, default=config.LLM_STUB_TOKENS_PER_SECOND)
+    parser.add_argument("--answers", default=config.LLM_STUB_ANSWERS,
+                        help='JSON list of {"match": regex, "answer": text}')
+    parser.add_argument("--template", default=None, help="answer template for unmatched questions, {question}")
+    parser.add_argument("--seed", type=int, default=config.LLM_STUB_SEED)
+    args = parser.parse_args()
+
+    StubHandler.llm = FakeLLM(
+        latency=args.latency, error_rate=args.error_rate, answers=load_answers(args.answers),
+        template=args.template, tokens_per_second=args.tokens_per_second, seed=args.seed,
+    )
+    server = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    server.daemon_threads = True
+    print(f"LLM stub listening on http://{args.host}:{args.port} (latency {args.latency}, "
+          f"error rate {args.error_rate:g})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
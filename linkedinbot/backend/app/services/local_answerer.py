@@ -0,0 +1,284 @@
+# answers structured questions straight from resume_data, before anything goes to the LLM
+import re
+import threading
+from collections import Counter
+from datetime import date
+
+from ..config.config import config
+from .form_rules import lookup
+
+
+# Each intent maps question patterns to a resume_data path. Intents are tried in order,
+# first match wins; skill and experience years are resolved separately.
+#
+#   patterns   - any of these regexes must match the lowercased question
+#   kind       - "yes_no", "number" or "text"
+#   source     - dotted path into resume_data, or None with a fixed value
+#   confidence - how sure the answer is when the question reads as its kind expects
+LOCAL_INTENTS = [
+    {"name": "sponsorship", "patterns": [r"\bsponsor"], "kind": "yes_no",
+     "source": "questions.visa_sponsorship_required", "confidence": 0.9},
+    {"name": "authorization", "patterns": [r"authori[sz]ed to work", r"eligible to work", r"right to work", r"work authori[sz]ation"],
+     "kind": "yes_no", "source": None, "value": "Yes", "confidence": 0.85},
+    {"name": "relocation", "patterns": [r"\breloca"], "kind": "yes_no",
+     "source": "questions.willing_to_relocate", "confidence": 0.9},
+    {"name": "travel", "patterns": [r"\btravel"], "kind": "yes_no",
+     "source": "questions.willing_to_travel", "confidence": 0.85},
+    {"name": "clearance", "patterns": [r"security clearance"], "kind": "yes_no",
+     "source": "questions.cleared_security_clearance", "confidence": 0.85},
+    {"name": "start_date", "patterns": [r"\bstart date\b", r"when can you start", r"available to start", r"how soon can you", r"notice period"],
+     "kind": "text", "source": "questions.preferred_start_date", "confidence": 0.8},
+    {"name": "salary", "patterns": [r"\bsalary\b", r"\bcompensation\b", r"expected pay", r"pay expectation"],
+     "kind": "number", "source": "questions.salary_expectation", "confidence": 0.85},
+]
+
+# Yes/no intents only count as confident when the question is phrased as one
+YES_NO_OPENERS = re.compile(r"^\s*(are|will|would|do|does|did|have|has|can|could|is|should)\b")
+
+YEARS_PATTERN = re.compile(r"\byears?\b|\bhow long\b")
+EXPERIENCE_PATTERN = re.compile(r"experience|worked|working|used|using|\bwith\b")
+TOTAL_YEARS_PATTERN = re.compile(r"years? of ((total|overall|relevant|professional|work|industry) )*experience")
+SPECIFIC_EXPERIENCE_PATTERN = re.compile(r"experience\b.*\b(with|in|using|on|as)\b")
+NUMBER_PATTERN = re.compile(r"\d[\d,]*(?:\.\d+)?")
+# The experience a yes/no question asks about: "at least 5 years", "3+ years", "5 or more
+# years", "more than 2 years" (strict)
+YEARS_THRESHOLD_PATTERN = re.compile(
+    r"(?:\b(more than|over|greater than|in excess of)\s+)?(\d+(?:\.\d+)?)\s*(?:\+|plus\b)?\s*(?:or more\s+)?years?\b"
+)
+PRESENT_WORDS = {"", "present", "current", "now", "today"}
+
+# Common spellings of the same skill, folded onto one key
+SKILL_ALIASES = {
+    "amazon web services": "aws",
+    "golang": "go",
+    "js": "javascript",
+    "k8s": "kubernetes",
+    "ml": "machine learning",
+    "postgres": "postgresql",
+    "reactjs": "react",
+    "react.js": "react",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "ts": "typescript",
+}
+
+MONTHS = {name: number for number, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1)}
+
+
+def skill_pattern(skill):
+    return re.compile(r"(?<![a-z0-9])" + re.escape(skill) + r"(?![a-z0-9+#])")
+
+
+def parse_month(text, today=None):
+    """Months since year 0 for "MM/YYYY", "YYYY", "Mon YYYY" or "Present"; None if unreadable"""
+    text = str(text or "").strip().lower()
+    if text in PRESENT_WORDS:
+        today = today or date.today()
+        return today.year * 12 + today.month - 1
+    year = re.search(r"(19|20)\d\d", text)
+    if not year:
+        return None
+    month = 1
+    numeric = re.match(r"(\d{1,2})[/-]", text)
+    if numeric and 1 <= int(numeric.group(1)) <= 12:
+        month = int(numeric.group(1))
+    else:
+        for name, number in MONTHS.items():
+            if name in text:
+                month = number
+                break
+    return int(year.group(0)) * 12 + month - 1
+
+
+def merged_months(intervals):
+    """Total months covered by possibly overlapping (start, end) intervals"""
+    total, current_start, current_end = 0, None, None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+class LocalAnswer:
+    """A typed answer with a confidence score"""
+    def __init__(self, intent, kind, value, confidence, number=None):
+        self.intent = intent
+        self.kind = kind
+        self.value = value
+        self.confidence = confidence
+        self.number = number
+
+    def render(self, field="paragraph"):
+        """Text to type: bare digits for numbers in single line fields"""
+        if self.number is not None and (self.kind == "number" and field == "single line"):
+            return str(self.number)
+        return str(self.value)
+
+
+class LocalAnswerer:
+    """Intent parser and skill -> years index compiled from one resume"""
+    def __init__(self, resume_data, today=None):
+        self.resume_data = resume_data
+        self.intents = [dict(intent, compiled=[re.compile(p) for p in intent["patterns"]]) for intent in LOCAL_INTENTS]
+        self.skills = {self._canonical(skill) for skill in resume_data.get("skills", []) if isinstance(skill, str)}
+        # Every spelling that names a skill, mapped to the skill's canonical key
+        self.skill_patterns = {}
+        for skill in self.skills | set(SKILL_ALIASES.values()):
+            self.skill_patterns[skill] = skill_pattern(skill)
+        for alias in SKILL_ALIASES:
+            self.skill_patterns[alias] = skill_pattern(alias)
+        self.skill_years = self._skill_years(resume_data, today)
+
+    def _skill_years(self, resume_data, today):
+        """Years per skill from the jobs that mention it, overridden by questions.skill_years"""
+        intervals = {skill: [] for skill in self.skills}
+        for job in resume_data.get("work_experience", []) or []:
+            if not isinstance(job, dict):
+                continue
+            start = parse_month(job.get("start_date"), today)
+            end = parse_month(job.get("end_date"), today)
+            if start is None or end is None or end < start:
+                continue
+            text = f"{job.get('title', '')} {job.get('description', '')}".lower()
+            mentioned = {self._canonical(skill) for skill, pattern in self.skill_patterns.items() if pattern.search(text)}
+            for skill in mentioned & self.skills:
+                intervals[skill].append((start, end))
+
+        years = {}
+        for skill, spans in intervals.items():
+            months = merged_months(spans)
+            if months:
+                years[skill] = max(1, round(months / 12))
+        for skill, value in (resume_data.get("questions", {}).get("skill_years") or {}).items():
+            number = NUMBER_PATTERN.search(str(value))
+            if number:
+                years[self._canonical(skill)] = int(float(number.group(0).replace(",", "")))
+        return years
+
+    def _canonical(self, skill):
+        skill = skill.strip().lower()
+        return SKILL_ALIASES.get(skill, skill)
+
+    def _years_answer(self, question):
+        if not YEARS_PATTERN.search(question) or not EXPERIENCE_PATTERN.search(question):
+            return None
+        mentioned = {
+            self._canonical(skill)
+            for skill, pattern in self.skill_patterns.items()
+            if pattern.search(question)
+        }
+        mentioned &= self.skills | set(self.skill_years)
+        known = [skill for skill in mentioned if skill in self.skill_years]
+        if known:
+            skill = max(known, key=len)
+            return self._years_reply("skill_years", question, self.skill_years[skill], 0.9)
+        if mentioned:
+            # A skill the resume lists without dated experience: the LLM knows as much as we do
+            return None
+        if TOTAL_YEARS_PATTERN.search(question) and not SPECIFIC_EXPERIENCE_PATTERN.search(question):
+            value = lookup(self.resume_data, "questions.years_of_experience")
+            number = NUMBER_PATTERN.search(str(value))
+            if number:
+                years = int(float(number.group(0).replace(",", "")))
+                return self._years_reply("total_years", question, years, 0.85)
+        return None
+
+    def _years_reply(self, intent, question, years, confidence):
+        """The number of years, or Yes/No when the question asks whether they reach a threshold"""
+        if not YES_NO_OPENERS.search(question):
+            return LocalAnswer(intent, "number", str(years), confidence, number=years)
+        threshold = YEARS_THRESHOLD_PATTERN.search(question)
+        if not threshold:
+            # "Do you have years of experience with X?" has no number to compare with
+            return None
+        required = float(threshold.group(2))
+        enough = years > required if threshold.group(1) else years >= required
+        return LocalAnswer(intent, "yes_no", "Yes" if enough else "No", confidence)
+
+    def answer(self, question):
+        """Best local answer for a question, or None when nothing in the resume applies"""
+        question = " ".join(str(question).lower().split())
+        years = self._years_answer(question)
+        if years:
+            return years
+        for intent in self.intents:
+            if not any(pattern.search(question) for pattern in intent["compiled"]):
+                continue
+            value = intent.get("value") if intent["source"] is None else lookup(self.resume_data, intent["source"])
+            if value in ("", None):
+                return None
+            confidence = intent["confidence"]
+            if intent["kind"] == "yes_no" and not YES_NO_OPENERS.search(question):
+                confidence *= 0.5
+            number = None
+            if intent["kind"] == "number":
+                found = NUMBER_PATTERN.search(str(value))
+                number = int(float(found.group(0).replace(",", ""))) if found else None
+            return LocalAnswer(intent["name"], intent["kind"], str(value), confidence, number=number)
+        return None
+
+
+class LocalAnswerStats:
+    """How many questions were answered from resume data versus passed on"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.start_run()
+
+    def start_run(self):
+        with self._lock:
+            self.local = 0
+            self.remote = 0
+            self.by_intent = Counter()
+
+    def record(self, answer):
+        with self._lock:
+            if answer is None:
+                self.remote += 1
+            else:
+                self.local += 1
+                self.by_intent[answer.intent] += 1
+
+    def report(self):
+        with self._lock:
+            total = self.local + self.remote
+            return {
+                "local": self.local,
+                "remote": self.remote,
+                "local_share": self.local / total if total else 0.0,
+                "by_intent": dict(self.by_intent),
+            }
+
+
+_answerer = None
+_stats = LocalAnswerStats()
+
+
+def get_local_answerer(resume_data):
+    """The LocalAnswerer for this resume_data, rebuilt only when a different resume is passed"""
+    global _answerer
+    answerer = _answerer
+    if answerer is None or answerer.resume_data is not resume_data:
+        answerer = LocalAnswerer(resume_data)
+        _answerer = answerer
+    return answerer
+
+
+def get_local_answer_stats():
+    return _stats
+
+
+def answer_locally(question, resume_data, field="paragraph", record=True):
+    """Rendered local answer when its confidence clears LOCAL_ANSWER_CONFIDENCE, else None"""
+    answer = get_local_answerer(resume_data).answer(question)
+    if answer is not None and answer.confidence < config.LOCAL_ANSWER_CONFIDENCE:
+        answer = None
+    if record:
+        _stats.record(answer)
+    return answer.render(field) if answer else None
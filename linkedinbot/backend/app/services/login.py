@@ -1,14 +1,25 @@
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import secrets
+import threading
+import time
 
-from .driver import DriverSetup
+from ..config.config import config
+from .driver_pool import get_driver_pool
 
 class LinkedInLogin:
     def __init__(self):
-        self.driver= DriverSetup.setup_driver()
+        self.driver= get_driver_pool().checkout()
+
+    def release(self):
+        """Hand the browser back to the pool for the next user"""
+        if self.driver is not None:
+            get_driver_pool().checkin(self.driver)
+            self.driver = None
 
     def login_with_credentials(self,  linkedin_email, linkedin_password):
+        # Selenium is imported on first login, not when the API starts
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
 
         self.driver.get("https://www.linkedin.com/login")
 
@@ -36,4 +47,75 @@ class LinkedInLogin:
 
         except Exception as e:
             print(f"Login failed: {e}")
-            return False
\ No newline at end of file
+            return False
+
+
+def login_with_pooled_driver(linkedin_email, linkedin_password):
+    """Log in on a pooled browser and hand it back; blocks, so run it on the browser executor
+
+    Returns:
+        The session cookies after a successful login, or None
+    """
+    linkedin = LinkedInLogin()
+    try:
+        if linkedin.login_with_credentials(
+            linkedin_email=linkedin_email,
+            linkedin_password=linkedin_password
+        ):
+            # The pool wipes the browser on checkin, so keep the session for apply runs
+            return linkedin.driver.get_cookies()
+        return None
+    finally:
+        linkedin.release()
+
+
+def restore_session(driver, cookies):
+    """Load the cookies of an earlier login into driver; True once LinkedIn shows the feed"""
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    # Cookies can only be set for the domain currently open
+    driver.get("https://www.linkedin.com")
+    for cookie in cookies:
+        try:
+            driver.add_cookie(cookie)
+        except Exception as e:
+            print(f"Could not restore cookie {cookie.get('name')}: {e}")
+    driver.get("https://www.linkedin.com/feed/")
+    try:
+        WebDriverWait(driver, 10).until(EC.url_contains("linkedin.com/feed"))
+        print("Successfully logged in using the saved session")
+        return True
+    except Exception as e:
+        print(f"Saved session was not accepted: {e}")
+        return False
+
+
+class LinkedInSessions:
+    """Session cookies of logged-in users, looked up by the token /api/login returns"""
+    def __init__(self, ttl=None):
+        self.ttl = config.SESSION_TTL if ttl is None else ttl
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def create(self, username, cookies):
+        token = secrets.token_urlsafe(32)
+        with self._lock:
+            self._sessions[token] = (username, cookies, time.monotonic() + self.ttl)
+        return token
+
+    def get(self, token):
+        """(username, cookies) for a live token, else None"""
+        now = time.monotonic()
+        with self._lock:
+            for stale in [key for key, (_, _, expires) in self._sessions.items() if expires <= now]:
+                del self._sessions[stale]
+            session = self._sessions.get(token)
+        return session[:2] if session else None
+
+
+_sessions = LinkedInSessions()
+
+
+def get_sessions():
+    return _sessions
@@ -0,0 +1,167 @@
+# pacing policy: deliberate rate limits, kept apart from the correctness waits in waits.py
+import random
+import sqlite3
+import threading
+import time
+
+from ..config.config import config
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate  # tokens added per second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, cost=1):
+        """Take cost tokens and return how many seconds the caller must wait for them"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= cost
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    def try_take(self, cost=1):
+        """Take cost tokens only if they are available now"""
+        self.reserve(0)
+        if self.tokens < cost:
+            return False
+        self.tokens -= cost
+        return True
+
+    def refund(self, cost=1):
+        """Give back tokens taken for work that never happened"""
+        self.tokens = min(self.capacity, self.tokens + cost)
+
+
+BUCKET_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pacing_buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL
+)
+"""
+
+
+class SharedTokenBucket:
+    """TokenBucket whose level lives in a SQLite file, so every process pacing the same
+    key (one account's applications, say) draws from one budget"""
+    def __init__(self, path, key, rate, capacity):
+        self.key = key
+        self.rate = rate
+        self.capacity = capacity
+        # Autocommit mode, so BEGIN IMMEDIATE below is the only transaction
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        # WAL with NORMAL sync commits without an fsync per reserve; a crash can at worst
+        # lose the last few reservations, which only loosens pacing briefly
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(BUCKET_SCHEMA)
+
+    def reserve(self, cost=1):
+        """Take cost tokens and return how many seconds the caller must wait for them"""
+        # Wall-clock time: monotonic clocks aren't comparable across processes
+        now = time.time()
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._db.execute("SELECT tokens, updated FROM pacing_buckets WHERE key = ?", (self.key,)).fetchone()
+            tokens, updated = row if row else (self.capacity, now)
+            tokens = min(self.capacity, tokens + max(now - updated, 0) * self.rate) - cost
+            self._db.execute("INSERT OR REPLACE INTO pacing_buckets VALUES (?, ?, ?)", (self.key, tokens, now))
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        if tokens >= 0:
+            return 0.0
+        return -tokens / self.rate
+
+
+# Actions whose budget is shared through PACING_STATE_PATH. Keystrokes are paced per
+# character, too often for a database round trip, and only matter within one browser
+SHARED_ACTIONS = ("application",)
+
+
+class PacingPolicy:
+    """Per-account rate limits every loop asks before it acts
+
+    Modes:
+        "human" - token buckets with random jitter on top of each wait
+        "zero"  - never waits, for offline benchmarks and tests
+    """
+    def __init__(self, mode=None, limits=None, jitter=None, sleep=time.sleep, account="default", state_path=None):
+        self.mode = mode or config.PACING_MODE
+        self.account = account
+        if self.mode not in ("human", "zero"):
+            raise ValueError(f"Unknown pacing mode '{self.mode}', expected 'human' or 'zero'")
+        # action -> (tokens per second, burst)
+        self.limits = limits or {
+            "application": (config.PACING_APPLICATIONS_PER_HOUR / 3600, 1),
+            "keystroke": (config.PACING_KEYSTROKES_PER_SECOND, config.PACING_KEYSTROKES_PER_SECOND),
+        }
+        self.jitter = config.PACING_JITTER if jitter is None else jitter
+        self.sleep = sleep
+        # With a state file the application budget is shared by every process working for
+        # the account, so concurrent runs split one budget instead of each getting a full one
+        state_path = config.PACING_STATE_PATH if state_path is None else state_path
+        self._buckets = {}
+        for action, (rate, burst) in self.limits.items():
+            if state_path and self.mode != "zero" and action in SHARED_ACTIONS:
+                self._buckets[action] = SharedTokenBucket(state_path, f"{account}|{action}", rate, burst)
+            else:
+                self._buckets[action] = TokenBucket(rate, burst)
+        self._lock = threading.Lock()
+        self.start_run()
+
+    def start_run(self):
+        with self._lock:
+            self._run_started = time.monotonic()
+            self._paced = {}
+
+    def pace(self, action, cost=1):
+        """Block until action may proceed and return the seconds spent waiting"""
+        if self.mode == "zero" or action not in self._buckets:
+            delay = 0.0
+        else:
+            with self._lock:
+                delay = self._buckets[action].reserve(cost)
+            if delay > 0:
+                delay *= random.uniform(1, 1 + self.jitter)
+                self.sleep(delay)
+        with self._lock:
+            calls, seconds = self._paced.get(action, (0, 0.0))
+            self._paced[action] = (calls + 1, seconds + delay)
+        return delay
+
+    def report(self):
+        """Time spent pacing versus working since start_run"""
+        with self._lock:
+            elapsed = time.monotonic() - self._run_started
+            paced = sum(seconds for _, seconds in self._paced.values())
+            return {
+                "mode": self.mode,
+                "account": self.account,
+                "elapsed_seconds": elapsed,
+                "paced_seconds": paced,
+                "working_seconds": elapsed - paced,
+                "paced_share": paced / elapsed if elapsed else 0.0,
+                "by_action": {
+                    action: {"calls": calls, "seconds": seconds}
+                    for action, (calls, seconds) in self._paced.items()
+                },
+            }
+
+
+_policies = {}
+_policies_lock = threading.Lock()
+
+
+def get_pacing_policy(account="default"):
+    """Return the pacing policy shared by every run of one account"""
+    with _policies_lock:
+        if account not in _policies:
+            _policies[account] = PacingPolicy(account=account)
+        return _policies[account]
@@ -0,0 +1,189 @@
+# speculative answer generation for the questions a job is likely to ask
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ..config.config import config
+from .answer_cache import get_answer_cache, job_context, normalize_question, resume_hash
+from .local_answerer import answer_locally
+from .question_similarity import similar_answer
+
+
+HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS question_history (
+    question TEXT NOT NULL,
+    company TEXT NOT NULL,
+    title TEXT NOT NULL,
+    text TEXT NOT NULL,
+    field TEXT NOT NULL,
+    asked INTEGER NOT NULL,
+    last_asked REAL NOT NULL,
+    PRIMARY KEY (question, company, title)
+)
+"""
+
+
+class QuestionHistory:
+    """Which questions were asked for which company and title, kept next to the answer cache"""
+    def __init__(self, path=None):
+        self._db = sqlite3.connect(path or config.ANSWER_CACHE_PATH, check_same_thread=False)
+        self._db.execute(HISTORY_SCHEMA)
+        self._db.commit()
+        self._lock = threading.Lock()
+
+    def record(self, question, job_title, company, field="paragraph"):
+        key = (normalize_question(question), normalize_question(company or ""), normalize_question(job_title or ""))
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO question_history VALUES (?, ?, ?, ?, ?, 1, ?) "
+                "ON CONFLICT (question, company, title) DO UPDATE SET "
+                "asked = asked + 1, last_asked = excluded.last_asked, text = excluded.text, field = excluded.field",
+                key + (question, field, time.time()),
+            )
+            self._db.commit()
+
+    def predict(self, job_title, company, limit):
+        """Most likely questions for a job: ones this company asked, then ones asked for
+        this title, then the most asked overall"""
+        with self._lock:
+            return self._db.execute(
+                "SELECT text, field FROM question_history GROUP BY question "
+                "ORDER BY MAX(company = ?) DESC, MAX(title = ?) DESC, SUM(asked) DESC, MAX(last_asked) DESC "
+                "LIMIT ?",
+                (normalize_question(company or ""), normalize_question(job_title or ""), limit),
+            ).fetchall()
+
+
+class AnswerPrefetcher:
+    """Generates answers for predicted questions on a background pool while a job page loads
+
+    A question the form then asks whose answer came from a prefetch is a hit; prefetched
+    answers never asked for are wasted LLM work. Both are counted per run (start_run).
+    """
+    def __init__(self, workers=None, limit=None, wait_timeout=None, history=None):
+        self.limit = limit if limit is not None else config.PREFETCH_QUESTIONS
+        self.wait_timeout = wait_timeout if wait_timeout is not None else config.PREFETCH_WAIT
+        self.executor = ThreadPoolExecutor(max_workers=workers or config.PREFETCH_WORKERS, thread_name_prefix="prefetch")
+        self.history = history or QuestionHistory()
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.start_run()
+
+    def start_run(self):
+        """Reset the prefetched/used bookkeeping and counters; prefetches in flight keep running"""
+        with self._lock:
+            self._prefetched = set()
+            self._used = set()
+            self.jobs = 0
+            self.predicted = 0
+            self.generated = 0
+            self.asked = 0
+
+    def _key(self, question, job_title, company):
+        return normalize_question(question), job_context(question, job_title, company)
+
+    def _known(self, question, resume_data, current_hash, job_title, company):
+        if answer_locally(question, resume_data, record=False) is not None:
+            return True
+        context = job_context(question, job_title, company)
+        if get_answer_cache().contains(question, current_hash, context):
+            return True
+        return similar_answer(question, current_hash, context, count=False) is not None
+
+    def prefetch(self, llm, resume_data, job_title, company):
+        """Start generating answers this job will probably need; returns the questions queued"""
+        if not self.limit:
+            return []
+        current_hash = resume_hash(resume_data)
+        todo = []
+        for question, field in self.history.predict(job_title, company, self.limit):
+            key = self._key(question, job_title, company)
+            with self._lock:
+                if key in self._inflight:
+                    continue
+            # The answer cache decides what is already known, so a question whose cached
+            # answer was evicted or expired gets prefetched again
+            if not self._known(question, resume_data, current_hash, job_title, company):
+                todo.append((key, question, field))
+        if not todo:
+            return []
+
+        future = self.executor.submit(self._generate, llm, todo, resume_data, job_title, company)
+        with self._lock:
+            self.jobs += 1
+            self.predicted += len(todo)
+            for key, _, _ in todo:
+                self._inflight[key] = future
+        print(f"Prefetching answers to {len(todo)} likely questions for {job_title} at {company}")
+        return [question for _, question, _ in todo]
+
+    def _generate(self, llm, todo, resume_data, job_title, company):
+        # llm.py imports this module, so the answering code is looked up at call time
+        from .llm import generate_answers_batch
+
+        try:
+            questions = [
+                {"id": str(position), "question": question, "field": field, "max_length": None}
+                for position, (_, question, field) in enumerate(todo)
+            ]
+            answers = generate_answers_batch(llm, questions, resume_data, job_title, company, speculative=True)
+        except Exception as e:
+            print(f"Answer prefetch failed: {e}")
+            answers = {}
+        with self._lock:
+            for position, (key, _, _) in enumerate(todo):
+                self._inflight.pop(key, None)
+                if answers.get(str(position)):
+                    self._prefetched.add(key)
+                    self.generated += 1
+
+    def wait(self, question, job_title, company, timeout=None):
+        """Block until an in-flight prefetch of this question finishes, up to timeout"""
+        with self._lock:
+            future = self._inflight.get(self._key(question, job_title, company))
+        if future is None:
+            return
+        try:
+            future.result(timeout=self.wait_timeout if timeout is None else timeout)
+        except Exception:
+            pass
+
+    def mark_used(self, question, job_title, company):
+        key = self._key(question, job_title, company)
+        with self._lock:
+            if key in self._prefetched:
+                self._used.add(key)
+
+    def record_asked(self, questions, job_title, company):
+        for question in questions:
+            if question["question"] and len(question["question"]) >= 5:
+                self.history.record(question["question"], job_title, company, question.get("field", "paragraph"))
+                with self._lock:
+                    self.asked += 1
+
+    def report(self):
+        with self._lock:
+            hits = len(self._used)
+            return {
+                "jobs": self.jobs,
+                "predicted": self.predicted,
+                "generated": self.generated,
+                "asked": self.asked,
+                "hits": hits,
+                "hit_rate": hits / self.asked if self.asked else 0.0,
+                "wasted": self.generated - hits,
+            }
+
+
+_prefetcher = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_prefetcher():
+    """Return the prefetcher shared by the whole process"""
+    global _prefetcher
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            _prefetcher = AnswerPrefetcher()
+        return _prefetcher
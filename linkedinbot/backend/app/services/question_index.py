@@ -0,0 +1,137 @@
+# one-roundtrip map from each free-text field on a step to its question text
+
+
+# Resolves every empty, visible textarea and text input to its question using, in order:
+# a descriptive placeholder, label[for], labels and question-like text in the nearest
+# ancestors, the closest preceding question element, and finally the question text
+# vertically nearest to the field. Geometry is read once per candidate, in the browser.
+QUESTION_INDEX_SCRIPT = """
+var root = arguments[0] || document;
+var maxDistance = arguments[1];
+
+function text(el) {
+    return el ? (el.innerText || el.textContent || '').replace(/\\s+/g, ' ').trim() : '';
+}
+
+function isVisible(el) {
+    var rect = el.getBoundingClientRect();
+    var style = window.getComputedStyle(el);
+    return rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden' && style.display !== 'none';
+}
+
+function center(el) {
+    var rect = el.getBoundingClientRect();
+    return rect.top + window.scrollY + rect.height / 2;
+}
+
+function ownText(el) {
+    return Array.prototype.some.call(el.childNodes, function (node) {
+        return node.nodeType === Node.TEXT_NODE && node.nodeValue.indexOf('?') !== -1;
+    });
+}
+
+function fromAncestors(el, levels) {
+    var parent = el;
+    for (var i = 0; i < levels && parent.parentElement; i++) {
+        parent = parent.parentElement;
+        var label = parent.querySelector('label');
+        if (label && text(label)) return text(label);
+        var div = parent.querySelector('div[class*="question"], div[class*="label"], div[class*="field-label"]');
+        if (div && text(div)) return text(div);
+        var candidates = parent.querySelectorAll('p, span, h1, h2, h3, h4');
+        for (var j = 0; j < candidates.length; j++) {
+            if (text(candidates[j]).length > 10) return text(candidates[j]);
+        }
+    }
+    return '';
+}
+
+function fromPreceding(el) {
+    var result = document.evaluate(
+        'preceding::*[self::p or self::h1 or self::h2 or self::h3 or self::label or self::div][position() <= 3]',
+        el, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (var i = 0; i < result.snapshotLength; i++) {
+        var value = text(result.snapshotItem(i));
+        if (value.length > 10 && value.indexOf('?') !== -1) return value;
+    }
+    return '';
+}
+
+// Question-looking text anywhere on the page, measured once for every field
+var questions = Array.prototype.filter.call(
+    document.querySelectorAll('p, div, span, label'), ownText
+).map(function (el) {
+    return {text: text(el), y: center(el)};
+});
+
+function fromGeometry(el) {
+    var y = center(el);
+    var best = null;
+    var bestDistance = maxDistance;
+    questions.forEach(function (question) {
+        var distance = Math.abs(question.y - y);
+        if (distance < bestDistance && question.text) {
+            best = question;
+            bestDistance = distance;
+        }
+    });
+    return best ? best.text : '';
+}
+
+var entries = [];
+root.querySelectorAll('textarea, input[type="text"], input:not([type])').forEach(function (el) {
+    if (el.value || el.disabled || el.readOnly || !isVisible(el)) return;
+    var tag = el.tagName.toLowerCase();
+    var placeholder = el.getAttribute('placeholder') || '';
+    var question = '', source = '';
+    if (placeholder.length > 10) {
+        question = placeholder; source = 'placeholder';
+    }
+    if (!question && el.id) {
+        var label = document.querySelector('label[for="' + CSS.escape(el.id) + '"]');
+        if (label && text(label)) { question = text(label); source = 'label'; }
+    }
+    if (!question) {
+        question = fromAncestors(el, tag === 'textarea' ? 3 : 2);
+        if (question) source = 'ancestor';
+    }
+    if (!question && tag === 'textarea') {
+        question = fromPreceding(el);
+        if (question) source = 'preceding';
+    }
+    if (!question && tag === 'textarea') {
+        question = fromGeometry(el);
+        if (question) source = 'nearest';
+    }
+    entries.push({
+        element: el,
+        tag: tag,
+        id: el.id || '',
+        name: el.getAttribute('name') || '',
+        placeholder: placeholder,
+        max_length: el.maxLength > 0 ? el.maxLength : null,
+        question: question,
+        source: source
+    });
+});
+return entries;
+"""
+
+
+def index_questions(driver, root=None, max_distance=200):
+    """Map every empty free-text field on the current step to its question in one roundtrip
+
+    Args:
+        driver: Selenium WebDriver instance
+        root: Optional element to scope the search to (defaults to the whole document)
+        max_distance: Furthest vertical distance in pixels for nearest-question matching
+
+    Returns:
+        List of dictionaries in document order with the field's WebElement under "element",
+        its "tag", "id", "name", "placeholder", "max_length" (None when unlimited), the
+        resolved "question" ("" when none was found) and the "source" method that found it
+    """
+    entries = driver.execute_script(QUESTION_INDEX_SCRIPT, root, max_distance)
+    for entry in entries:
+        entry["question"] = entry["question"].replace("\n", " ").strip()
+    return entries
@@ -0,0 +1,212 @@
+# MinHash/LSH index over answered questions, for reusing answers to paraphrased questions
+import random
+import threading
+import zlib
+from collections import OrderedDict
+
+from ..config.config import config
+from .answer_cache import get_answer_cache, normalize_question
+
+
+# Filler words that change between paraphrases without changing the question
+STOPWORDS = {
+    "a", "an", "the", "of", "in", "on", "with", "for", "to", "at", "as", "and", "or", "by",
+    "how", "many", "much", "what", "which", "do", "does", "did", "you", "your", "have", "has",
+    "are", "is", "be", "been", "will", "would", "can", "could", "please", "any", "total",
+    "level", "professional", "work", "working", "current", "currently", "legally", "now",
+}
+
+MERSENNE_PRIME = (1 << 61) - 1
+
+
+def question_tokens(question):
+    """Normalized content words of a question, with a trailing plural "s" dropped"""
+    tokens = set()
+    for word in normalize_question(question).split():
+        if len(word) < 2 or word in STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.add(word)
+    return tokens
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class QuestionSimilarityIndex:
+    """Locality-sensitive index of question token sets
+
+    Signatures are bands * rows MinHash values; two questions land in a shared bucket
+    with high probability once their Jaccard similarity passes roughly
+    (1 / bands) ** (1 / rows). Candidates from the buckets are then checked with the
+    exact Jaccard similarity. Buckets past max_bucket entries are skipped on lookup, so
+    a lookup touches a bounded number of entries however large the index grows.
+
+    The index only finds questions; answers stay in the answer cache (see
+    similar_answer). It holds at most max_entries questions, dropping the least recently
+    added or matched first, like the cache's LRU.
+    """
+    def __init__(self, threshold=None, bands=16, rows=4, max_bucket=200, seed=1, max_entries=None):
+        self.threshold = threshold if threshold is not None else config.SIMILAR_QUESTION_THRESHOLD
+        self.max_entries = config.ANSWER_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.bands = bands
+        self.rows = rows
+        self.max_bucket = max_bucket
+        generator = random.Random(seed)
+        self._perms = [
+            (generator.randrange(1, MERSENNE_PRIME), generator.randrange(0, MERSENNE_PRIME))
+            for _ in range(bands * rows)
+        ]
+        self._token_hashes = {}
+        self._buckets = [{} for _ in range(bands)]
+        self._entries = OrderedDict()  # id -> entry, least recently added or matched first
+        self._next_id = 0
+        self._seen = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def _hashes(self, token):
+        hashes = self._token_hashes.get(token)
+        if hashes is None:
+            value = zlib.crc32(token.encode("utf-8"))
+            hashes = [(a * value + b) % MERSENNE_PRIME for a, b in self._perms]
+            self._token_hashes[token] = hashes
+        return hashes
+
+    def signature(self, tokens):
+        return list(map(min, zip(*[self._hashes(token) for token in tokens])))
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        return [tuple(signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+
+    def add(self, question, scope=""):
+        """Index an answered question; scope keeps answers for different resumes or jobs apart"""
+        tokens = frozenset(question_tokens(question))
+        if not tokens:
+            return
+        with self._lock:
+            seen_key = (scope, tokens)
+            if seen_key in self._seen:
+                self._entries.move_to_end(self._seen[seen_key])
+                return
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = {"question": question, "tokens": tokens, "scope": scope}
+            self._seen[seen_key] = entry_id
+            for band, key in enumerate(self._band_keys(self.signature(tokens))):
+                self._buckets[band].setdefault(key, []).append(entry_id)
+            while self.max_entries and len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def remove(self, question, scope=""):
+        """Forget an indexed question, e.g. once the cache no longer holds its answer"""
+        with self._lock:
+            entry_id = self._seen.get((scope, frozenset(question_tokens(question))))
+            if entry_id is not None:
+                self._drop(entry_id)
+
+    def _drop(self, entry_id):
+        entry = self._entries.pop(entry_id)
+        del self._seen[(entry["scope"], entry["tokens"])]
+        for band, key in enumerate(self._band_keys(self.signature(entry["tokens"]))):
+            bucket = self._buckets[band][key]
+            bucket.remove(entry_id)
+            if not bucket:
+                del self._buckets[band][key]
+
+    def lookup(self, question, scope="", count=True):
+        """Return (matched question, similarity) for the closest indexed question at or
+        above the threshold, or None; count=False leaves the hit/miss counters alone"""
+        tokens = frozenset(question_tokens(question))
+        if not tokens:
+            return None
+        with self._lock:
+            exact = self._seen.get((scope, tokens))
+            candidates = {exact} if exact is not None else set()
+            if exact is None:
+                for band, key in enumerate(self._band_keys(self.signature(tokens))):
+                    bucket = self._buckets[band].get(key, ())
+                    # A huge bucket means this band hashed to filler shared by a whole
+                    # family of questions; real paraphrases also meet in other bands
+                    if len(bucket) <= self.max_bucket:
+                        candidates.update(bucket)
+            best_id, best_score = None, self.threshold
+            for entry_id in candidates:
+                entry = self._entries[entry_id]
+                if entry["scope"] != scope:
+                    continue
+                score = jaccard(tokens, entry["tokens"])
+                if score >= best_score:
+                    best_id, best_score = entry_id, score
+            if best_id is None:
+                self.misses += int(count)
+                return None
+            self.hits += int(count)
+            self._entries.move_to_end(best_id)
+            return self._entries[best_id]["question"], best_score
+
+    def count(self, hit):
+        """Count a lookup made with count=False once its outcome is known"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def similarity_scope(current_hash, context):
+    return f"{current_hash}:{context}"
+
+
+def get_similarity_index():
+    """Return the process-wide index, seeded from the questions already in the answer cache"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = QuestionSimilarityIndex()
+            for question, current_hash, context, _ in get_answer_cache().entries():
+                _index.add(question, similarity_scope(current_hash, context))
+        return _index
+
+
+def similar_answer(question, current_hash, context, count=True):
+    """Return (answer, matched question, similarity) for a paraphrase answered before, or None
+
+    The answer is read from the answer cache, so its TTL and eviction apply; a match
+    whose answer the cache no longer holds is dropped from the index.
+    """
+    index = get_similarity_index()
+    scope = similarity_scope(current_hash, context)
+    match = index.lookup(question, scope, count=False)
+    answer = None
+    if match:
+        matched, score = match
+        answer = get_answer_cache().get(matched, current_hash, context, count=False)
+        if answer is None:
+            index.remove(matched, scope)
+    if count:
+        index.count(answer is not None)
+    return (answer, matched, score) if answer is not None else None
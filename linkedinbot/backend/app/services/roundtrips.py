@@ -0,0 +1,38 @@
+# count WebDriver commands (browser roundtrips) issued through a driver
+from collections import Counter
+from contextlib import contextmanager
+
+
+class RoundtripCounter:
+    """Wraps driver.execute so every WebDriver command is tallied by name"""
+    def __init__(self, driver):
+        self.driver = driver
+        self.commands = Counter()
+        self._execute = driver.execute
+
+        def counting_execute(driver_command, params=None):
+            self.commands[driver_command] += 1
+            return self._execute(driver_command, params)
+
+        driver.execute = counting_execute
+
+    @property
+    def total(self):
+        return sum(self.commands.values())
+
+    def reset(self):
+        self.commands.clear()
+
+    def detach(self):
+        """Restore the driver's own execute"""
+        self.driver.execute = self._execute
+
+
+@contextmanager
+def count_roundtrips(driver):
+    """Count the WebDriver commands issued inside a with block"""
+    counter = RoundtripCounter(driver)
+    try:
+        yield counter
+    finally:
+        counter.detach()
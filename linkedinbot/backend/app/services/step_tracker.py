@@ -0,0 +1,113 @@
+# fingerprints of Easy Apply steps, for skipping handled fields and spotting stuck forms
+import hashlib
+
+from .roundtrips import RoundtripCounter
+
+
+# The field-set signature of the current step: which fields exist, not what they hold,
+# plus what they hold and which errors show, so revisits can tell whether anything changed
+STEP_SIGNATURE_SCRIPT = """
+var root = document.querySelector('.jobs-easy-apply-modal') || document;
+var heading = root.querySelector('h3, h2');
+var fields = [];
+var values = [];
+var filled = 0;
+root.querySelectorAll('input:not([type="hidden"]), textarea, select').forEach(function (el) {
+    var type = (el.type || '').toLowerCase();
+    fields.push([el.tagName.toLowerCase(), type, el.getAttribute('name') || '', el.id || ''].join('|'));
+    var value = type === 'radio' || type === 'checkbox' ? el.checked : el.value;
+    values.push(String(value));
+    if (value) filled++;
+});
+root.querySelectorAll('.artdeco-inline-feedback--error').forEach(function (el) {
+    values.push('error:' + (el.innerText || '').trim());
+});
+return {
+    heading: heading ? (heading.innerText || '').trim() : '',
+    fields: fields,
+    values: values,
+    filled: filled
+};
+"""
+
+
+def step_fingerprint(signature):
+    """Short stable hash of a step's heading and field set"""
+    digest = hashlib.sha1()
+    digest.update(signature["heading"].encode("utf-8"))
+    for field in sorted(signature["fields"]):
+        digest.update(b"\0" + field.encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+def step_state(signature):
+    """Hash of what a step's fields hold and which errors it shows"""
+    return hashlib.sha1("\0".join(signature["values"]).encode("utf-8")).hexdigest()[:12]
+
+
+def field_key(field):
+    """Key identifying a snapshot field or question-index entry within one step"""
+    return field.get("id") or field.get("name") or field.get("identifier") or field.get("question", "")
+
+
+class StepTracker:
+    """Follows one application through its steps
+
+    enter() and leave() cost one roundtrip each. leave() records the step as it was left,
+    after filling and right before pressing its button. A step that keeps coming back
+    exactly as it was left (same fields filled, same values, same errors) marks the
+    application as stuck; the first such revisit is allowed, since a slow Next transition
+    shows the old step again.
+    """
+    UNCHANGED_REVISITS = 2
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.roundtrips = RoundtripCounter(driver)
+        self.fingerprint = None
+        self.steps = 0
+        self.visits = 0
+        self.stuck = False
+        self._left = {}
+        self._unchanged = {}
+        self._handled = {}
+
+    def enter(self):
+        """Fingerprint the step on screen and return it"""
+        signature = self.driver.execute_script(STEP_SIGNATURE_SCRIPT)
+        fingerprint = step_fingerprint(signature)
+        if self._left.get(fingerprint) == (signature["filled"], step_state(signature)):
+            self._unchanged[fingerprint] = self._unchanged.get(fingerprint, 0) + 1
+            if self._unchanged[fingerprint] >= self.UNCHANGED_REVISITS:
+                self.stuck = True
+        else:
+            self._unchanged[fingerprint] = 0
+        if fingerprint != self.fingerprint:
+            self.steps += 1
+        self.fingerprint = fingerprint
+        self.visits += 1
+        return fingerprint
+
+    def leave(self):
+        """Record the current step as filled, before its button is pressed"""
+        signature = self.driver.execute_script(STEP_SIGNATURE_SCRIPT)
+        self._left[step_fingerprint(signature)] = (signature["filled"], step_state(signature))
+
+    @property
+    def handled(self):
+        """Keys of the fields already handled on the current step"""
+        return self._handled.setdefault(self.fingerprint, set())
+
+    def finish(self):
+        """Stop counting roundtrips and return the report"""
+        self.roundtrips.detach()
+        return self.report()
+
+    def report(self):
+        return {
+            "steps": self.steps,
+            "visits": self.visits,
+            "distinct_steps": len(self._unchanged),
+            "roundtrips": self.roundtrips.total,
+            "stuck": self.stuck,
+        }
@@ -0,0 +1,211 @@
+# event-driven waits used instead of fixed time.sleep calls
+import json
+import time
+import weakref
+
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+
+# Resolves once no DOM mutation has happened for quietMs (and the document has loaded),
+# or with false once the budget runs out
+DOM_SETTLED_SCRIPT = """
+var quietMs = arguments[0], budgetMs = arguments[1], done = arguments[arguments.length - 1];
+var start = performance.now(), last = start;
+var observer = new MutationObserver(function () { last = performance.now(); });
+observer.observe(document.documentElement || document, {
+    childList: true, subtree: true, attributes: true, characterData: true
+});
+(function check() {
+    var now = performance.now();
+    if (document.readyState === 'complete' && now - last >= quietMs) {
+        observer.disconnect();
+        done(true);
+    } else if (now - start >= budgetMs) {
+        observer.disconnect();
+        done(false);
+    } else {
+        setTimeout(check, 25);
+    }
+})();
+"""
+
+# Fallback for drivers without performance logging: resolves once no new resource
+# entry has appeared for idleMs
+RESOURCE_IDLE_SCRIPT = """
+var idleMs = arguments[0], budgetMs = arguments[1], done = arguments[arguments.length - 1];
+var start = performance.now(), last = start;
+var count = performance.getEntriesByType('resource').length;
+(function check() {
+    var now = performance.now(), current = performance.getEntriesByType('resource').length;
+    if (current !== count) { count = current; last = now; }
+    if (document.readyState === 'complete' && now - last >= idleMs) done(true);
+    else if (now - start >= budgetMs) done(false);
+    else setTimeout(check, 50);
+})();
+"""
+
+ELEMENT_STATES = {
+    "present": EC.presence_of_element_located,
+    "visible": EC.visibility_of_element_located,
+    "clickable": EC.element_to_be_clickable,
+    "invisible": EC.invisibility_of_element_located,
+    "selected": EC.element_located_to_be_selected,
+}
+
+# Requests in flight longer than this (long-polling, websockets) don't block network idle
+STALE_REQUEST_SECONDS = 10
+
+
+class WaitStats:
+    """Time spent in waits compared with the fixed sleeps they replaced"""
+    def __init__(self):
+        self.run = self._empty()
+        self.application = self._empty()
+
+    def _empty(self):
+        return {"waits": 0, "timeouts": 0, "legacy_seconds": 0.0, "waited_seconds": 0.0}
+
+    def start_application(self):
+        self.application = self._empty()
+
+    def record(self, legacy, waited, timed_out=False):
+        for bucket in (self.run, self.application):
+            bucket["waits"] += 1
+            bucket["timeouts"] += int(timed_out)
+            bucket["legacy_seconds"] += legacy
+            bucket["waited_seconds"] += waited
+
+    def report(self, scope="application"):
+        bucket = dict(self.application if scope == "application" else self.run)
+        bucket["seconds_saved"] = bucket["legacy_seconds"] - bucket["waited_seconds"]
+        return bucket
+
+
+class NetworkTracker:
+    """Follows in-flight requests from the CDP events in chromedriver's performance log"""
+    def __init__(self):
+        self.inflight = {}
+
+    def poll(self, driver):
+        for entry in driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            method = message.get("method", "")
+            params = message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                self.inflight[params["requestId"]] = time.monotonic()
+            elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                self.inflight.pop(params.get("requestId"), None)
+
+    def active(self):
+        now = time.monotonic()
+        for request_id, started in list(self.inflight.items()):
+            if now - started > STALE_REQUEST_SECONDS:
+                del self.inflight[request_id]
+        return len(self.inflight)
+
+
+_stats = weakref.WeakKeyDictionary()
+_trackers = weakref.WeakKeyDictionary()
+
+
+def get_wait_stats(driver):
+    """Return the wait statistics kept for this driver"""
+    if driver not in _stats:
+        _stats[driver] = WaitStats()
+    return _stats[driver]
+
+
+def _run_async(driver, script, *args, budget):
+    # The async script budget must outlive the in-page timer; the timeout is session-wide,
+    # so put the previous one back for whoever uses this (pooled) driver next
+    previous = driver.timeouts.script
+    driver.set_script_timeout(budget + 2)
+    try:
+        return driver.execute_async_script(script, *args)
+    finally:
+        driver.set_script_timeout(previous)
+
+
+def _dom_settled(driver, quiet_ms, timeout):
+    try:
+        return bool(_run_async(driver, DOM_SETTLED_SCRIPT, quiet_ms, timeout * 1000, budget=timeout))
+    except Exception as e:
+        print(f"DOM settle check failed: {e}")
+        return False
+
+
+def _network_idle(driver, idle_ms, timeout, max_inflight):
+    deadline = time.monotonic() + timeout
+    try:
+        if driver not in _trackers:
+            _trackers[driver] = NetworkTracker()
+        tracker = _trackers[driver]
+        idle_since = None
+        while time.monotonic() < deadline:
+            tracker.poll(driver)
+            if tracker.active() <= max_inflight:
+                idle_since = idle_since or time.monotonic()
+                if (time.monotonic() - idle_since) * 1000 >= idle_ms:
+                    return True
+            else:
+                idle_since = None
+            time.sleep(0.05)
+        return False
+    except Exception:
+        # No performance log on this driver, watch resource timing entries instead
+        remaining = max(deadline - time.monotonic(), 0.1)
+        try:
+            return bool(_run_async(driver, RESOURCE_IDLE_SCRIPT, idle_ms, remaining * 1000, budget=remaining))
+        except Exception as e:
+            print(f"Network idle check failed: {e}")
+            return False
+
+
+def wait_for_dom_settled(driver, quiet_ms=300, timeout=5, legacy=0):
+    """Wait until the DOM has been free of mutations for quiet_ms, up to timeout seconds"""
+    started = time.monotonic()
+    settled = _dom_settled(driver, quiet_ms, timeout)
+    get_wait_stats(driver).record(legacy, time.monotonic() - started, timed_out=not settled)
+    return settled
+
+
+def wait_for_network_idle(driver, idle_ms=500, timeout=10, max_inflight=0, legacy=0):
+    """Wait until at most max_inflight requests have been pending for idle_ms, up to timeout seconds"""
+    started = time.monotonic()
+    idle = _network_idle(driver, idle_ms, timeout, max_inflight)
+    get_wait_stats(driver).record(legacy, time.monotonic() - started, timed_out=not idle)
+    return idle
+
+
+def wait_for_element(driver, locator, state="present", timeout=10, legacy=0):
+    """Wait for an element to reach a state ("present", "visible", "clickable", "invisible", "selected")"""
+    started = time.monotonic()
+    try:
+        result = WebDriverWait(driver, timeout).until(ELEMENT_STATES[state](locator))
+    except Exception:
+        result = None
+    get_wait_stats(driver).record(legacy, time.monotonic() - started, timed_out=result is None)
+    return result
+
+
+def wait_for_page_ready(driver, timeout=10, legacy=0):
+    """Wait for a navigation: network quiet first, then the DOM"""
+    started = time.monotonic()
+    _network_idle(driver, 500, timeout, max_inflight=2)
+    remaining = max(timeout - (time.monotonic() - started), 0.5)
+    settled = _dom_settled(driver, 300, remaining)
+    get_wait_stats(driver).record(legacy, time.monotonic() - started, timed_out=not settled)
+    return settled
+
+
+def settle(driver, legacy, quiet_ms=150):
+    """Short DOM-settled wait after an interaction, budgeted by the sleep it replaces"""
+    return wait_for_dom_settled(driver, quiet_ms=quiet_ms, timeout=max(legacy, quiet_ms / 1000 + 0.2), legacy=legacy)
+
+
+def scroll_into_view(driver, element, legacy=0):
+    """Scroll instantly instead of smooth-scrolling and sleeping until the animation ends"""
+    started = time.monotonic()
+    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
+    get_wait_stats(driver).record(legacy, time.monotonic() - started)
@@ -0,0 +1,116 @@
+# page-load time and renderer memory for each browser profile against a local fixture page
+#
+# Usage (from linkedinbot/backend): python -m benchmarks.bench_browser_profiles [--runs 5] [--latency 0.05]
+import argparse
+import functools
+import os
+import statistics
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from app.services.driver import BROWSER_PROFILES, DriverSetup
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Synthetic asset sizes so the fixture weighs roughly what a LinkedIn job page does
+ASSET_TYPES = {
+    ".png": ("image/png", 20_000),
+    ".jpg": ("image/jpeg", 250_000),
+    ".woff2": ("font/woff2", 60_000),
+    ".mp4": ("video/mp4", 2_000_000),
+    ".js": ("application/javascript", 80_000),
+}
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    latency = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        if not self.path.startswith("/asset/"):
+            return super().do_GET()
+        extension = os.path.splitext(self.path)[1]
+        content_type, size = ASSET_TYPES.get(extension, ("application/octet-stream", 1_000))
+        body = b"// fixture\n" + b" " * size if extension == ".js" else b"\0" * size
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(latency):
+    handler = functools.partial(FixtureHandler, directory=FIXTURES_DIR)
+    FixtureHandler.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def renderer_memory_mb(driver):
+    """Resident memory of the browser's renderer processes, falling back to JS heap size"""
+    try:
+        import psutil
+
+        browser = psutil.Process(driver.service.process.pid)
+        renderers = [
+            process for process in browser.children(recursive=True)
+            if "--type=renderer" in " ".join(process.cmdline())
+        ]
+        if renderers:
+            return sum(process.memory_info().rss for process in renderers) / 1_000_000
+    except Exception:
+        pass
+    driver.execute_cdp_cmd("Performance.enable", {})
+    metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+    heap = {metric["name"]: metric["value"] for metric in metrics}.get("JSHeapTotalSize", 0)
+    return heap / 1_000_000
+
+
+def bench_profile(profile, url, runs):
+    driver = DriverSetup.setup_driver(profile)
+    load_times = []
+    try:
+        for _ in range(runs):
+            driver.get("about:blank")
+            driver.get(url)
+            load_times.append(driver.execute_script(
+                "var nav = performance.getEntriesByType('navigation')[0];"
+                "return nav.loadEventEnd - nav.startTime;"
+            ))
+        memory = renderer_memory_mb(driver)
+    finally:
+        driver.quit()
+    return {
+        "profile": profile,
+        "median_load_ms": statistics.median(load_times),
+        "max_load_ms": max(load_times),
+        "renderer_memory_mb": memory,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Page-load time and renderer memory per browser profile")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated per-request server latency (s)")
+    parser.add_argument("--profiles", nargs="*", default=list(BROWSER_PROFILES))
+    args = parser.parse_args()
+
+    server = start_server(args.latency)
+    url = f"http://127.0.0.1:{server.server_address[1]}/job_page.html"
+    try:
+        print(f"{'profile':<16}{'median load ms':>16}{'max load ms':>14}{'renderer MB':>14}")
+        for profile in args.profiles:
+            result = bench_profile(profile, url, args.runs)
+            print(f"{result['profile']:<16}{result['median_load_ms']:>16.0f}"
+                  f"{result['max_load_ms']:>14.0f}{result['renderer_memory_mb']:>14.1f}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
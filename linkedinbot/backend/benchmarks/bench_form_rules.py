@@ -0,0 +1,91 @@
+# rule evaluation cost over a 50-field Easy Apply form
+#
+# Usage (from linkedinbot/backend): python -m benchmarks.bench_form_rules [--repeat 2000]
+import argparse
+import random
+import time
+
+from app.services.form_rules import FIELD_RULESET, choose_option, text_answer
+
+RESUME_DATA = {
+    "personal_info": {
+        "name": "Ada Lovelace", "email": "ada@example.com", "phone": "5550100",
+        "address": "12 Example Street", "linkedin": "https://www.linkedin.com/in/ada", "website": "https://ada.dev",
+    },
+    "education": [{"degree": "Master of Science"}],
+    "questions": {
+        "years_of_experience": "5", "willing_to_relocate": "Yes", "willing_to_travel": "No",
+        "preferred_work_setting": "Hybrid", "salary_expectation": "$100,000",
+        "visa_sponsorship_required": "No",
+    },
+}
+
+YES_NO = [("Select an option", ""), ("Yes", "Yes"), ("No", "No")]
+
+# Identifiers shaped like the ones handle_form_fields builds (id name aria-label label)
+CHOICE_FIELDS = [
+    ("urn:li:fs_easyApplyFormElement:(1,visa) will you now or in the future require sponsorship for employment visa status?", YES_NO),
+    ("urn:li:fs_easyApplyFormElement:(2,relocate) are you willing to relocate to san francisco?", YES_NO),
+    ("urn:li:fs_easyApplyFormElement:(3,travel) are you comfortable travelling up to 25%?", YES_NO),
+    ("urn:li:fs_easyApplyFormElement:(4,auth) are you legally authorized to work in the united states?", YES_NO),
+    ("urn:li:fs_easyApplyFormElement:(5,edu) what is the highest level of education you have completed?",
+     [("Select", ""), ("High school", ""), ("Bachelor's degree", ""), ("Master's degree", ""), ("Doctorate", "")]),
+    ("urn:li:fs_easyApplyFormElement:(6,setting) which work setting do you prefer? remote",
+     [("On-site", ""), ("Hybrid", ""), ("Remote", "")]),
+    ("urn:li:fs_easyApplyFormElement:(7,misc) have you completed the following level of clearance?", YES_NO),
+]
+TEXT_FIELDS = [
+    "single-line-text-form-component-phonenumber mobile phone number",
+    "single-line-text-form-component-email email address",
+    "single-line-text-form-component-first first name",
+    "single-line-text-form-component-last last name",
+    "single-line-text-form-component-website portfolio website",
+    "single-line-text-form-component-salary desired salary",
+    "single-line-text-form-component-city city",
+    "single-line-text-form-component-years how many years of work experience do you have with python?",
+]
+
+
+def build_form(size, seed=7):
+    rng = random.Random(seed)
+    form = []
+    for _ in range(size):
+        if rng.random() < 0.5:
+            identifier, options = rng.choice(CHOICE_FIELDS)
+            form.append(("choice", identifier, options))
+        else:
+            form.append(("text", rng.choice(TEXT_FIELDS), None))
+    return form
+
+
+def evaluate(form):
+    answers = []
+    for kind, identifier, options in form:
+        rule = FIELD_RULESET.match(identifier, kind=kind)
+        if kind == "choice":
+            answers.append(choose_option(rule, RESUME_DATA, options))
+        else:
+            answers.append(text_answer(rule, RESUME_DATA) if rule else None)
+    return answers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rule evaluation cost over a synthetic Easy Apply form")
+    parser.add_argument("--fields", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    form = build_form(args.fields)
+    evaluate(form)  # warm up
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        evaluate(form)
+    per_form = (time.perf_counter() - started) / args.repeat
+
+    print(f"{args.fields} fields: {per_form * 1e6:.0f} us per form, "
+          f"{per_form / args.fields * 1e6:.2f} us per field")
+
+
+if __name__ == "__main__":
+    main()
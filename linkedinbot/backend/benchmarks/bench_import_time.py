@@ -0,0 +1,77 @@
+# import time of the API under -X importtime, checked against a budget and a list of heavy stacks
+#
+# Usage (from linkedinbot/backend): python -m benchmarks.bench_import_time [--module app.main]
+#     [--budget-ms 400] [--runs 5]
+#
+# Exits with status 1 when the median import time exceeds the budget or a forbidden
+# package (Selenium, webdriver_manager, langchain) is imported at startup.
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import Counter
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# app.main mounts ./frontend, so the import runs from the directory holding it
+PROJECT_DIR = os.path.dirname(BACKEND_DIR)
+
+# Stacks the API must only import on first use
+FORBIDDEN = ["selenium", "webdriver_manager", "langchain", "langchain_core", "langchain_google_genai"]
+
+IMPORTTIME_PATTERN = re.compile(r"^import time:\s*(\d+) \|\s*(\d+) \| (\s*)(\S+)$")
+
+
+def import_once(module):
+    """Import module in a fresh interpreter; returns {name: (self us, cumulative us)}"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [BACKEND_DIR, os.environ.get("PYTHONPATH")])))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    timings = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if match:
+            timings[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time of the API against a budget")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--budget-ms", type=float, default=400)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    totals = []
+    by_package = Counter()
+    imported = set()
+    for _ in range(args.runs):
+        timings = import_once(args.module)
+        totals.append(timings[args.module][1] / 1000)
+        for name, (self_us, _) in timings.items():
+            by_package[name.split(".")[0]] += self_us / 1000 / args.runs
+        imported.update(timings)
+
+    median = statistics.median(totals)
+    forbidden = sorted({name.split(".")[0] for name in imported} & set(FORBIDDEN))
+    print(f"import {args.module}: median {median:.0f} ms over {args.runs} runs "
+          f"(min {min(totals):.0f}, max {max(totals):.0f}), budget {args.budget_ms:.0f} ms")
+    print(f"{'package':<28}{'self ms':>10}")
+    for package, milliseconds in by_package.most_common(args.top):
+        print(f"{package:<28}{milliseconds:>10.1f}")
+    if forbidden:
+        print(f"FAIL: imported at startup: {', '.join(forbidden)}")
+    if median > args.budget_ms:
+        print(f"FAIL: over the {args.budget_ms:.0f} ms budget")
+    sys.exit(1 if forbidden or median > args.budget_ms else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# offline load test of the answer pipeline (local answers, cache, batch LLM) against a stub backend
+#
+# Usage (from linkedinbot/backend): python -m benchmarks.bench_llm_pipeline [--applications 40]
+#     [--concurrency 4] [--backend fake|stub] [--latency lognormal:0.8,0.5] [--error-rate 0.05]
+#     [--requests-per-minute 600] [--seed 1]
+#
+# With --backend stub, start the server first: python -m app.services.llm_stub_server --seed 1
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Every run starts from an empty answer cache, so runs with the same seed are comparable
+os.environ["ANSWER_CACHE_PATH"] = os.path.join(tempfile.mkdtemp(), "bench_answer_cache.sqlite3")
+os.environ["PREFETCH_QUESTIONS"] = "0"
+
+from app.services.llm import generate_answers_batch
+from app.services.llm_backends import create_llm
+from app.services.llm_client import AsyncLLMClient, LatencyHistogram
+
+RESUME_DATA = {
+    "personal_info": {"name": "Ada Lovelace", "email": "ada@example.com"},
+    "skills": ["Python", "SQL", "Airflow"],
+    "work_experience": [{"title": "Data Engineer", "company": "Analytical Engines",
+                         "start_date": "2018-01", "end_date": "Present",
+                         "description": "Python and SQL pipelines."}],
+    "questions": {"visa_sponsorship_required": "No", "willing_to_relocate": "Yes"},
+}
+
+# One Easy Apply step per application: structured questions the resume answers, generic
+# ones that repeat across jobs, and job-specific ones that always reach the LLM
+STEP = [
+    ("How many years of experience do you have with Python?", "single line"),
+    ("Will you now or in the future require visa sponsorship?", "single line"),
+    ("Describe a data pipeline you are proud of.", "paragraph"),
+    ("What is your greatest professional strength?", "paragraph"),
+    ("Why do you want to work at {company}?", "paragraph"),
+    ("What excites you about the {job_title} role at {company}?", "paragraph"),
+]
+
+
+def apply_answers(llm, index):
+    company = f"Company {index}"
+    job_title = "Data Engineer"
+    questions = [
+        {"id": str(position), "question": text.format(company=company, job_title=job_title),
+         "field": field, "max_length": None}
+        for position, (text, field) in enumerate(STEP)
+    ]
+    started = time.monotonic()
+    answers = generate_answers_batch(llm, questions, RESUME_DATA, job_title, company)
+    return time.monotonic() - started, sum(1 for answer in answers.values() if answer)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Answer pipeline throughput against an offline LLM backend")
+    parser.add_argument("--applications", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--backend", choices=["fake", "stub"], default="fake")
+    parser.add_argument("--stub-url", default="http://127.0.0.1:8765")
+    parser.add_argument("--latency", default="lognormal:0.8,0.5")
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--requests-per-minute", type=float, default=600)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    backend = create_llm(args.backend, stub_url=args.stub_url, latency=args.latency,
+                         error_rate=args.error_rate, seed=args.seed)
+    llm = AsyncLLMClient(backend, max_inflight=args.concurrency,
+                         requests_per_minute=args.requests_per_minute, timeout=30)
+    latency = LatencyHistogram(window=args.applications)
+
+    started = time.monotonic()
+    answered = 0
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for seconds, count in pool.map(lambda index: apply_answers(llm, index), range(args.applications)):
+            latency.record(seconds)
+            answered += count
+    elapsed = time.monotonic() - started
+
+    stats = llm.stats()
+    report = latency.report()
+    print(f"{args.applications} applications x {len(STEP)} questions, {args.backend} backend "
+          f"({args.latency}, {args.error_rate:.0%} errors), concurrency {args.concurrency}, seed {args.seed}")
+    print(f"applications/min      {args.applications / elapsed * 60:>10.1f}")
+    print(f"step p50 / p95 (s)    {report['p50']:>10.2f} / {report['p95']:.2f}")
+    print(f"answers filled        {answered:>10} of {args.applications * len(STEP)}")
+    print(f"LLM calls / failures  {stats['calls']:>10} / {stats['failures']}")
+    if args.backend == "fake":
+        print(f"backend errors        {backend.errors:>10} of {backend.calls} backend calls")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# answers the local answerer gives a labeled question set, and its per-question cost
+#
+# Usage (from linkedinbot/backend): python -m benchmarks.bench_local_answers [--rounds 2000]
+#
+# Exits with status 1 when an answer differs from the fixture; a null answer means the
+# question must be left to the LLM.
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import date
+
+from app.services.local_answerer import LocalAnswerer
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "local_answer_questions.json")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Labeled answers and cost of the local answerer")
+    parser.add_argument("--rounds", type=int, default=2000, help="Passes over the question set for the timing")
+    args = parser.parse_args()
+
+    with open(FIXTURE) as file:
+        labeled = json.load(file)
+    answerer = LocalAnswerer(labeled["resume"], today=date.fromisoformat(labeled["today"]))
+
+    wrong = 0
+    for case in labeled["cases"]:
+        answer = answerer.answer(case["question"])
+        value = answer.value if answer else None
+        if value != case["answer"]:
+            wrong += 1
+            print(f"  wrong: {case['question']!r} -> {value!r}, expected {case['answer']!r}")
+    print(f"Correct {len(labeled['cases']) - wrong}/{len(labeled['cases'])}")
+
+    samples = []
+    for _ in range(args.rounds):
+        started = time.perf_counter()
+        for case in labeled["cases"]:
+            answerer.answer(case["question"])
+        samples.append((time.perf_counter() - started) * 1e6 / len(labeled["cases"]))
+    print(f"Per question: median {statistics.median(samples):.1f} us")
+
+    if wrong:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
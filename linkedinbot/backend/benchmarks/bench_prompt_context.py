@@ -0,0 +1,99 @@
+# per-call CPU time and allocations of building an answer prompt, rebuilt per call versus ResumeContext
+#
+# Usage (from linkedinbot/backend): python -m benchmarks.bench_prompt_context [--calls 5000]
+import argparse
+import time
+import tracemalloc
+
+from langchain_core.prompts import PromptTemplate
+
+from app.services.answer_cache import resume_hash
+from app.services.llm import applicant_info, get_resume_context
+
+RESUME_DATA = {
+    "personal_info": {"name": "Ada Lovelace", "email": "ada@example.com", "phone": "5550100"},
+    "skills": ["Python", "SQL", "Machine Learning", "Docker", "Kubernetes", "React", "AWS"],
+    "work_experience": [
+        {"title": "Senior Engineer", "company": "Analytical Engines", "description": "Built data pipelines and ML services. " * 8},
+        {"title": "Engineer", "company": "Difference Co", "description": "Backend APIs."},
+    ],
+    "education": [{"degree": "Master of Science", "school": "University of London"}],
+    "questions": {"years_of_experience": "6", "willing_to_relocate": "Yes", "salary_expectation": "$140,000"},
+    "projects": [{"name": f"project {index}", "description": "Lorem ipsum dolor sit amet. " * 5} for index in range(10)],
+}
+
+QUESTION = "Describe a project where you improved the performance of a data pipeline."
+
+TEMPLATE = """
+            You are helping a job applicant answer a question on a LinkedIn job application form.
+            
+            JOB: {job_title} at {company}
+            
+            QUESTION: {question}
+            
+            APPLICANT INFO:
+            - Skills: {skills}
+            - Recent Experience: {experience}
+            - Additional Profile Info: {profile}
+            
+            Write a concise, professional response that directly answers the question. 
+            Make it specific to the job position and highlight relevant skills or experience.
+            Keep it under 100 words, using first-person perspective.Just write the very short answer directly, and if the answer is numbers then answer in digits.
+            Don't start with phrases like "As a [job title]" or "Based on my experience" - just answer directly.
+            Only output the answer text with no quotation marks or additional commentary.
+            """
+
+
+def per_call_prompt(resume_data):
+    """The previous path: hash the resume for the cache lookup and the store, rebuild the
+    summaries and the PromptTemplate, then format"""
+    resume_hash(resume_data)
+    skills, experience, profile = applicant_info(resume_data)
+    prompt = PromptTemplate(
+        input_variables=["question", "job_title", "company", "skills", "experience", "profile"],
+        template=TEMPLATE,
+    ).format(question=QUESTION, job_title="Data Engineer", company="Acme",
+             skills=skills, experience=experience, profile=profile)
+    resume_hash(resume_data)
+    return prompt
+
+
+def compiled_prompt(resume_data):
+    context = get_resume_context(resume_data)
+    prompt = context.answer_prompt(QUESTION, "Data Engineer", "Acme")
+    get_resume_context(resume_data).hash
+    return prompt
+
+
+def measure(build, calls):
+    build(RESUME_DATA)  # warm-up, and the one-off compile for ResumeContext
+    started = time.process_time()
+    for _ in range(calls):
+        build(RESUME_DATA)
+    cpu = (time.process_time() - started) / calls
+
+    # Peak memory allocated while one call runs, averaged over a few calls
+    peaks = []
+    tracemalloc.start()
+    for _ in range(50):
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        build(RESUME_DATA)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+    return cpu, sum(peaks) / len(peaks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-call cost of building an answer prompt")
+    parser.add_argument("--calls", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'path':<16}{'CPU us/call':>14}{'peak alloc KB/call':>20}")
+    for name, build in (("per call", per_call_prompt), ("ResumeContext", compiled_prompt)):
+        cpu, peak = measure(build, args.calls)
+        print(f"{name:<16}{cpu * 1e6:>14.1f}{peak / 1024:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# paraphrase recall and lookup latency of the MinHash/LSH question index as its history grows
+#
+# Usage (from linkedinbot/backend): python -m benchmarks.bench_question_similarity [--history 100000] [--queries 2000]
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+
+from app.services.question_similarity import QuestionSimilarityIndex, jaccard, question_tokens
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "question_paraphrases.json")
+
+TEMPLATES = [
+    "How many years of experience do you have with {0}?",
+    "Years of {0} experience with {1}?",
+    "Have you used {0} in a {1} environment?",
+    "Describe your experience with {0} and {1}",
+    "Are you certified in {0}?",
+]
+
+
+def synthetic_history(size, seed=7):
+    """Distinct questions that share their filler words with the labeled set but never its topics"""
+    generator = random.Random(seed)
+    vocabulary = [f"tool{index}" for index in range(max(size // 2, 100))]
+    questions = set()
+    while len(questions) < size:
+        template = generator.choice(TEMPLATES)
+        questions.add(template.format(generator.choice(vocabulary), generator.choice(vocabulary)))
+    return sorted(questions)
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paraphrase recall and lookup latency of the question index")
+    parser.add_argument("--history", type=int, default=100_000, help="Synthetic answered questions to index")
+    parser.add_argument("--queries", type=int, default=2000, help="Latency samples")
+    parser.add_argument("--threshold", type=float, default=0.7)
+    args = parser.parse_args()
+
+    with open(FIXTURE) as file:
+        labeled = json.load(file)
+
+    index = QuestionSimilarityIndex(threshold=args.threshold, max_entries=0)
+    started = time.perf_counter()
+    history = synthetic_history(args.history)
+    for number, question in enumerate(history):
+        index.add(question)
+    for questions in labeled["groups"]:
+        index.add(questions[0])
+    build = time.perf_counter() - started
+    print(f"Indexed {len(index)} questions in {build:.1f}s")
+
+    # Recall: every paraphrase should find its group's question; negatives should find nothing
+    found = total = 0
+    for questions in labeled["groups"]:
+        for question in questions[1:]:
+            total += 1
+            match = index.lookup(question)
+            if match and match[0] == questions[0]:
+                found += 1
+            else:
+                print(f"  missed: {question!r} -> {match[0] if match else None!r}")
+    false_positives = [question for question in labeled["negatives"] if index.lookup(question)]
+    for question in false_positives:
+        print(f"  false positive: {question!r} -> {index.lookup(question)[0]!r}")
+    print(f"Recall {found}/{total} ({found / total:.0%}), "
+          f"false positives {len(false_positives)}/{len(labeled['negatives'])}")
+
+    # Latency: LSH lookups against a brute-force Jaccard scan of the same history
+    queries = synthetic_history(args.queries, seed=3)
+    lsh = []
+    for question in queries:
+        started = time.perf_counter()
+        index.lookup(question)
+        lsh.append((time.perf_counter() - started) * 1000)
+    token_sets = [question_tokens(question) for question in history]
+    scan = []
+    for question in queries[:20]:
+        started = time.perf_counter()
+        tokens = question_tokens(question)
+        max(jaccard(tokens, other) for other in token_sets)
+        scan.append((time.perf_counter() - started) * 1000)
+    print(f"{'lookup':<12}{'p50 ms':>10}{'p99 ms':>10}")
+    print(f"{'lsh':<12}{statistics.median(lsh):>10.3f}{percentile(lsh, 0.99):>10.3f}")
+    print(f"{'full scan':<12}{statistics.median(scan):>10.3f}{percentile(scan, 0.99):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# WebDriver roundtrips to answer every radio group on a fixture Easy Apply step
+#
+# Usage (from linkedinbot/backend): python -m benchmarks.bench_radio_groups [--groups 8] [--options 3]
+import argparse
+import os
+import pathlib
+
+from selenium.webdriver.common.by import By
+
+from app.services.driver import DriverSetup
+from app.services.form_apply import apply_plan, plan_entry
+from app.services.form_rules import resolve_radio_group
+from app.services.form_snapshot import radio_groups, take_form_snapshot
+from app.services.roundtrips import count_roundtrips
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "easy_apply_form.html")
+
+RESUME_DATA = {
+    "education": [{"degree": "Master of Science"}],
+    "questions": {
+        "willing_to_relocate": "Yes", "willing_to_travel": "No",
+        "preferred_work_setting": "Hybrid", "visa_sponsorship_required": "No",
+    },
+}
+
+
+def legacy_radios(driver):
+    """The old per-button handling: attributes, label and group state fetched one call at a time"""
+    for radio in driver.find_elements(By.CSS_SELECTOR, "input[type='radio']"):
+        if not radio.is_enabled():
+            continue
+        radio_id = radio.get_attribute("id") or ""
+        radio_name = radio.get_attribute("name") or ""
+        radio_value = radio.get_attribute("value") or ""
+        label_text = driver.find_element(By.CSS_SELECTOR, f"label[for='{radio_id}']").text.strip()
+        if radio.is_selected():
+            continue
+        group = driver.find_elements(By.CSS_SELECTOR, f"input[type='radio'][name='{radio_name}']")
+        if any(member.is_selected() for member in group):
+            continue
+        if "yes" in label_text.lower() or radio_value.lower() == "yes":
+            radio.click()
+
+
+def grouped_radios(driver):
+    """Snapshot, resolve each group once, apply every click in one call"""
+    snapshot = take_form_snapshot(driver)
+    plan = []
+    for radios in radio_groups(snapshot).values():
+        choice = resolve_radio_group(radios, RESUME_DATA)
+        if choice:
+            plan.append(plan_entry(choice, "radio"))
+    apply_plan(driver, plan)
+
+
+def measure(driver, url, handler):
+    driver.get(url)
+    with count_roundtrips(driver) as counter:
+        handler(driver)
+    checked = driver.execute_script("return document.querySelectorAll('input[type=radio]:checked').length;")
+    return counter.total, checked
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WebDriver roundtrips per radio-group strategy")
+    parser.add_argument("--groups", type=int, default=8)
+    parser.add_argument("--options", type=int, default=3)
+    args = parser.parse_args()
+
+    url = pathlib.Path(FIXTURE).as_uri() + f"?groups={args.groups}&options={args.options}"
+    driver = DriverSetup.setup_driver("headless-lean")
+    try:
+        print(f"{args.groups} groups x {args.options} options")
+        print(f"{'strategy':<12}{'roundtrips':>12}{'groups answered':>18}")
+        for name, handler in (("legacy", legacy_radios), ("grouped", grouped_radios)):
+            roundtrips, checked = measure(driver, url, handler)
+            print(f"{name:<12}{roundtrips:>12}{checked:>18}")
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
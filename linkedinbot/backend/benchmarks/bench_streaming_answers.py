@@ -0,0 +1,117 @@
+# time to first character and total step time for free-text answers, blocking versus streamed
+#
+# Usage (from linkedinbot/backend): python -m benchmarks.bench_streaming_answers [--questions 3]
+#     [--first-token 0.8] [--tokens-per-second 40] [--words 90]
+import argparse
+import os
+import pathlib
+import tempfile
+import time
+
+# Keep the run away from the real answer cache, so every question reaches the fake LLM
+os.environ["ANSWER_CACHE_PATH"] = os.path.join(tempfile.mkdtemp(), "bench_answer_cache.sqlite3")
+
+from app.services.driver import DriverSetup
+from app.services.form_apply import apply_plan, stream_into_field
+from app.services.llm import AnswerStream, generate_answer_with_llm
+from app.services.llm_client import AsyncLLMClient
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "custom_questions.html")
+
+RESUME_DATA = {
+    "personal_info": {"name": "Ada Lovelace", "email": "ada@example.com"},
+    "skills": ["Python", "SQL", "Airflow", "Spark"],
+    "work_experience": [{"title": "Data Engineer", "company": "Analytical Engines",
+                         "description": "Built batch and streaming pipelines."}],
+}
+
+QUESTIONS = [
+    "Describe a data pipeline you built and the problem it solved.",
+    "Tell us about a time you had to debug a production incident.",
+    "What interests you about working on our analytics platform?",
+    "Describe how you keep a large SQL codebase maintainable.",
+    "Explain a technical decision you would make differently today.",
+]
+
+SENTENCE = "I designed and shipped an incremental pipeline that cut the nightly load from hours to minutes."
+
+
+class FakeStreamingLLM:
+    """Completion backend with a fixed time to first token and a steady token rate"""
+    def __init__(self, first_token, tokens_per_second, words):
+        self.first_token = first_token
+        self.token_interval = 1 / tokens_per_second
+        sentence_words = SENTENCE.split()
+        self.tokens = [sentence_words[index % len(sentence_words)] + " " for index in range(words)]
+
+    def stream(self, prompt):
+        time.sleep(self.first_token)
+        for token in self.tokens:
+            yield token
+            time.sleep(self.token_interval)
+
+    def invoke(self, prompt):
+        return "".join(self.stream(prompt)).strip()
+
+
+def textareas(driver):
+    return driver.execute_script("return Array.from(document.querySelectorAll('textarea'));")
+
+
+def blocking(driver, llm, resume_data, elements):
+    """The previous path: wait for each full completion, then write it"""
+    for element, question in zip(elements, QUESTIONS):
+        answer = generate_answer_with_llm(llm, question, resume_data, "Data Engineer", "Acme", local=False)
+        apply_plan(driver, [{"element": element, "action": "text", "value": answer}])
+
+
+def streamed(driver, llm, resume_data, elements):
+    """Write sentence-sized chunks as they arrive, then reconcile the final value"""
+    for element, question in zip(elements, QUESTIONS):
+        stream_into_field(driver, element, AnswerStream(llm, question, resume_data, "Data Engineer", "Acme"))
+
+
+def measure(driver, url, llm, resume_data, handler, count):
+    driver.get(url)
+    elements = textareas(driver)
+    started = driver.execute_script("return performance.now();")
+    handler(driver, llm, resume_data, elements[:count])
+    finished = driver.execute_script("return performance.now();")
+    first_inputs = driver.execute_script("return window.firstInput;")
+    filled = driver.execute_script(
+        "return Array.from(document.querySelectorAll('textarea')).filter(function (t) { return t.value; }).length;"
+    )
+    first_char = (min(first_inputs.values()) - started) / 1000 if first_inputs else None
+    return first_char, (finished - started) / 1000, filled
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Blocking versus streamed free-text answers")
+    parser.add_argument("--questions", type=int, default=3)
+    parser.add_argument("--first-token", type=float, default=0.8, help="seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=40)
+    parser.add_argument("--words", type=int, default=90, help="tokens per answer")
+    args = parser.parse_args()
+    count = min(args.questions, len(QUESTIONS))
+
+    url = pathlib.Path(FIXTURE).as_uri() + f"?questions={count}"
+    fake = FakeStreamingLLM(args.first_token, args.tokens_per_second, args.words)
+    driver = DriverSetup.setup_driver("headless-lean")
+    try:
+        print(f"{count} questions, first token after {args.first_token}s, "
+              f"{args.tokens_per_second:g} tokens/s, {args.words} tokens per answer")
+        print(f"{'strategy':<12}{'first char (s)':>16}{'step (s)':>12}{'filled':>9}")
+        for name, handler in (("blocking", blocking), ("streamed", streamed)):
+            # A fresh client per strategy, without hedging, so the two runs see the same backend
+            llm = AsyncLLMClient(fake, requests_per_minute=6000, timeout=120, hedge_after=120)
+            # A resume version per strategy, so answers of the first run are not cache hits
+            resume_data = dict(RESUME_DATA, benchmark_strategy=name)
+            first_char, step, filled = measure(driver, url, llm, resume_data, handler, count)
+            first_char = f"{first_char:.2f}" if first_char is not None else "-"
+            print(f"{name:<12}{first_char:>16}{step:>12.2f}{filled:>9}")
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,9 @@ document.addEventListener('DOMContentLoaded', () => {
     const resumeInput = document.getElementById('resume');
     const jsonEditor = document.getElementById('json-editor');
     const saveJsonBtn = document.getElementById('save-json-btn');
+    const jobApplyForm = document.getElementById('job-apply-form');
     const startAutoApplyBtn = document.getElementById('start-auto-apply');
+    const runStatus = document.getElementById('run-status');
     const backToLoginBtn = document.getElementById('back-to-login');
 
     // Function to generate initial JSON data similar to complete8.py
@@ -99,8 +101,34 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     });
 
-    // Event listener for start auto apply button
-    startAutoApplyBtn.addEventListener('submit', (event) => {
+    // Poll a queued run until it finishes, showing its status and counters
+    function pollRun(runId) {
+        const timer = setInterval(async () => {
+            try {
+                const response = await fetch(`/api/runs/${runId}`);
+                if (!response.ok) {
+                    throw new Error(`Status ${response.status}`);
+                }
+                const run = await response.json();
+                const counters = run.counters;
+                runStatus.textContent = `Run ${run.status}: ${counters.jobs_viewed} jobs viewed, ` +
+                    `${counters.applied} applied, ${counters.failed} failed` +
+                    (run.error ? ` (${run.error})` : '');
+                if (run.status === 'succeeded' || run.status === 'failed') {
+                    clearInterval(timer);
+                    startAutoApplyBtn.disabled = false;
+                }
+            } catch (error) {
+                console.error('Run status error:', error);
+                runStatus.textContent = 'Lost track of the run. Please refresh to try again.';
+                clearInterval(timer);
+                startAutoApplyBtn.disabled = false;
+            }
+        }, 5000);
+    }
+
+    // Event listener for the job apply form; the submit event fires on the form, not the button
+    jobApplyForm.addEventListener('submit', async (event) => {
         event.preventDefault();
 
         const geminiKey = document.getElementById('gemini-api-key').value;
@@ -134,9 +162,48 @@ document.addEventListener('DOMContentLoaded', () => {
             resumeData: resumeData,
         };
 
-        console.log('Application Data:', applicationData);
-        alert('Starting auto job apply process... (Check console for application data)');
+        // Phone and website from the form override the ones in the resume
+        resumeData.personal_info = resumeData.personal_info || {};
+        if (phoneNumber) {
+            resumeData.personal_info.phone = phoneNumber;
+        }
+        if (userWebsite) {
+            resumeData.personal_info.website = userWebsite;
+        }
 
+        startAutoApplyBtn.disabled = true;
+        runStatus.textContent = 'Starting auto job apply process...';
+        try {
+            const response = await fetch('/api/runs', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'Authorization': `Bearer ${localStorage.getItem('authToken') || ''}`,
+                },
+                body: JSON.stringify({
+                    job_title: applicationData.jobTitle,
+                    location: applicationData.jobLocation,
+                    max_applications: parseInt(applicationData.maxApplications, 10) || 10,
+                    resume_data: resumeData,
+                    gemini_api_key: applicationData.geminiKey,
+                })
+            });
+            const data = await response.json();
+            if (response.status === 401) {
+                alert('Your session has expired. Please log in again.');
+                window.location.href = 'index.html';
+                return;
+            }
+            if (!response.ok) {
+                throw new Error(data.detail || `Status ${response.status}`);
+            }
+            runStatus.textContent = `Run ${data.status}...`;
+            pollRun(data.id);
+        } catch (error) {
+            console.error('Run error:', error);
+            runStatus.textContent = `Could not start the run: ${error.message}`;
+            startAutoApplyBtn.disabled = false;
+        }
     });
 
     // Event listener for back to login button